@@ -0,0 +1,174 @@
+"""
+Flux Open Home - Remote Broker Metrics
+=======================================
+In-memory latency and throughput counters for the controller ↔ remote
+broker in run_log.py.  Tracked per relay direction and remote device:
+
+  - event-to-write latency histogram (WebSocket event received → HA write done)
+  - writes, failures and writes per second (rolling 60 s window)
+  - suppressed echoes (our own mirrored writes coming back as events)
+    and changes suppressed while a remote is syncing
+  - coalesced writes (a newer value replaced one still waiting to be written)
+  - current and peak write queue depth
+
+Exposed through run_log.get_broker_status() and /debug/broker-metrics.
+Nothing is persisted — counters reset on add-on restart or via reset_metrics().
+"""
+
+import time
+from collections import deque
+from typing import Optional
+
+# Relay directions
+REMOTE_TO_CONTROLLER = "remote_to_controller"
+CONTROLLER_TO_REMOTE = "controller_to_remote"
+REMOTE_TO_REMOTE = "remote_to_remote"
+SYNC = "sync"
+
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_RATE_WINDOW_S = 60
+_LATENCY_SAMPLES = 500  # recent samples kept per relay for percentiles
+
+
+class _RelayStats:
+    """Counters for one (direction, device) relay."""
+
+    def __init__(self):
+        self.writes = 0
+        self.failures = 0
+        self.suppressed_echoes = 0
+        self.suppressed_syncing = 0
+        self.coalesced = 0
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latency_sum_ms = 0.0
+        self.latency_count = 0
+        self.latency_max_ms = 0.0
+        self.recent_latencies: deque = deque(maxlen=_LATENCY_SAMPLES)
+        self.recent_writes: deque = deque()  # monotonic timestamps
+
+    def snapshot(self, now: float) -> dict:
+        while self.recent_writes and now - self.recent_writes[0] > _RATE_WINDOW_S:
+            self.recent_writes.popleft()
+        histogram = {f"le_{b}ms": c for b, c in zip(LATENCY_BUCKETS_MS, self.bucket_counts)}
+        histogram["gt_10000ms"] = self.bucket_counts[-1]
+        samples = sorted(self.recent_latencies)
+        return {
+            "writes": self.writes,
+            "failures": self.failures,
+            "writes_per_second": round(len(self.recent_writes) / _RATE_WINDOW_S, 3),
+            "suppressed_echoes": self.suppressed_echoes,
+            "suppressed_syncing": self.suppressed_syncing,
+            "coalesced": self.coalesced,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "latency_ms": {
+                "count": self.latency_count,
+                "avg": round(self.latency_sum_ms / self.latency_count, 1) if self.latency_count else None,
+                "p50": round(_percentile(samples, 0.50), 1) if samples else None,
+                "p95": round(_percentile(samples, 0.95), 1) if samples else None,
+                "max": round(self.latency_max_ms, 1) if self.latency_count else None,
+                "histogram": histogram,
+            },
+        }
+
+
+_stats: dict[tuple[str, str], _RelayStats] = {}
+_started_at = time.monotonic()
+
+
+def _percentile(sorted_samples: list[float], q: float) -> float:
+    idx = min(len(sorted_samples) - 1, int(q * len(sorted_samples)))
+    return sorted_samples[idx]
+
+
+def _get(direction: str, device_id: Optional[str]) -> _RelayStats:
+    key = (direction, device_id or "")
+    stats = _stats.get(key)
+    if stats is None:
+        stats = _stats[key] = _RelayStats()
+    return stats
+
+
+def record_write(direction: str, device_id: Optional[str], ok: bool,
+                 event_at: Optional[float] = None):
+    """Record a completed relay write.
+
+    Args:
+        event_at: time.monotonic() when the triggering event was received.
+            Latency is only recorded for event-driven writes.
+    """
+    now = time.monotonic()
+    stats = _get(direction, device_id)
+    if not ok:
+        stats.failures += 1
+        return
+    stats.writes += 1
+    stats.recent_writes.append(now)
+    if event_at is not None:
+        latency_ms = (now - event_at) * 1000
+        stats.latency_sum_ms += latency_ms
+        stats.latency_count += 1
+        stats.latency_max_ms = max(stats.latency_max_ms, latency_ms)
+        stats.recent_latencies.append(latency_ms)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                stats.bucket_counts[i] += 1
+                break
+        else:
+            stats.bucket_counts[-1] += 1
+
+
+def record_suppressed(direction: str, device_id: Optional[str], reason: str = "echo"):
+    """Record a state change the broker deliberately did not relay."""
+    stats = _get(direction, device_id)
+    if reason == "echo":
+        stats.suppressed_echoes += 1
+    else:
+        stats.suppressed_syncing += 1
+
+
+def record_coalesced(direction: str, device_id: Optional[str]):
+    """Record a queued write that was replaced by a newer value."""
+    _get(direction, device_id).coalesced += 1
+
+
+def queue_enter(direction: str, device_id: Optional[str]):
+    stats = _get(direction, device_id)
+    stats.queue_depth += 1
+    stats.peak_queue_depth = max(stats.peak_queue_depth, stats.queue_depth)
+
+
+def queue_exit(direction: str, device_id: Optional[str]):
+    stats = _get(direction, device_id)
+    stats.queue_depth = max(0, stats.queue_depth - 1)
+
+
+def get_metrics() -> dict:
+    """Return all broker metrics grouped by device, then direction."""
+    now = time.monotonic()
+    devices: dict[str, dict] = {}
+    totals = {"writes": 0, "failures": 0, "suppressed_echoes": 0,
+              "suppressed_syncing": 0, "coalesced": 0, "queue_depth": 0}
+    for (direction, device_id), stats in sorted(_stats.items()):
+        snap = stats.snapshot(now)
+        devices.setdefault(device_id[:12] or "unknown", {})[direction] = snap
+        for key in totals:
+            totals[key] += snap[key]
+    return {
+        "uptime_seconds": round(now - _started_at, 1),
+        "latency_buckets_ms": list(LATENCY_BUCKETS_MS),
+        "totals": totals,
+        "devices": devices,
+    }
+
+
+def reset_metrics():
+    """Clear all counters (queue depths of in-flight writes are kept)."""
+    global _started_at
+    for key, stats in list(_stats.items()):
+        depth = stats.queue_depth
+        _stats[key] = _RelayStats()
+        _stats[key].queue_depth = depth
+    _started_at = time.monotonic()
@@ -0,0 +1,489 @@
+"""
+Flux Open Home - Location Service
+==================================
+One cache for everything that turns an address into a place:
+
+  - geocoded coordinates (Nominatim), keyed by a hash of the normalised
+    address text, so "1 Main St, Town, ST 12345" from the dashboard and
+    the add-on options share an entry
+  - for the homeowner address, the NWS points lookup (forecast URL, grid)
+    and the nearby observation stations ranked by distance
+
+Request handlers only read the cache (get_location, get_nws_location).  A
+miss or a stale entry queues a lookup on a background task, and the
+refresher started at add-on start-up re-ranks stations daily and
+re-geocodes monthly — geocoding and station lookups never run on a request
+path.  Coordinates pinned by the management server or entered manually
+(routes.system geocode cache) take precedence for the NWS lookup; call
+location_changed() after updating them or the homeowner address.
+
+All requests go through the shared NWS HTTP client in routes.weather.
+Persisted to /data/location_cache.json.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+LOCATION_CACHE_FILE = "/data/location_cache.json"
+_LEGACY_NWS_CACHE_FILE = "/data/nws_location_cache.json"
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+
+_GEOCODE_TTL = 30 * 86400         # re-geocode an address this often
+_GEOCODE_MISS_TTL = 86400         # ...or this often if Nominatim had no result
+_STATIONS_TTL = 86400             # re-run points lookup + station ranking this often
+_RETRY_AFTER = 900                # wait this long after a failed lookup
+_NOMINATIM_SPACING = 1.0          # seconds between Nominatim requests (usage policy)
+_REFRESH_INTERVAL = 3600          # background refresher wake-up
+_UNUSED_TTL = 90 * 86400          # drop ad-hoc addresses unused this long
+_MAX_ENTRIES = 32
+_BACKUP_STATIONS = 3
+
+# address hash -> {"query", "lat", "lon", "geocoded_at", "failed_at", "error",
+#                  "last_used", "nws", "nws_failed_at"}
+_entries: Optional[dict] = None
+_inflight: dict[str, asyncio.Task] = {}  # address hash -> lookup in progress
+_pinned: Optional[dict] = None  # cached routes.system geocode cache
+_nominatim_lock = asyncio.Lock()
+_last_nominatim_at = 0.0
+_refresher_task: Optional[asyncio.Task] = None
+_stats = {"hits": 0, "misses": 0, "geocoded": 0, "nws_lookups": 0, "failures": 0}
+
+
+# --- Keys ---
+
+def normalize_address(text: str) -> str:
+    """Lower-case, comma-free, single-spaced form of an address."""
+    return " ".join((text or "").replace(",", " ").lower().split())
+
+
+def address_hash(text: str) -> str:
+    return hashlib.md5(normalize_address(text).encode()).hexdigest()
+
+
+def config_address(config) -> str:
+    """The homeowner address from the add-on options as one line."""
+    parts = [config.homeowner_address, config.homeowner_city,
+             config.homeowner_state, config.homeowner_zip]
+    return ", ".join(p for p in parts if p)
+
+
+# --- Persistence ---
+
+def _get_entries() -> dict:
+    global _entries
+    if _entries is None:
+        _entries = {}
+        if os.path.exists(LOCATION_CACHE_FILE):
+            try:
+                with open(LOCATION_CACHE_FILE, "r") as f:
+                    _entries = json.load(f).get("entries", {})
+            except (json.JSONDecodeError, IOError):
+                pass
+        else:
+            _migrate_legacy_nws_cache(_entries)
+    return _entries
+
+
+def _migrate_legacy_nws_cache(entries: dict):
+    """Adopt the old single-address NWS location cache if it matches the options."""
+    if not os.path.exists(_LEGACY_NWS_CACHE_FILE):
+        return
+    try:
+        with open(_LEGACY_NWS_CACHE_FILE, "r") as f:
+            legacy = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return
+    from config import get_config
+    config = get_config()
+    parts = (f"{config.homeowner_address}|{config.homeowner_city}|"
+             f"{config.homeowner_state}|{config.homeowner_zip}")
+    query = config_address(config)
+    if not query or legacy.get("address_hash") != hashlib.md5(parts.encode()).hexdigest():
+        return
+    if not legacy.get("station_url"):
+        return
+    # refreshed_at=0 keeps serving it while the background refresh re-ranks
+    entries[address_hash(query)] = {
+        "query": query,
+        "last_used": time.time(),
+        "nws": {
+            "lat": legacy.get("lat"),
+            "lon": legacy.get("lon"),
+            "station_id": legacy.get("station_id", ""),
+            "station_url": legacy["station_url"],
+            "backup_stations": legacy.get("backup_stations", []),
+            "stations": [],
+            "forecast_url": legacy.get("forecast_url", ""),
+            "grid_id": legacy.get("grid_id", ""),
+            "grid_x": legacy.get("grid_x"),
+            "grid_y": legacy.get("grid_y"),
+            "refreshed_at": 0,
+        },
+    }
+    print(f"[LOCATION] Migrated NWS location cache (station={legacy.get('station_id')})")
+
+
+def _save_entries():
+    """Prune unused entries and write the cache atomically."""
+    from config import get_config
+    entries = _get_entries()
+    keep_key = address_hash(config_address(get_config()))
+    cutoff = time.time() - _UNUSED_TTL
+    for key in [k for k, e in entries.items()
+                if k != keep_key and e.get("last_used", 0) < cutoff]:
+        del entries[key]
+    if len(entries) > _MAX_ENTRIES:
+        by_use = sorted((k for k in entries if k != keep_key),
+                        key=lambda k: entries[k].get("last_used", 0))
+        for key in by_use[:len(entries) - _MAX_ENTRIES]:
+            del entries[key]
+    try:
+        os.makedirs(os.path.dirname(LOCATION_CACHE_FILE), exist_ok=True)
+        tmp_path = LOCATION_CACHE_FILE + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"entries": entries}, f, indent=2)
+        os.replace(tmp_path, LOCATION_CACHE_FILE)
+    except IOError as e:
+        print(f"[LOCATION] Failed to save location cache: {e}")
+
+
+def get_pinned_coordinates() -> dict:
+    """Coordinates pushed by the management server or entered manually ({} if none)."""
+    global _pinned
+    if _pinned is None:
+        from routes.system import _load_geocode_cache
+        _pinned = _load_geocode_cache()
+    return _pinned
+
+
+def _pinned_lat_lon() -> Optional[tuple]:
+    pinned = get_pinned_coordinates()
+    if pinned.get("latitude") is None or pinned.get("longitude") is None:
+        return None
+    return round(float(pinned["latitude"]), 4), round(float(pinned["longitude"]), 4)
+
+
+# --- Freshness ---
+
+def _geocode_due(entry: dict, now: float) -> bool:
+    if entry.get("failed_at") and now - entry["failed_at"] < _RETRY_AFTER:
+        return False
+    geocoded_at = entry.get("geocoded_at")
+    if not geocoded_at:
+        return True
+    ttl = _GEOCODE_TTL if entry.get("lat") is not None else _GEOCODE_MISS_TTL
+    return now - geocoded_at >= ttl
+
+
+def _nws_coordinates(entry: dict) -> Optional[tuple]:
+    """Pinned coordinates first, then the geocoded ones (NWS takes 4 decimals)."""
+    pinned = _pinned_lat_lon()
+    if pinned is not None:
+        return pinned
+    if entry.get("lat") is None or entry.get("lon") is None:
+        return None
+    return round(entry["lat"], 4), round(entry["lon"], 4)
+
+
+def _nws_due(entry: dict, now: float) -> bool:
+    if entry.get("nws_failed_at") and now - entry["nws_failed_at"] < _RETRY_AFTER:
+        return False
+    nws = entry.get("nws")
+    if not nws:
+        return True
+    coords = _nws_coordinates(entry)
+    if coords is not None and (nws.get("lat"), nws.get("lon")) != coords:
+        return True
+    return now - nws.get("refreshed_at", 0) >= _STATIONS_TTL
+
+
+def _wants_nws(key: str) -> bool:
+    from config import get_config
+    config = get_config()
+    return config.weather_source == "nws" and key == address_hash(config_address(config))
+
+
+# --- Lookups (background only) ---
+
+def _schedule_resolve(key: str, query: str) -> Optional[asyncio.Task]:
+    """Start (or join) the background lookup for one address."""
+    task = _inflight.get(key)
+    if task is not None:
+        return task
+    try:
+        task = asyncio.get_running_loop().create_task(_resolve(key, query))
+    except RuntimeError:
+        return None  # no event loop (sync caller at import time)
+    _inflight[key] = task
+    task.add_done_callback(lambda t, k=key: _inflight.pop(k, None))
+    return task
+
+
+async def _resolve(key: str, query: str):
+    entries = _get_entries()
+    entry = entries.get(key)
+    if entry is None:
+        entry = entries[key] = {"query": query, "last_used": time.time()}
+    changed = False
+    if _geocode_due(entry, time.time()):
+        changed = await _geocode(entry, query) or changed
+    if _wants_nws(key) and _nws_due(entry, time.time()):
+        changed = await _lookup_nws(entry) or changed
+    if changed:
+        _save_entries()
+
+
+async def _geocode(entry: dict, query: str) -> bool:
+    """Geocode via Nominatim; returns True when the entry was updated."""
+    global _last_nominatim_at
+    from routes.weather import _get_nws_client
+
+    async with _nominatim_lock:
+        wait = _last_nominatim_at + _NOMINATIM_SPACING - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        try:
+            resp = await _get_nws_client().get(
+                NOMINATIM_URL,
+                params={"format": "json", "limit": "1", "q": query},
+                headers={"Accept": "application/json"},
+            )
+            resp.raise_for_status()
+            results = resp.json()
+        except Exception as e:
+            entry["failed_at"] = time.time()
+            entry["error"] = str(e)
+            _stats["failures"] += 1
+            print(f"[LOCATION] Geocoding failed for '{query}': {e}")
+            return False
+        finally:
+            _last_nominatim_at = time.monotonic()
+
+    _stats["geocoded"] += 1
+    entry["geocoded_at"] = time.time()
+    entry.pop("failed_at", None)
+    entry.pop("error", None)
+    if results:
+        entry["lat"] = float(results[0]["lat"])
+        entry["lon"] = float(results[0]["lon"])
+        print(f"[LOCATION] Geocoded '{query}' to {entry['lat']:.4f}, {entry['lon']:.4f}")
+    else:
+        entry["lat"] = entry["lon"] = None
+        print(f"[LOCATION] Geocoding returned no results for: {query}")
+    return True
+
+
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+def _rank_stations(features: list, lat: float, lon: float) -> list[dict]:
+    """Observation stations nearest first ({"id", "distance_km"}).
+
+    Stations without coordinates keep the order NWS returned them in,
+    after the ones that have them.
+    """
+    ranked = []
+    for i, feat in enumerate(features):
+        sid = feat.get("properties", {}).get("stationIdentifier", "")
+        if not sid:
+            continue
+        coords = (feat.get("geometry") or {}).get("coordinates") or []
+        dist = None
+        if len(coords) >= 2:
+            dist = round(_distance_km(lat, lon, coords[1], coords[0]), 1)
+        ranked.append((dist is None, dist or 0.0, i, sid))
+    ranked.sort()
+    return [{"id": sid, "distance_km": None if missing else dist}
+            for missing, dist, _, sid in ranked[:1 + _BACKUP_STATIONS]]
+
+
+async def _lookup_nws(entry: dict) -> bool:
+    """NWS points lookup and station ranking; returns True when the entry was updated."""
+    from routes.weather import _nws_get_json
+
+    coords = _nws_coordinates(entry)
+    if coords is None:
+        return False
+    lat, lon = coords
+    try:
+        points = await _nws_get_json(f"https://api.weather.gov/points/{lat},{lon}")
+        props = points.get("properties", {})
+        forecast_url = props.get("forecast", "")
+        stations_url = props.get("observationStations", "")
+        if not forecast_url or not stations_url:
+            raise ValueError("points response missing forecast/stations URLs")
+        stations = _rank_stations((await _nws_get_json(stations_url)).get("features", []), lat, lon)
+        if not stations:
+            raise ValueError(f"no observation stations found near {lat}, {lon}")
+    except Exception as e:
+        entry["nws_failed_at"] = time.time()
+        _stats["failures"] += 1
+        print(f"[LOCATION] NWS location lookup failed: {e}")
+        return False
+
+    _stats["nws_lookups"] += 1
+    entry.pop("nws_failed_at", None)
+    previous = (entry.get("nws") or {}).get("station_id")
+    station_id = stations[0]["id"]
+    entry["nws"] = {
+        "lat": lat,
+        "lon": lon,
+        "station_id": station_id,
+        "station_url": f"https://api.weather.gov/stations/{station_id}",
+        "backup_stations": [s["id"] for s in stations[1:]],
+        "stations": stations,
+        "forecast_url": forecast_url,
+        "grid_id": props.get("gridId", ""),
+        "grid_x": props.get("gridX"),
+        "grid_y": props.get("gridY"),
+        "refreshed_at": time.time(),
+    }
+    if station_id != previous:
+        print(f"[LOCATION] NWS location: station={station_id} "
+              f"({stations[0]['distance_km']} km), "
+              f"grid={props.get('gridId')}/{props.get('gridX')},{props.get('gridY')}")
+    return True
+
+
+# --- Public API ---
+
+def get_location(query: str) -> Optional[dict]:
+    """Cached coordinates for an address ({"lat", "lon"}), or None.
+
+    Never waits on the network: a miss or stale entry queues a background
+    lookup (see is_pending()) and the last known answer is returned meanwhile.
+    """
+    key = address_hash(query)
+    entry = _get_entries().get(key)
+    now = time.time()
+    if entry is None or _geocode_due(entry, now):
+        _schedule_resolve(key, query)
+    if entry is None or entry.get("lat") is None:
+        _stats["misses"] += 1
+        return None
+    _stats["hits"] += 1
+    entry["last_used"] = now
+    return {"lat": entry["lat"], "lon": entry["lon"]}
+
+
+def is_pending(query: str) -> bool:
+    """True while a background lookup for this address is running."""
+    return address_hash(query) in _inflight
+
+
+def get_nws_location(config) -> Optional[dict]:
+    """Cached NWS location for the homeowner address, or None if not resolved yet.
+
+    Returns station_url, backup_stations, forecast_url, grid_id/x/y, lat, lon.
+    Like get_location(), a missing or stale entry is refreshed in the background.
+    """
+    query = config_address(config)
+    if not query:
+        return None
+    key = address_hash(query)
+    entry = _get_entries().get(key)
+    if entry is None or _nws_due(entry, time.time()) or _geocode_due(entry, time.time()):
+        _schedule_resolve(key, query)
+    nws = (entry or {}).get("nws")
+    return nws if nws and nws.get("station_url") else None
+
+
+async def ensure_nws_location(config) -> Optional[dict]:
+    """get_nws_location(), waiting for a lookup in progress — for background tasks."""
+    location = get_nws_location(config)
+    if location is None:
+        task = _inflight.get(address_hash(config_address(config)))
+        if task is not None:
+            await asyncio.shield(task)
+            location = get_nws_location(config)
+    return location
+
+
+def location_changed():
+    """Forget cached pinned coordinates and re-resolve the homeowner address.
+
+    Call after the address options or the stored coordinates change.
+    """
+    global _pinned
+    from config import get_config
+    _pinned = None
+    query = config_address(get_config())
+    if query:
+        _schedule_resolve(address_hash(query), query)
+
+
+async def refresh_locations():
+    """Resolve the homeowner address and refresh every stale cache entry."""
+    from config import get_config
+    tasks = []
+    query = config_address(get_config())
+    if query:
+        tasks.append(_schedule_resolve(address_hash(query), query))
+    now = time.time()
+    for key, entry in list(_get_entries().items()):
+        if _geocode_due(entry, now):
+            tasks.append(_schedule_resolve(key, entry.get("query", "")))
+    await asyncio.gather(*(t for t in tasks if t is not None), return_exceptions=True)
+
+
+async def _refresh_loop():
+    while True:
+        try:
+            await refresh_locations()
+        except Exception as e:
+            print(f"[LOCATION] Background refresh error: {e}")
+        await asyncio.sleep(_REFRESH_INTERVAL)
+
+
+def start_location_refresher():
+    """Start the background task that keeps the location cache fresh."""
+    global _refresher_task
+    if _refresher_task and not _refresher_task.done():
+        return  # Already running
+    _refresher_task = asyncio.create_task(_refresh_loop())
+    print(f"[LOCATION] Location refresher started (interval: {_REFRESH_INTERVAL}s)")
+
+
+def stop_location_refresher():
+    """Stop the background refresh task."""
+    global _refresher_task
+    if _refresher_task and not _refresher_task.done():
+        _refresher_task.cancel()
+        _refresher_task = None
+        print("[LOCATION] Location refresher stopped")
+
+
+def get_location_status() -> dict:
+    """Cache contents and counters for diagnostics."""
+    def iso(ts):
+        return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts else None
+
+    entries = []
+    for key, entry in _get_entries().items():
+        nws = entry.get("nws") or {}
+        entries.append({
+            "address_hash": key,
+            "lat": entry.get("lat"),
+            "lon": entry.get("lon"),
+            "geocoded_at": iso(entry.get("geocoded_at")),
+            "error": entry.get("error"),
+            "station_id": nws.get("station_id"),
+            "stations": nws.get("stations", []),
+            "stations_refreshed_at": iso(nws.get("refreshed_at")),
+            "pending": key in _inflight,
+        })
+    return {
+        **_stats,
+        "pinned": bool(_pinned_lat_lon()),
+        "entries": entries,
+    }
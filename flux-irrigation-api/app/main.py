@@ -304,6 +304,9 @@ async def _periodic_log_cleanup():
         await asyncio.sleep(86400)  # 24 hours
 
 
+_WEATHER_REPLAN_SECONDS = 300
+
+
 async def _periodic_weather_check():
     """Periodically evaluate weather rules for irrigation adjustments.
 
@@ -312,26 +315,45 @@ async def _periodic_weather_check():
     When it does write (disable/restore schedules), calls are throttled with 500ms delays
     and skip unavailable entities to prevent ESP32 overload.
     """
+    import location_service
+    from routes.weather import plan_next_weather_check, run_weather_evaluation
+
     while True:
+        # Wait for the regular interval, or less when a scheduled start is
+        # coming up (pre-start refresh).  Re-plan at least every few minutes
+        # so schedule edits and evaluations made elsewhere are picked up.
+        config = get_config()
+        min_interval = 60 if config.weather_source == "nws" else 5
+        interval = max(config.weather_check_interval_minutes, min_interval) * 60
+        try:
+            delay, trigger = await plan_next_weather_check(config, interval)
+        except Exception as e:
+            print(f"[MAIN] Weather check planning error: {e}")
+            delay, trigger = interval, "interval"
+        if delay > 0:
+            await asyncio.sleep(min(delay, _WEATHER_REPLAN_SECONDS))
+            continue
+
         try:
-            config = get_config()
             weather_ready = config.weather_enabled and (
                 config.weather_entity_id or config.weather_source == "nws"
             )
             if weather_ready:
-                from routes.weather import run_weather_evaluation
-                result = await run_weather_evaluation()
+                if config.weather_source == "nws":
+                    # Background task — may wait for the first location lookup
+                    await location_service.ensure_nws_location(config)
+                if trigger == "prestart":
+                    print("[MAIN] Pre-start weather refresh")
+                result = await run_weather_evaluation(trigger)
                 if result.get("triggered_rules"):
                     print(f"[MAIN] Weather evaluation: {len(result['triggered_rules'])} rule(s) triggered, "
                           f"multiplier={result.get('watering_multiplier', 1.0)}")
+            else:
+                # Nothing to fetch — wait a full interval before looking again
+                await asyncio.sleep(interval)
         except Exception as e:
             print(f"[MAIN] Weather check error: {e}")
 
-        config = get_config()
-        min_interval = 60 if config.weather_source == "nws" else 5
-        interval = max(config.weather_check_interval_minutes, min_interval) * 60
-        await asyncio.sleep(interval)
-
 
 async def _periodic_moisture_evaluation():
     """Periodically evaluate moisture probes and recalculate schedule timeline.
@@ -542,16 +564,14 @@ async def lifespan(app: FastAPI):
     # _handle_remote_reconnect(), causing garbled entity writes.
     if config.allowed_remote_entities:
         import run_log
-        from run_log import _find_sync_needed_entity_for_device
         # Initialize per-device state and block all reconnect handlers
         run_log._reconnect_sync_running = True
         for did in config.remote_device_ids:
-            run_log._remote_reconnect_pending_by_device[did] = True
+            run_log._block_remote_device(did, "startup")
             run_log._reconnect_sync_running_by_device[did] = True
         try:
-            from run_log import sync_all_remote_state
+            from run_log import run_remote_sync_cycle
             from routes.admin import sync_remote_settings
-            import ha_client
             # Push zone count + time format + pump flag first (settings-only entities)
             settings_file = "/data/settings.json"
             use_12h = True
@@ -560,30 +580,12 @@ async def lifespan(app: FastAPI):
                     s = json.load(f)
                     use_12h = s.get("time_format", "12h") != "24h"
             await sync_remote_settings(use_12h=use_12h)
-            # Then push ALL entity states (zones, schedules, durations, days, status, etc.)
-            await sync_all_remote_state()
-            # Hold suppression FIRST — let devices finish booting before we tell them we synced
-            run_log._remote_log(f"Broker: startup — holding suppression 5s for "
-                                f"{len(config.remote_device_ids)} remote(s) to settle")
-            await asyncio.sleep(5)
-            # THEN turn OFF sync_needed on each remote device
-            for did in config.remote_device_ids:
-                sync_eid = _find_sync_needed_entity_for_device(did)
-                if sync_eid:
-                    try:
-                        await ha_client.call_service("switch", "turn_off",
-                                                     {"entity_id": sync_eid})
-                        run_log._remote_log(f"Broker: startup — turned OFF {sync_eid} ({did[:12]})")
-                    except Exception as e:
-                        run_log._remote_log(f"Broker: startup — failed to turn off sync_needed for {did[:12]}: {e}")
-            # Re-sync to overwrite any boot defaults that arrived during hold
-            await sync_all_remote_state()
-            run_log._remote_log("Broker: startup — second sync complete (post-settle)")
-            await asyncio.sleep(3)
-            # Clear per-device and global flags
-            for did in config.remote_device_ids:
-                run_log._remote_reconnect_pending_by_device[did] = False
-                run_log._reconnect_sync_running_by_device[did] = False
+            # Then run each remote's sync pipeline concurrently — push ALL entity
+            # states, settle, clear sync_needed, re-sync.  Each remote is
+            # unblocked as soon as its own pipeline finishes.
+            run_log._remote_log(f"Broker: startup — syncing {len(config.remote_device_ids)} "
+                                f"remote(s) concurrently")
+            await asyncio.gather(*(run_remote_sync_cycle(did) for did in config.remote_device_ids))
             run_log._remote_reconnect_pending = False
             run_log._remote_log(f"Broker: startup sync complete — "
                                 f"{len(config.remote_device_ids)} remote(s) mirroring enabled")
@@ -591,7 +593,7 @@ async def lifespan(app: FastAPI):
             print(f"[MAIN] Remote device sync failed: {e}")
             # Always clear flags so mirroring can work even if sync failed
             for did in config.remote_device_ids:
-                run_log._remote_reconnect_pending_by_device[did] = False
+                run_log._unblock_remote_device(did)
                 run_log._reconnect_sync_running_by_device[did] = False
             run_log._remote_reconnect_pending = False
             run_log._remote_log("Broker: startup sync FAILED — remote→controller mirroring enabled (fallback)")
@@ -606,6 +608,8 @@ async def lifespan(app: FastAPI):
     weather_ready = config.weather_enabled and (
         config.weather_entity_id or config.weather_source == "nws"
     )
+    import location_service
+    location_service.start_location_refresher()
     if weather_ready:
         weather_task = asyncio.create_task(_periodic_weather_check())
         source_label = "Built-In NWS (address)" if config.weather_source == "nws" else f"entity={config.weather_entity_id}"
@@ -647,6 +651,29 @@ async def lifespan(app: FastAPI):
         stop_awake_poller()
     except Exception:
         pass
+    try:
+        import location_service
+        location_service.stop_location_refresher()
+    except Exception:
+        pass
+    try:
+        from routes.moisture import flush_data as flush_moisture_data, flush_sensor_cache
+        flush_moisture_data()
+        flush_sensor_cache()
+    except Exception as e:
+        print(f"[MAIN] Failed to flush moisture data on shutdown: {e}")
+    try:
+        from routes.weather import close_nws_client
+        await close_nws_client()
+    except Exception:
+        pass
+    try:
+        from routes.weather import flush_logged_skips, flush_weather_evaluation, flush_weather_index
+        flush_weather_index()
+        flush_logged_skips()
+        flush_weather_evaluation()
+    except Exception:
+        pass
     if zone_watcher_task:
         zone_watcher_task.cancel()
     if entity_refresh_task:
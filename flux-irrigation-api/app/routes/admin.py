@@ -232,8 +232,8 @@ async def get_settings():
     }
 
     # Include stored coordinates from geocode cache
-    from routes.system import _load_geocode_cache
-    geo_cache = _load_geocode_cache()
+    import location_service
+    geo_cache = location_service.get_pinned_coordinates()
     result["stored_latitude"] = geo_cache.get("latitude")
     result["stored_longitude"] = geo_cache.get("longitude")
     result["stored_geo_source"] = geo_cache.get("source")
@@ -872,6 +872,9 @@ async def save_contact_info(body: ContactInfoRequest):
             cache.pop("longitude", None)
             cache.pop("source", None)
             _save_geocode_cache(cache)
+    # Re-resolve the (possibly new) address and coordinates in the background
+    import location_service
+    location_service.location_changed()
 
     for change in contact_changes:
         log_change("Homeowner", "Connection Key", change)
@@ -1373,22 +1376,13 @@ async def revoke_management_access():
 
 @router.get("/api/geocode", summary="Geocode an address")
 async def admin_geocode(q: str = Query(..., min_length=3, description="Address to geocode")):
-    """Proxy geocoding via Nominatim so the browser doesn't need cross-origin access."""
-    import httpx as _httpx
-    try:
-        async with _httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                "https://nominatim.openstreetmap.org/search",
-                params={"format": "json", "limit": "1", "q": q},
-                headers={"User-Agent": "FluxIrrigationAPI/1.1.11"},
-            )
-            resp.raise_for_status()
-            results = resp.json()
-            if results and len(results) > 0:
-                return {"lat": float(results[0]["lat"]), "lon": float(results[0]["lon"])}
-            return {"lat": None, "lon": None}
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Geocoding failed: {e}")
+    """Geocode from the location cache so the browser doesn't need cross-origin access.
+    "pending" means a background lookup is still running."""
+    import location_service
+    location = location_service.get_location(q)
+    if location is not None:
+        return location
+    return {"lat": None, "lon": None, "pending": location_service.is_pending(q)}
 
 
 @router.get("/api/connection-key", summary="Get current connection key info")
@@ -930,11 +930,13 @@ async def homeowner_history(
 
     events = run_log.get_run_history(hours=hours, zone_id=zone_id)
 
-    # Get current weather for the summary header
+    # Get current weather for the summary header, and fill in weather for
+    # events logged without it from the hourly weather index
     current_weather = {}
     try:
-        from routes.weather import _get_current_weather_snapshot
+        from routes.weather import _get_current_weather_snapshot, enrich_events_with_weather
         current_weather = _get_current_weather_snapshot()
+        enrich_events_with_weather(events)
     except Exception:
         pass
 
@@ -949,36 +951,17 @@ async def homeowner_history(
 
 @router.get("/geocode", summary="Geocode an address")
 async def homeowner_geocode(q: str = Query(..., min_length=3, description="Address to geocode")):
-    """Proxy geocoding via Nominatim so the browser doesn't need cross-origin access.
-    Falls back to stored coordinates (pushed by management server) if Nominatim fails."""
-    import httpx
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(
-                "https://nominatim.openstreetmap.org/search",
-                params={"format": "json", "limit": "1", "q": q},
-                headers={"User-Agent": "FluxIrrigationAPI/1.2.0"},
-            )
-            resp.raise_for_status()
-            results = resp.json()
-            if results and len(results) > 0:
-                return {"lat": float(results[0]["lat"]), "lon": float(results[0]["lon"])}
-            # Nominatim returned no results — try stored coordinates from management server
-            from routes.system import _load_geocode_cache
-            stored = _load_geocode_cache()
-            if stored.get("latitude") is not None and stored.get("longitude") is not None:
-                return {"lat": stored["latitude"], "lon": stored["longitude"]}
-            return {"lat": None, "lon": None}
-    except Exception as e:
-        # On network error, try stored coordinates before failing
-        try:
-            from routes.system import _load_geocode_cache
-            stored = _load_geocode_cache()
-            if stored.get("latitude") is not None and stored.get("longitude") is not None:
-                return {"lat": stored["latitude"], "lon": stored["longitude"]}
-        except Exception:
-            pass
-        raise HTTPException(status_code=502, detail=f"Geocoding failed: {e}")
+    """Geocode from the location cache so the browser doesn't need cross-origin access.
+    Falls back to stored coordinates (pushed by management server) when the address
+    has no result yet; "pending" means a background lookup is still running."""
+    import location_service
+    location = location_service.get_location(q)
+    if location is not None:
+        return location
+    stored = location_service.get_pinned_coordinates()
+    if stored.get("latitude") is not None and stored.get("longitude") is not None:
+        return {"lat": stored["latitude"], "lon": stored["longitude"]}
+    return {"lat": None, "lon": None, "pending": location_service.is_pending(q)}
 
 
 @router.get("/weather", summary="Get weather data for dashboard")
@@ -1025,6 +1008,11 @@ async def homeowner_history_csv(
     _require_homeowner_mode()
 
     events = run_log.get_run_history(hours=hours)
+    try:
+        from routes.weather import enrich_events_with_weather
+        enrich_events_with_weather(events)
+    except Exception:
+        pass
 
     lines = ["timestamp,zone_name,entity_id,state,source,duration_minutes,weather_condition,temperature,humidity,wind_speed,watering_multiplier,weather_rules,moisture_multiplier,combined_multiplier,probe_top_pct,probe_mid_pct,probe_bottom_pct,probe_profile"]
     for e in events:
@@ -1134,6 +1122,17 @@ async def homeowner_weather_debug():
     if all_entries:
         result["latest_entry"] = all_entries[-1]
 
+    from routes.weather import get_weather_log_stats, get_weather_check_status
+    result["log_stats"] = get_weather_log_stats()
+    result["check_schedule"] = get_weather_check_status()
+
+    import location_service
+    result["location"] = location_service.get_location_status()
+
+    if config.weather_source == "nws":
+        from routes.weather import get_nws_cache_status
+        result["nws_cache"] = get_nws_cache_status()
+
     # Try live fetch
     try:
         weather = await get_weather_data()
@@ -1197,10 +1196,11 @@ def _csv_escape(value: str) -> str:
 async def homeowner_clear_weather_log(request: Request):
     """Clear the weather event log."""
     _require_data_control(request)
-    from routes.weather import WEATHER_LOG_FILE
+    from routes.weather import WEATHER_LOG_FILE, clear_weather_index
     try:
         if os.path.exists(WEATHER_LOG_FILE):
             os.remove(WEATHER_LOG_FILE)
+        clear_weather_index()
         log_change(get_actor(request), "Weather", "Cleared weather event log")
         return {"success": True, "message": "Weather log cleared"}
     except Exception as e:
@@ -1235,6 +1235,14 @@ async def homeowner_clear_moisture_debug_log(request: Request):
     return {"success": True}
 
 
+@router.get("/debug/advance-metrics", summary="Get next-zone start latency")
+async def homeowner_advance_metrics():
+    """Latency of recent moisture-driven zone advances (request → next zone ON)."""
+    _require_homeowner_mode()
+    from routes.moisture import get_advance_metrics
+    return get_advance_metrics()
+
+
 @router.get("/debug/remote-log", summary="Get remote device debug log")
 async def homeowner_remote_debug_log(lines: int = Query(200, ge=1, le=500)):
     """Get the remote device sync debug log for troubleshooting entity mirroring."""
@@ -1267,6 +1275,24 @@ async def homeowner_broker_status():
         }
 
 
+@router.get("/debug/broker-metrics", summary="Get broker latency and throughput metrics")
+async def homeowner_broker_metrics():
+    """Per-device, per-direction relay latency histograms, throughput, failures,
+    suppressed/coalesced writes and queue depths for the remote broker."""
+    _require_homeowner_mode()
+    import broker_metrics
+    return broker_metrics.get_metrics()
+
+
+@router.delete("/debug/broker-metrics", summary="Reset broker metrics")
+async def homeowner_reset_broker_metrics(request: Request):
+    """Reset all broker metric counters."""
+    _require_data_control(request)
+    import broker_metrics
+    broker_metrics.reset_metrics()
+    return {"success": True}
+
+
 @router.post("/debug/broker-force-sync", summary="Force a full broker sync")
 async def homeowner_broker_force_sync(request: Request):
     """Manually trigger a full controller→remote sync and clear sync_needed."""
@@ -1868,7 +1868,7 @@ function formatAddress(c) {
 }
 
 // --- Location Map ---
-async function initDetailMap(addrData) {
+async function initDetailMap(addrData, retried) {
     const mapEl = document.getElementById('detailMap');
     const addr = formatAddress(addrData);
     if (!addr) { mapEl.style.display = 'none'; return; }
@@ -1883,6 +1883,8 @@ async function initDetailMap(addrData) {
             showMap(geo.lat, geo.lon, addr);
         } else {
             mapEl.style.display = 'none';
+            // Address is being geocoded in the background — ask once more
+            if (geo.pending && !retried) setTimeout(() => initDetailMap(addrData, true), 3000);
         }
     } catch (e) {
         console.warn('Geocoding failed:', e);
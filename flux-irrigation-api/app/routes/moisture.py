@@ -22,6 +22,7 @@ import json
 import os
 import re
 import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -46,7 +47,7 @@ TARGET_WAKE_BEFORE_MINUTES = 10  # Default: probe wakes this many minutes before
 
 def _get_wake_before_minutes() -> int:
     """Get the configurable wake-before-minutes from moisture settings."""
-    data = _load_data()
+    data = _read_data()
     return data.get("wake_before_minutes", TARGET_WAKE_BEFORE_MINUTES)
 
 
@@ -55,7 +56,7 @@ MAX_WAKE_MINUTES_DEFAULT = 120  # Default max awake time before auto re-enabling
 
 def _get_max_wake_minutes() -> int:
     """Get the configurable max wake time from moisture settings.  0 = unlimited."""
-    data = _load_data()
+    data = _read_data()
     return data.get("max_wake_minutes", MAX_WAKE_MINUTES_DEFAULT)
 
 
@@ -64,7 +65,7 @@ SCHEDULE_SHIFT_MAX_DEFAULT = 0  # Default: no schedule shifting (0 = disabled)
 
 def _get_schedule_shift_max_minutes() -> int:
     """Get the max allowed schedule start time shift in minutes.  0 = disabled."""
-    data = _load_data()
+    data = _read_data()
     return data.get("schedule_shift_max_minutes", SCHEDULE_SHIFT_MAX_DEFAULT)
 
 
@@ -289,6 +290,8 @@ async def _fetch_probe_last_sleep_time(probe: dict) -> datetime | None:
     status_led_eid = extra.get("status_led")
     if not status_led_eid:
         return None
+    if status_led_eid in _status_led_last_changed:
+        return _status_led_last_changed[status_led_eid]  # kept current by events
     try:
         state_obj = await ha_client.get_entity_state(status_led_eid)
         if not state_obj:
@@ -301,6 +304,8 @@ async def _fetch_probe_last_sleep_time(probe: dict) -> datetime | None:
         dt = datetime.fromisoformat(last_changed_str)
         # Convert to local time (naive) for minute-of-day calculations
         local_dt = dt.astimezone().replace(tzinfo=None)
+        if _event_watched is not None and status_led_eid in _event_watched:
+            _status_led_last_changed[status_led_eid] = local_dt
         return local_dt
     except Exception as e:
         print(f"[MOISTURE] Failed to fetch status_led last_changed for {status_led_eid}: {e}")
@@ -321,6 +326,7 @@ PROBE_KEYWORDS = ["gophr", "moisture", "soil"]
 
 _sensor_cache: dict[str, dict] = {}  # in-memory: {entity_id: {state, last_updated, ...}}
 _sensor_cache_loaded = False
+_sensor_cache_generation = 0  # bumped whenever cached readings change
 
 # --- Probe Awake Status Cache ---
 # Gophr probes expose a status LED entity (light.*_status_led).
@@ -469,10 +475,11 @@ async def _get_probe_battery_level(probe_id: str, probe: dict) -> float | None:
 
 def _load_sensor_cache():
     """Load the sensor value cache from disk (once)."""
-    global _sensor_cache, _sensor_cache_loaded
+    global _sensor_cache, _sensor_cache_loaded, _sensor_cache_generation
     if _sensor_cache_loaded:
         return
     _sensor_cache_loaded = True
+    _sensor_cache_generation += 1
     if os.path.exists(SENSOR_CACHE_FILE):
         try:
             with open(SENSOR_CACHE_FILE, "r") as f:
@@ -481,14 +488,61 @@ def _load_sensor_cache():
             _sensor_cache = {}
 
 
+# Sensor cache writes are debounced: each change re-arms a short timer, but a
+# flush is never deferred more than _SENSOR_CACHE_MAX_DELAY after the first
+# unsaved change.  During active runs this turns a rewrite per reading into
+# one compact write per burst.
+_SENSOR_CACHE_DEBOUNCE = 5.0     # seconds of quiet before flushing
+_SENSOR_CACHE_MAX_DELAY = 30.0   # upper bound on how long a change stays unsaved
+_sensor_cache_dirty_since: float | None = None  # monotonic time of first unsaved change
+_sensor_cache_flush_handle: asyncio.TimerHandle | None = None
+
+
 def _save_sensor_cache():
-    """Persist the sensor value cache to disk."""
+    """Schedule a debounced write of the sensor value cache to disk.
+
+    Every cache mutation goes through here, so this also advances the
+    sensor cache generation used by the zone multiplier memo.
+    Outside a running event loop the cache is written immediately.
+    """
+    global _sensor_cache_dirty_since, _sensor_cache_flush_handle, _sensor_cache_generation
+    _sensor_cache_generation += 1
+    now = time.monotonic()
+    if _sensor_cache_dirty_since is None:
+        _sensor_cache_dirty_since = now
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        flush_sensor_cache()
+        return
+    if _sensor_cache_flush_handle is not None:
+        _sensor_cache_flush_handle.cancel()
+    deadline = _sensor_cache_dirty_since + _SENSOR_CACHE_MAX_DELAY
+    delay = max(0.0, min(_SENSOR_CACHE_DEBOUNCE, deadline - now))
+    _sensor_cache_flush_handle = loop.call_later(delay, flush_sensor_cache)
+
+
+def flush_sensor_cache():
+    """Write the sensor value cache to disk now if it has unsaved changes.
+
+    Written compactly to a temp file and renamed into place.  Called by the
+    debounce timer and on shutdown.
+    """
+    global _sensor_cache_dirty_since, _sensor_cache_flush_handle
+    if _sensor_cache_flush_handle is not None:
+        _sensor_cache_flush_handle.cancel()
+        _sensor_cache_flush_handle = None
+    if _sensor_cache_dirty_since is None:
+        return
+    tmp_path = SENSOR_CACHE_FILE + ".tmp"
     try:
         os.makedirs(os.path.dirname(SENSOR_CACHE_FILE), exist_ok=True)
-        with open(SENSOR_CACHE_FILE, "w") as f:
-            json.dump(_sensor_cache, f, indent=2)
-    except IOError:
-        pass
+        with open(tmp_path, "w") as f:
+            json.dump(_sensor_cache, f, separators=(",", ":"))
+        os.replace(tmp_path, SENSOR_CACHE_FILE)
+        _sensor_cache_dirty_since = None
+    except IOError as e:
+        print(f"[MOISTURE] Failed to save sensor cache: {e}")
 
 
 async def _find_status_led(probe_id: str, probe: dict) -> Optional[str]:
@@ -526,16 +580,17 @@ async def _find_status_led(probe_id: str, probe: dict) -> Optional[str]:
     return None
 
 
-async def _check_probe_awake(probe_id: str) -> bool:
+async def _check_probe_awake(probe_id: str, update_cache: bool = True) -> bool:
     """Determine if a Gophr probe is awake by reading its status LED entity.
 
     The Gophr device exposes a light.*_status_led entity.
-    ON = awake, OFF = sleeping.  Result is cached in _probe_awake_cache.
+    ON = awake, OFF = sleeping.  Result is cached in _probe_awake_cache
+    unless update_cache is False (the caller records it under the awake lock).
 
     If the status_led entity isn't in extra_sensors yet, auto-discovers it
     by scanning the entity registry for the probe's device_id.
     """
-    data = _load_data()
+    data = _read_data()
     probe = data.get("probes", {}).get(probe_id)
     if not probe:
         return False
@@ -551,335 +606,441 @@ async def _check_probe_awake(probe_id: str) -> bool:
     state = await ha_client.get_entity_state(status_led_eid)
     if not state:
         # Couldn't read state — use cached value or assume sleeping
-        global _consecutive_unavailable
-        _consecutive_unavailable += 1
+        _probe_unavailable[probe_id] = _probe_unavailable.get(probe_id, 0) + 1
         return _probe_awake_cache.get(probe_id, False)
 
     raw = state.get("state", "").lower()
     if raw in ("unavailable", "unknown"):
-        _consecutive_unavailable += 1
+        _probe_unavailable[probe_id] = _probe_unavailable.get(probe_id, 0) + 1
         return _probe_awake_cache.get(probe_id, False)
 
     # Device is responsive — reset backoff
-    _consecutive_unavailable = 0
+    _probe_unavailable.pop(probe_id, None)
     is_awake = raw == "on"
-    _probe_awake_cache[probe_id] = is_awake
+    if update_cache:
+        _probe_awake_cache[probe_id] = is_awake
     return is_awake
 
 
 _awake_poller_task: asyncio.Task | None = None
 _AWAKE_POLL_INTERVAL = 30  # seconds (was 5 — reduced to prevent ESP32 overload)
-_consecutive_unavailable = 0  # backoff counter when device is offline
+_AWAKE_CONSISTENCY_INTERVAL = 300  # seconds between status LED reads while events flow
+_probe_unavailable: dict[str, int] = {}  # probe_id -> consecutive unavailable reads (backoff)
+_last_led_poll: dict[str, float] = {}  # probe_id -> monotonic time of last status LED read
+_probe_poll_tasks: dict[str, asyncio.Task] = {}  # probe_id -> its _probe_poll_loop task
+_awake_locks: dict[str, asyncio.Lock] = {}  # probe_id -> serializes transition handling
+
+
+def _get_awake_lock(probe_id: str) -> asyncio.Lock:
+    lock = _awake_locks.get(probe_id)
+    if lock is None:
+        lock = _awake_locks[probe_id] = asyncio.Lock()
+    return lock
+
+
+def _handle_awake_transition(
+    probe_id: str, probe: dict, was_awake: bool, now_awake: bool,
+    prep: dict | None, timeline: dict,
+):
+    """React to a probe's sleeping ↔ awake transition.
+
+    Shared by the status LED event handler and the consistency poll.  Call
+    with the probe's awake lock held so a transition is handled exactly once.
+    Slow work (pending writes, prepped-wake checks) is spawned as tasks.
+    """
+    # Log state transitions (not every poll — only changes)
+    if now_awake != was_awake:
+        display = probe.get("display_name", probe_id)
+        transition = "SLEEPING → AWAKE" if now_awake else "AWAKE → SLEEPING"
+        print(f"[MOISTURE] Probe {display} state change: {transition}")
+        # Persist actual wake/sleep timestamps
+        if now_awake:
+            _log_wake(probe_id)
+        else:
+            _log_sleep(probe_id)
+
+    # --- Sleep transition: clear wake timer ---
+    if not now_awake and was_awake:
+        _probe_wake_start.pop(probe_id, None)
+
+    # --- Wake transition detection ---
+    if now_awake and not was_awake:
+        # On add-on restart, _probe_awake_cache is empty so all
+        # awake probes appear as fresh wakes.  `was_awake` is
+        # False only because we hadn't polled yet, not because
+        # the probe actually just woke up.  Detect this by
+        # checking if was_awake defaulted (probe_id wasn't in
+        # cache at all before _check_probe_awake set it).
+        is_startup_detection = (was_awake is False and
+                                probe_id not in _probe_wake_start)
+        prep_state_val = prep.get("state") if prep else None
+        if (is_startup_detection and
+                prep_state_val in (None, "idle")):
+            # Likely already awake before restart — be aggressive:
+            # pretend probe has been awake for half of max_wake
+            half_wake = (_get_max_wake_minutes() * 60) / 2
+            _probe_wake_start[probe_id] = time.time() - half_wake
+            display = probe.get("display_name", probe_id)
+            print(f"[MOISTURE] Startup: {display} already awake "
+                  f"with no active prep — setting wake_start to "
+                  f"{half_wake / 60:.0f} min ago as safety margin")
+        else:
+            _probe_wake_start[probe_id] = time.time()
+        prep_state = prep.get("state") if prep else None
+        is_scheduled = prep_state == "prep_pending"
+        is_reprogram_wake = prep_state == "pending_reprogram"
+        label = " (scheduled wake)" if is_scheduled else (
+            " (reprogram wake)" if is_reprogram_wake else "")
+        print(f"[MOISTURE] Awake detected wake: {probe_id}{label}")
+        asyncio.create_task(on_probe_wake(probe_id, scheduled=is_scheduled))
+
+        if is_reprogram_wake:
+            # Phase 1 wake: the pending sleep duration was just applied
+            # by on_probe_wake(). Transition to prep_pending — probe will
+            # sleep again with the new shorter duration and wake before zone.
+            prep["state"] = "prep_pending"
+            _save_probe_prep(probe_id, prep)
+            display = probe.get("display_name", probe_id)
+            print(f"[MOISTURE] {display} reprogram wake complete — "
+                  f"state → prep_pending, probe will sleep with new duration "
+                  f"and wake before zone {prep.get('active_zone_num')}")
+
+        # Schedule-aware: check if this is the actual pre-zone wake
+        elif is_scheduled:
+            asyncio.create_task(
+                _handle_prepped_wake(probe_id, probe, prep, timeline)
+            )
+
+
+async def on_status_led_change(entity_id: str, new_state: str):
+    """Handle a status LED state_changed event from the WebSocket watcher.
+
+    This is the primary awake/sleep signal: pending writes and prep logic
+    fire as soon as the LED turns on instead of on the next poll.
+    """
+    if _event_watched is not None and entity_id in _event_watched:
+        _status_led_last_changed[entity_id] = datetime.now()
+    raw = (new_state or "").lower()
+    if raw not in ("on", "off"):
+        return  # unavailable/unknown — keep the last known state
+    data = _read_data()
+    if not data.get("enabled"):
+        return
+    probe_id = _get_zone_index().led_to_probe.get(entity_id)
+    probe = data.get("probes", {}).get(probe_id) if probe_id else None
+    if probe is None:
+        return
+
+    _probe_unavailable.pop(probe_id, None)
+    now_awake = raw == "on"
+    async with _get_awake_lock(probe_id):
+        was_awake = _probe_awake_cache.get(probe_id, False)
+        known = probe_id in _probe_awake_cache
+        _probe_awake_cache[probe_id] = now_awake
+        if known and was_awake == now_awake:
+            return
+        timeline = _load_schedule_timeline()
+        prep = (timeline.get("probe_prep", {}) if timeline else {}).get(probe_id)
+        _handle_awake_transition(probe_id, probe, was_awake, now_awake, prep, timeline)
 
 
 async def _awake_poll_loop():
-    """Background task that polls all configured probes periodically.
+    """Background supervisor keeping one polling task per configured probe.
 
-    Reads each probe's status LED entity (light.*_status_led) to determine
-    awake/sleeping state.  Detects wake transitions and fires pending writes.
+    Each probe runs its own _probe_poll_loop() with its own unavailable
+    backoff, so a slow or offline probe cannot delay the others.  Tasks are
+    started for new probes and cancelled for removed ones every
+    _AWAKE_POLL_INTERVAL.
+    """
+    try:
+        while True:
+            try:
+                data = _read_data()
+                probes = data.get("probes", {}) if data.get("enabled") else {}
+                for probe_id in list(_probe_poll_tasks):
+                    if probe_id not in probes or _probe_poll_tasks[probe_id].done():
+                        _probe_poll_tasks.pop(probe_id).cancel()
+                        _probe_unavailable.pop(probe_id, None)
+                for probe_id in probes:
+                    if probe_id not in _probe_poll_tasks:
+                        _probe_poll_tasks[probe_id] = asyncio.create_task(
+                            _probe_poll_loop(probe_id)
+                        )
+            except Exception as e:
+                print(f"[MOISTURE] Awake poll supervisor error: {e}")
+            await asyncio.sleep(_AWAKE_POLL_INTERVAL)
+    finally:
+        for task in _probe_poll_tasks.values():
+            task.cancel()
+        _probe_poll_tasks.clear()
+
+
+async def _probe_poll_loop(probe_id: str):
+    """Background task running the time-driven logic for a single probe.
+
+    Awake/sleep transitions normally arrive as status LED (light.*_status_led)
+    state_changed events via on_status_led_change().  This loop re-reads the
+    LED only as a slow consistency check (every _AWAKE_CONSISTENCY_INTERVAL),
+    or on every tick while the WebSocket is down or not subscribed to this
+    probe's LED.
 
     Also handles probe-aware irrigation scheduling:
     1. Time-based check: when we reach the prep trigger time, reprogram the
        probe's sleep duration so it wakes ~10 min before the zone starts
     2. Wake transition check: when a prepped probe wakes up, check moisture
        and either skip the zone (saturated) or disable sleep (keep awake)
+    3. Max wake watchdog: force sleep when a probe stays awake too long
     """
-    global _consecutive_unavailable
     while True:
         try:
-            # Back off when device is unavailable to stop hammering it
-            if _consecutive_unavailable >= 3:
-                backoff = min(_consecutive_unavailable * 30, 300)  # max 5 min
-                await asyncio.sleep(backoff)
+            # Back off while this probe is unavailable to stop hammering it
+            misses = _probe_unavailable.get(probe_id, 0)
+            if misses >= 3:
+                await asyncio.sleep(min(misses * 30, 300))  # max 5 min
             else:
                 await asyncio.sleep(_AWAKE_POLL_INTERVAL)
             data = _load_data()
-            if not data.get("enabled"):
-                _consecutive_unavailable = 0
-                continue
-            probes = data.get("probes", {})
-            if not probes:
-                # No probes configured — nothing to poll
-                await asyncio.sleep(60)
-                continue
+            probe = data.get("probes", {}).get(probe_id)
+            if not data.get("enabled") or not probe:
+                continue  # supervisor cancels this task
 
             # Load schedule timeline for prep logic
             timeline = _load_schedule_timeline()
             probe_prep = timeline.get("probe_prep", {}) if timeline else {}
-            now = datetime.now()
-            current_minutes = now.hour * 60 + now.minute
-
-            for probe_id, probe in probes.items():
-                was_awake = _probe_awake_cache.get(probe_id, False)
-                now_awake = await _check_probe_awake(probe_id)
-
-                # Log state transitions (not every poll — only changes)
-                if now_awake != was_awake:
-                    display = probe.get("display_name", probe_id)
-                    transition = "SLEEPING → AWAKE" if now_awake else "AWAKE → SLEEPING"
-                    print(f"[MOISTURE] Probe {display} state change: {transition}")
-                    # Persist actual wake/sleep timestamps
-                    if now_awake:
-                        _log_wake(probe_id)
-                    else:
-                        _log_sleep(probe_id)
-
-                # --- Schedule-aware prep: time-based trigger ---
-                prep = probe_prep.get(probe_id)
-                if prep and prep.get("state") == "idle":
-                    for entry in prep.get("prep_entries", []):
-                        trigger_min = entry.get("prep_trigger_minutes", -1)
-                        zone_start_min = entry.get("zone_start_minutes", -1)
-                        # Check if we've reached the prep trigger time
-                        # Use a 2-minute window to avoid missing the trigger
-                        time_diff = (current_minutes - trigger_min) % 1440
-                        if 0 <= time_diff <= 2:
-                            asyncio.create_task(
-                                _prep_probe_for_schedule(
-                                    probe_id, probe, entry, prep, timeline
-                                )
-                            )
-                            break  # Only handle one prep per cycle
-
-                # --- Sleep transition: clear wake timer ---
-                if not now_awake and was_awake:
-                    _probe_wake_start.pop(probe_id, None)
-
-                # --- Wake transition detection ---
-                if now_awake and not was_awake:
-                    # On add-on restart, _probe_awake_cache is empty so all
-                    # awake probes appear as fresh wakes.  `was_awake` is
-                    # False only because we hadn't polled yet, not because
-                    # the probe actually just woke up.  Detect this by
-                    # checking if was_awake defaulted (probe_id wasn't in
-                    # cache at all before _check_probe_awake set it).
-                    is_startup_detection = (was_awake is False and
-                                            probe_id not in _probe_wake_start)
-                    prep_state_val = prep.get("state") if prep else None
-                    if (is_startup_detection and
-                            prep_state_val in (None, "idle")):
-                        # Likely already awake before restart — be aggressive:
-                        # pretend probe has been awake for half of max_wake
-                        half_wake = (_get_max_wake_minutes() * 60) / 2
-                        _probe_wake_start[probe_id] = time.time() - half_wake
-                        display = probe.get("display_name", probe_id)
-                        print(f"[MOISTURE] Startup: {display} already awake "
-                              f"with no active prep — setting wake_start to "
-                              f"{half_wake / 60:.0f} min ago as safety margin")
-                    else:
-                        _probe_wake_start[probe_id] = time.time()
-                    prep_state = prep.get("state") if prep else None
-                    is_scheduled = prep_state == "prep_pending"
-                    is_reprogram_wake = prep_state == "pending_reprogram"
-                    label = " (scheduled wake)" if is_scheduled else (
-                        " (reprogram wake)" if is_reprogram_wake else "")
-                    print(f"[MOISTURE] Awake poll detected wake: {probe_id}{label}")
-                    asyncio.create_task(on_probe_wake(probe_id, scheduled=is_scheduled))
-
-                    if is_reprogram_wake:
-                        # Phase 1 wake: the pending sleep duration was just applied
-                        # by on_probe_wake(). Transition to prep_pending — probe will
-                        # sleep again with the new shorter duration and wake before zone.
-                        prep["state"] = "prep_pending"
-                        _save_schedule_timeline(timeline)
-                        display = probe.get("display_name", probe_id)
-                        print(f"[MOISTURE] {display} reprogram wake complete — "
-                              f"state → prep_pending, probe will sleep with new duration "
-                              f"and wake before zone {prep.get('active_zone_num')}")
-
-                    # Schedule-aware: check if this is the actual pre-zone wake
-                    elif is_scheduled:
-                        asyncio.create_task(
-                            _handle_prepped_wake(probe_id, probe, prep, timeline)
-                        )
+            await _poll_probe(probe_id, probe, probe_prep.get(probe_id), timeline)
 
-                # --- Max wake time enforcement ---
-                # Safety net that prevents probes from draining battery.
-                #
-                # SKIP if sleep is explicitly disabled by the user — they
-                # intentionally want the probe to stay awake indefinitely.
-                #
-                # SCHEDULE-AWARE: If the probe is awake for a scheduled
-                # reason (prep state is monitoring, prep_pending, etc.),
-                # we allow up to MAX_DAILY_WAKE_EXCEEDANCES (2) overruns
-                # per day IF battery is above MIN_BATTERY_FOR_EXTENDED_WAKE
-                # (70%).  Otherwise we force sleep immediately.
-                #
-                # NON-SCHEDULED: If prep state is idle/None, the watchdog
-                # fires the moment max_wake is exceeded — no grace.
-                sleep_disabled_eid = (probe.get("extra_sensors") or {}).get("sleep_disabled")
-                user_disabled_sleep = False
-                if sleep_disabled_eid:
-                    sd_state = await ha_client.get_entity_state(sleep_disabled_eid)
-                    user_disabled_sleep = (sd_state or {}).get("state") == "on"
-
-                max_wake = _get_max_wake_minutes()
-                wake_ts = _probe_wake_start.get(probe_id)
-                if max_wake > 0 and now_awake and wake_ts is not None and wake_ts > 0 and not user_disabled_sleep:
-                    elapsed = time.time() - wake_ts
-                    if elapsed > max_wake * 60:
-                        display = probe.get("display_name", probe_id)
-                        prep_state = prep.get("state") if prep else None
-                        is_scheduled_wake = prep_state in (
-                            "monitoring", "prep_pending", "sleeping_between",
-                            "awake_checking", "checking_next",
-                        )
+        except asyncio.CancelledError:
+            break
+        except Exception as e:
+            print(f"[MOISTURE] Awake poll error ({probe_id}): {e}")
+            await asyncio.sleep(10)
 
-                        # --- Schedule-aware grace period ---
-                        force_sleep = True  # default: force sleep
-                        if is_scheduled_wake:
-                            exceedances_today = _get_daily_exceedance_count(probe_id)
-                            battery = await _get_probe_battery_level(probe_id, probe)
-                            battery_ok = battery is not None and battery >= MIN_BATTERY_FOR_EXTENDED_WAKE
-                            under_limit = exceedances_today < MAX_DAILY_WAKE_EXCEEDANCES
-
-                            if battery_ok and under_limit:
-                                # Allow this scheduled wake to exceed max_wake.
-                                # Only log once per exceedance (use 2x max_wake
-                                # as the hard ceiling even with grace).
-                                if elapsed <= max_wake * 60 * 2:
-                                    force_sleep = False
-                                    # Log on first detection (within a 10-sec window)
-                                    if elapsed < (max_wake * 60) + 10:
-                                        print(
-                                            f"[MOISTURE] Max wake ({max_wake} min) "
-                                            f"exceeded for {display} during "
-                                            f"scheduled wake (prep={prep_state}, "
-                                            f"battery={battery:.0f}%, "
-                                            f"exceedances today={exceedances_today}/"
-                                            f"{MAX_DAILY_WAKE_EXCEEDANCES}) — "
-                                            f"allowing extended wake")
-                                else:
-                                    # Hit 2x max_wake — hard ceiling, force sleep
-                                    print(
-                                        f"[MOISTURE] ⚠️ HARD CEILING: {display} "
-                                        f"awake {elapsed / 60:.1f} min (2x limit). "
-                                        f"Forcing sleep despite scheduled wake.")
-                            else:
-                                # Battery too low or too many exceedances
-                                reason = []
-                                if not battery_ok:
-                                    reason.append(
-                                        f"battery={'unknown' if battery is None else f'{battery:.0f}%'}"
-                                        f" < {MIN_BATTERY_FOR_EXTENDED_WAKE}%")
-                                if not under_limit:
-                                    reason.append(
-                                        f"exceedances={exceedances_today}/"
-                                        f"{MAX_DAILY_WAKE_EXCEEDANCES}")
-                                print(
-                                    f"[MOISTURE] ⚠️ MAX WAKE WATCHDOG: {display} "
-                                    f"exceeded {max_wake} min during scheduled wake "
-                                    f"but cannot allow extension — "
-                                    f"{', '.join(reason)}. FORCING SLEEP.")
-
-                        else:
-                            # Not a scheduled wake — no grace
-                            print(
-                                f"[MOISTURE] ⚠️ MAX WAKE WATCHDOG: {display} has "
-                                f"been awake {elapsed / 60:.1f} min (limit: "
-                                f"{max_wake} min). Prep state: {prep_state}. "
-                                f"FORCING SLEEP.")
 
-                        if force_sleep:
-                            # Track this as an exceedance for today
-                            _increment_exceedance_count(probe_id)
-                            exc_count = _get_daily_exceedance_count(probe_id)
+async def _poll_probe(probe_id: str, probe: dict, prep: dict | None, timeline: dict):
+    """One tick of a probe's awake loop: LED consistency read, prep trigger, watchdog."""
+    import run_log
+    now = datetime.now()
+    current_minutes = now.hour * 60 + now.minute
+    # Only LEDs the watcher subscribed to at connect time send events; one
+    # discovered later (or a probe added since) is polled every tick
+    led_eid = (probe.get("extra_sensors") or {}).get("status_led")
+    led_watched = (run_log.is_websocket_live() and _event_watched is not None
+                   and led_eid in _event_watched)
+    led_poll_due = (not led_watched or
+                    time.monotonic() - _last_led_poll.get(probe_id, 0.0)
+                    >= _AWAKE_CONSISTENCY_INTERVAL)
+
+    if led_poll_due or probe_id not in _probe_awake_cache:
+        _last_led_poll[probe_id] = time.monotonic()
+        # Read outside the lock: LED events take it from the WebSocket
+        # receive loop and must not wait on a slow or offline probe
+        now_awake = await _check_probe_awake(probe_id, update_cache=False)
+        async with _get_awake_lock(probe_id):
+            was_awake = _probe_awake_cache.get(probe_id, False)
+            _probe_awake_cache[probe_id] = now_awake
+            _handle_awake_transition(
+                probe_id, probe, was_awake, now_awake, prep, timeline,
+            )
+    else:
+        now_awake = _probe_awake_cache.get(probe_id, False)
+
+    # --- Schedule-aware prep: time-based trigger ---
+    if prep and prep.get("state") == "idle":
+        for entry in prep.get("prep_entries", []):
+            trigger_min = entry.get("prep_trigger_minutes", -1)
+            zone_start_min = entry.get("zone_start_minutes", -1)
+            # Check if we've reached the prep trigger time
+            # Use a 2-minute window to avoid missing the trigger
+            time_diff = (current_minutes - trigger_min) % 1440
+            if 0 <= time_diff <= 2:
+                asyncio.create_task(
+                    _prep_probe_for_schedule(
+                        probe_id, probe, entry, prep, timeline
+                    )
+                )
+                break  # Only handle one prep per cycle
+
+    # --- Max wake time enforcement ---
+    # Safety net that prevents probes from draining battery.
+    #
+    # SKIP if sleep is explicitly disabled by the user — they
+    # intentionally want the probe to stay awake indefinitely.
+    #
+    # SCHEDULE-AWARE: If the probe is awake for a scheduled
+    # reason (prep state is monitoring, prep_pending, etc.),
+    # we allow up to MAX_DAILY_WAKE_EXCEEDANCES (2) overruns
+    # per day IF battery is above MIN_BATTERY_FOR_EXTENDED_WAKE
+    # (70%).  Otherwise we force sleep immediately.
+    #
+    # NON-SCHEDULED: If prep state is idle/None, the watchdog
+    # fires the moment max_wake is exceeded — no grace.
+    sleep_disabled_eid = (probe.get("extra_sensors") or {}).get("sleep_disabled")
+    user_disabled_sleep = False
+    if sleep_disabled_eid and now_awake:
+        sd_state = await ha_client.get_entity_state(sleep_disabled_eid)
+        user_disabled_sleep = (sd_state or {}).get("state") == "on"
+
+    max_wake = _get_max_wake_minutes()
+    wake_ts = _probe_wake_start.get(probe_id)
+    if max_wake > 0 and now_awake and wake_ts is not None and wake_ts > 0 and not user_disabled_sleep:
+        elapsed = time.time() - wake_ts
+        if elapsed > max_wake * 60:
+            display = probe.get("display_name", probe_id)
+            prep_state = prep.get("state") if prep else None
+            is_scheduled_wake = prep_state in (
+                "monitoring", "prep_pending", "sleeping_between",
+                "awake_checking", "checking_next",
+            )
 
+            # --- Schedule-aware grace period ---
+            force_sleep = True  # default: force sleep
+            if is_scheduled_wake:
+                exceedances_today = _get_daily_exceedance_count(probe_id)
+                battery = await _get_probe_battery_level(probe_id, probe)
+                battery_ok = battery is not None and battery >= MIN_BATTERY_FOR_EXTENDED_WAKE
+                under_limit = exceedances_today < MAX_DAILY_WAKE_EXCEEDANCES
+
+                if battery_ok and under_limit:
+                    # Allow this scheduled wake to exceed max_wake.
+                    # Only log once per exceedance (use 2x max_wake
+                    # as the hard ceiling even with grace).
+                    if elapsed <= max_wake * 60 * 2:
+                        force_sleep = False
+                        # Log on first detection (within a 10-sec window)
+                        if elapsed < (max_wake * 60) + 10:
                             print(
-                                f"[MOISTURE] Watchdog forced sleep for "
-                                f"'{display}' — awake {elapsed / 60:.0f} min "
-                                f"(limit: {max_wake} min). Exceedances today: "
-                                f"{exc_count}.")
-
-                            # Log to probe history
-                            try:
-                                import run_log
-                                battery = await _get_probe_battery_level(
-                                    probe_id, probe)
-                                run_log.log_probe_event(
-                                    probe_id=probe_id,
-                                    event_type="watchdog_force_sleep",
-                                    display_name=display,
-                                    details={
-                                        "awake_minutes": round(elapsed / 60, 1),
-                                        "max_wake_minutes": max_wake,
-                                        "exceedances_today": exc_count,
-                                        "battery": round(battery, 0) if battery is not None else None,
-                                        "prep_state": prep_state,
-                                    },
-                                )
-                            except Exception:
-                                pass
-
-                            # Step 1: Re-enable sleep
-                            await set_probe_sleep_disabled(probe_id, False)
-
-                            # Step 2: FORCE immediate sleep via sleep_now button
-                            await press_probe_sleep_now(probe_id)
-
-                            # Step 3: Reset prep state machine if stuck
-                            if prep and prep.get("state") not in ("idle", None):
-                                old_state = prep.get("state")
-                                for skipped in prep.get("skipped_zones", []):
-                                    enable_entity = skipped.get("enable_entity")
-                                    zone_num = skipped.get("zone_num")
-                                    if enable_entity:
-                                        await ha_client.call_service(
-                                            "switch", "turn_on",
-                                            {"entity_id": enable_entity}
-                                        )
-                                        print(f"[MOISTURE] Watchdog: re-enabled "
-                                              f"zone {zone_num} ({enable_entity})")
-                                prep["state"] = "idle"
-                                prep["skipped_zones"] = []
-                                prep["active_schedule_start_time"] = None
-                                prep["active_zone_entity_id"] = None
-                                prep["active_zone_num"] = None
-                                _save_schedule_timeline(timeline)
-                                print(f"[MOISTURE] Watchdog: reset prep state "
-                                      f"{old_state} → idle for {display}")
-
-                            # Step 4: Restore original sleep duration
-                            original = _original_sleep_durations.pop(probe_id, None)
-                            if original is not None:
-                                await _set_probe_sleep_duration(probe_id, original)
-                                print(f"[MOISTURE] Watchdog: restored original "
-                                      f"sleep duration {original} min for {display}")
-
-                            # Set retry sentinel
-                            _probe_wake_start[probe_id] = -time.time()
-
-                elif max_wake > 0 and now_awake and wake_ts is not None and wake_ts < 0 and not user_disabled_sleep:
-                    # Sentinel: watchdog already fired (negative timestamp).
-                    # If probe is STILL awake 2 min after watchdog, retry.
-                    fired_at = -wake_ts
-                    since_fired = time.time() - fired_at
-                    if since_fired > 120:  # 2 minutes since last attempt
-                        display = probe.get("display_name", probe_id)
-                        print(f"[MOISTURE] ⚠️ WATCHDOG RETRY: {display} still awake "
-                              f"{since_fired / 60:.1f} min after watchdog fired! "
-                              f"Retrying sleep_now...")
-                        try:
-                            import run_log
-                            run_log.log_probe_event(
-                                probe_id=probe_id,
-                                event_type="watchdog_retry",
-                                display_name=display,
-                                details={
-                                    "minutes_since_watchdog": round(since_fired / 60, 1),
-                                },
-                            )
-                        except Exception:
-                            pass
-                        await set_probe_sleep_disabled(probe_id, False)
-                        await press_probe_sleep_now(probe_id)
-                        _probe_wake_start[probe_id] = -time.time()
+                                f"[MOISTURE] Max wake ({max_wake} min) "
+                                f"exceeded for {display} during "
+                                f"scheduled wake (prep={prep_state}, "
+                                f"battery={battery:.0f}%, "
+                                f"exceedances today={exceedances_today}/"
+                                f"{MAX_DAILY_WAKE_EXCEEDANCES}) — "
+                                f"allowing extended wake")
+                    else:
+                        # Hit 2x max_wake — hard ceiling, force sleep
+                        print(
+                            f"[MOISTURE] ⚠️ HARD CEILING: {display} "
+                            f"awake {elapsed / 60:.1f} min (2x limit). "
+                            f"Forcing sleep despite scheduled wake.")
+                else:
+                    # Battery too low or too many exceedances
+                    reason = []
+                    if not battery_ok:
+                        reason.append(
+                            f"battery={'unknown' if battery is None else f'{battery:.0f}%'}"
+                            f" < {MIN_BATTERY_FOR_EXTENDED_WAKE}%")
+                    if not under_limit:
+                        reason.append(
+                            f"exceedances={exceedances_today}/"
+                            f"{MAX_DAILY_WAKE_EXCEEDANCES}")
+                    print(
+                        f"[MOISTURE] ⚠️ MAX WAKE WATCHDOG: {display} "
+                        f"exceeded {max_wake} min during scheduled wake "
+                        f"but cannot allow extension — "
+                        f"{', '.join(reason)}. FORCING SLEEP.")
 
-        except asyncio.CancelledError:
-            break
-        except Exception as e:
-            print(f"[MOISTURE] Awake poll error: {e}")
-            await asyncio.sleep(10)
+            else:
+                # Not a scheduled wake — no grace
+                print(
+                    f"[MOISTURE] ⚠️ MAX WAKE WATCHDOG: {display} has "
+                    f"been awake {elapsed / 60:.1f} min (limit: "
+                    f"{max_wake} min). Prep state: {prep_state}. "
+                    f"FORCING SLEEP.")
+
+            if force_sleep:
+                # Track this as an exceedance for today
+                _increment_exceedance_count(probe_id)
+                exc_count = _get_daily_exceedance_count(probe_id)
+
+                print(
+                    f"[MOISTURE] Watchdog forced sleep for "
+                    f"'{display}' — awake {elapsed / 60:.0f} min "
+                    f"(limit: {max_wake} min). Exceedances today: "
+                    f"{exc_count}.")
+
+                # Log to probe history
+                try:
+                    import run_log
+                    battery = await _get_probe_battery_level(
+                        probe_id, probe)
+                    run_log.log_probe_event(
+                        probe_id=probe_id,
+                        event_type="watchdog_force_sleep",
+                        display_name=display,
+                        details={
+                            "awake_minutes": round(elapsed / 60, 1),
+                            "max_wake_minutes": max_wake,
+                            "exceedances_today": exc_count,
+                            "battery": round(battery, 0) if battery is not None else None,
+                            "prep_state": prep_state,
+                        },
+                    )
+                except Exception:
+                    pass
+
+                # Step 1: Re-enable sleep
+                await set_probe_sleep_disabled(probe_id, False)
+
+                # Step 2: FORCE immediate sleep via sleep_now button
+                await press_probe_sleep_now(probe_id)
+
+                # Step 3: Reset prep state machine if stuck
+                if prep and prep.get("state") not in ("idle", None):
+                    old_state = prep.get("state")
+                    for skipped in prep.get("skipped_zones", []):
+                        enable_entity = skipped.get("enable_entity")
+                        zone_num = skipped.get("zone_num")
+                        if enable_entity:
+                            await ha_client.call_service(
+                                "switch", "turn_on",
+                                {"entity_id": enable_entity}
+                            )
+                            print(f"[MOISTURE] Watchdog: re-enabled "
+                                  f"zone {zone_num} ({enable_entity})")
+                    prep["state"] = "idle"
+                    prep["skipped_zones"] = []
+                    prep["active_schedule_start_time"] = None
+                    prep["active_zone_entity_id"] = None
+                    prep["active_zone_num"] = None
+                    _save_probe_prep(probe_id, prep)
+                    print(f"[MOISTURE] Watchdog: reset prep state "
+                          f"{old_state} → idle for {display}")
+
+                # Step 4: Restore original sleep duration
+                original = _original_sleep_durations.pop(probe_id, None)
+                if original is not None:
+                    await _set_probe_sleep_duration(probe_id, original)
+                    print(f"[MOISTURE] Watchdog: restored original "
+                          f"sleep duration {original} min for {display}")
+
+                # Set retry sentinel
+                _probe_wake_start[probe_id] = -time.time()
+
+    elif max_wake > 0 and now_awake and wake_ts is not None and wake_ts < 0 and not user_disabled_sleep:
+        # Sentinel: watchdog already fired (negative timestamp).
+        # If probe is STILL awake 2 min after watchdog, retry.
+        fired_at = -wake_ts
+        since_fired = time.time() - fired_at
+        if since_fired > 120:  # 2 minutes since last attempt
+            display = probe.get("display_name", probe_id)
+            print(f"[MOISTURE] ⚠️ WATCHDOG RETRY: {display} still awake "
+                  f"{since_fired / 60:.1f} min after watchdog fired! "
+                  f"Retrying sleep_now...")
+            try:
+                import run_log
+                run_log.log_probe_event(
+                    probe_id=probe_id,
+                    event_type="watchdog_retry",
+                    display_name=display,
+                    details={
+                        "minutes_since_watchdog": round(since_fired / 60, 1),
+                    },
+                )
+            except Exception:
+                pass
+            await set_probe_sleep_disabled(probe_id, False)
+            await press_probe_sleep_now(probe_id)
+            _probe_wake_start[probe_id] = -time.time()
 
 
 async def _prep_probe_for_schedule(
@@ -996,7 +1157,7 @@ async def _prep_probe_for_schedule(
     prep["active_schedule_start_time"] = sched_time
     prep["active_zone_entity_id"] = zone_eid
     prep["active_zone_num"] = zone_num
-    _save_schedule_timeline(timeline)
+    _save_probe_prep(probe_id, prep)
 
 
 async def _handle_prepped_wake(
@@ -1016,7 +1177,7 @@ async def _handle_prepped_wake(
 
     if not zone_eid:
         prep["state"] = "idle"
-        _save_schedule_timeline(timeline)
+        _save_probe_prep(probe_id, prep)
         return
 
     # Wait for the probe to take its reading (it reads on wake)
@@ -1029,7 +1190,7 @@ async def _handle_prepped_wake(
     fresh_probe = data.get("probes", {}).get(probe_id)
     if not fresh_probe:
         prep["state"] = "idle"
-        _save_schedule_timeline(timeline)
+        _save_probe_prep(probe_id, prep)
         return
 
     # Get sensor states and check moisture
@@ -1093,7 +1254,7 @@ async def _handle_prepped_wake(
         mult = zone_result.get("multiplier", 1.0)
         print(f"[MOISTURE] Schedule wake: zone {zone_num} NOT saturated "
               f"(mult={mult:.2f}) — probe {display_name} sleep disabled for run")
-        _save_schedule_timeline(timeline)
+        _save_probe_prep(probe_id, prep)
 
 
 async def _prep_next_mapped_zone(
@@ -1110,7 +1271,7 @@ async def _prep_next_mapped_zone(
     mapped_zones = set((data.get("probes", {}).get(probe_id) or {}).get("zone_mappings", []))
     if not mapped_zones:
         prep["state"] = "idle"
-        _save_schedule_timeline(timeline)
+        _save_probe_prep(probe_id, prep)
         return
 
     # Find the active schedule to look up zone order
@@ -1123,7 +1284,7 @@ async def _prep_next_mapped_zone(
 
     if not active_sched:
         prep["state"] = "idle"
-        _save_schedule_timeline(timeline)
+        _save_probe_prep(probe_id, prep)
         return
 
     # Find current zone's position and look forward
@@ -1136,7 +1297,7 @@ async def _prep_next_mapped_zone(
 
     if current_idx is None:
         prep["state"] = "idle"
-        _save_schedule_timeline(timeline)
+        _save_probe_prep(probe_id, prep)
         return
 
     # Look forward for next mapped zone
@@ -1180,7 +1341,7 @@ async def _prep_next_mapped_zone(
         print(f"[MOISTURE] Next mapped zone {next_zone_num} in {gap_minutes:.1f} min — "
               f"sleeping {probe_id} for {sleep_mins:.1f} min")
 
-    _save_schedule_timeline(timeline)
+    _save_probe_prep(probe_id, prep)
 
 
 async def _finish_probe_prep_cycle(probe_id: str, prep: dict, timeline: dict):
@@ -1210,14 +1371,16 @@ async def _finish_probe_prep_cycle(probe_id: str, prep: dict, timeline: dict):
     prep["active_schedule_start_time"] = None
     prep["active_zone_entity_id"] = None
     prep["active_zone_num"] = None
-    _save_schedule_timeline(timeline)
+    _save_probe_prep(probe_id, prep)
     print(f"[MOISTURE] Schedule prep cycle complete for {probe_id}")
 
     # Restore shifted schedule start time if ALL prep cycles for this schedule are done.
     # Only restore after the last probe finishes its cycle for the same schedule.
     if _original_schedule_start_times and active_sched_time:
         all_done = True
-        for pid2, pp2 in timeline.get("probe_prep", {}).items():
+        # Other probes' tasks may have moved on since `timeline` was loaded
+        fresh_prep = _load_schedule_timeline().get("probe_prep", {})
+        for pid2, pp2 in fresh_prep.items():
             if pid2 == probe_id:
                 continue  # Already set to idle above
             if pp2.get("state") not in ("idle", None):
@@ -1235,9 +1398,11 @@ async def _finish_probe_prep_cycle(probe_id: str, prep: dict, timeline: dict):
             for eid, orig_val in list(_original_schedule_start_times.items()):
                 # Check if the original matches or the current shifted value matches
                 await _restore_schedule_start_time(eid)
-            # Update timeline persistence
-            timeline["original_start_times"] = dict(_original_schedule_start_times)
-            _save_schedule_timeline(timeline)
+            # Update timeline persistence (fresh copy — see _save_probe_prep)
+            timeline = _load_schedule_timeline()
+            if timeline:
+                timeline["original_start_times"] = dict(_original_schedule_start_times)
+                _save_schedule_timeline(timeline)
 
 
 def start_awake_poller():
@@ -1247,7 +1412,7 @@ def start_awake_poller():
         return  # Already running
     _load_wake_log()  # Restore persisted wake/sleep history
     _awake_poller_task = asyncio.create_task(_awake_poll_loop())
-    print("[MOISTURE] Awake poller started (interval: 5s)")
+    print(f"[MOISTURE] Awake poller started (interval: {_AWAKE_POLL_INTERVAL}s per probe)")
 
 
 def stop_awake_poller():
@@ -1309,6 +1474,102 @@ def _parse_time_to_minutes(val: str) -> int:
     return hour * 60 + minute
 
 
+# --- Event-Fed Schedule Entity Cache ---
+# While the WebSocket watcher is live, every change to a watched schedule
+# entity (start times, durations, zone enables/modes, day switches) and to a
+# probe status LED arrives as an event, so timeline recalculation can reuse
+# the last known values instead of re-fetching them from HA.  The watcher
+# resets the cache on every connect and disables it while disconnected.
+
+_event_watched: set | None = None  # entity_ids the watcher is subscribed to; None = not live
+_schedule_entity_cache: dict[str, dict] = {}  # entity_id -> {"entity_id", "state"}
+_status_led_last_changed: dict[str, datetime] = {}  # status LED entity_id -> local time
+_schedule_window_cache: dict[str, tuple] = {}  # start_time entity -> (inputs key, schedule)
+_schedule_event_generation = 0  # bumped on every schedule entity event and watcher reset
+
+
+def reset_event_caches(watched: set | None):
+    """Called by the zone watcher: `watched` on connect, None on disconnect."""
+    global _event_watched, _schedule_event_generation
+    _event_watched = set(watched) if watched is not None else None
+    _schedule_event_generation += 1
+    _schedule_entity_cache.clear()
+    _status_led_last_changed.clear()
+
+
+def on_schedule_entity_event(entity_id: str, new_state: str):
+    """Record a schedule entity's new state from the WebSocket event stream."""
+    global _schedule_event_generation
+    if _event_watched is not None and entity_id in _event_watched:
+        _schedule_entity_cache[entity_id] = {"entity_id": entity_id, "state": new_state}
+        _schedule_event_generation += 1
+    _update_run_plan(entity_id, new_state)
+
+
+async def _get_schedule_entity_states(entity_ids: list) -> list[dict]:
+    """Get schedule entity states, reusing event-fed values where possible.
+
+    Only entities the watcher is subscribed to are cached; anything else (or
+    everything, while the WebSocket is down) is fetched from HA.
+    """
+    cached = [_schedule_entity_cache[eid] for eid in entity_ids if eid in _schedule_entity_cache]
+    missing = [eid for eid in entity_ids if eid not in _schedule_entity_cache]
+    if not missing:
+        return cached
+    fetched = await ha_client.get_entities_by_ids(missing)
+    if _event_watched is not None:
+        for st in fetched:
+            eid = st.get("entity_id", "")
+            if eid in _event_watched:
+                _schedule_entity_cache[eid] = {"entity_id": eid, "state": st.get("state", "")}
+    return cached + fetched
+
+
+def _build_schedule_windows(st: dict, ordered_zones: list, zone_probe_map: dict) -> dict:
+    """Compute one schedule's zone windows, reusing the last result if its inputs match.
+
+    Returns a private copy — callers (e.g. schedule shifting) may modify it.
+    """
+    key = (
+        st["time_str"], st["start_minutes"],
+        tuple((z["zone_num"], z["zone_entity_id"], z["duration_minutes"]) for z in ordered_zones),
+        tuple(tuple(zone_probe_map.get(z["zone_entity_id"], [])) for z in ordered_zones),
+    )
+    hit = _schedule_window_cache.get(st["entity_id"])
+    if hit and hit[0] == key:
+        return json.loads(json.dumps(hit[1]))
+
+    cumulative = 0.0
+    zone_timeline = []
+    for z in ordered_zones:
+        zone_start = st["start_minutes"] + cumulative
+        zone_end = zone_start + z["duration_minutes"]
+        mapped_pids = zone_probe_map.get(z["zone_entity_id"], [])
+        zone_timeline.append({
+            "zone_num": z["zone_num"],
+            "zone_entity_id": z["zone_entity_id"],
+            "duration_minutes": z["duration_minutes"],
+            "expected_start_minutes": zone_start,
+            "expected_end_minutes": zone_end,
+            "expected_start_time": _minutes_to_hhmm(zone_start),
+            "expected_end_time": _minutes_to_hhmm(zone_end),
+            "has_mapped_probes": len(mapped_pids) > 0,
+            "mapped_probe_ids": mapped_pids,
+        })
+        cumulative += z["duration_minutes"]
+    schedule = {
+        "start_time_entity": st["entity_id"],
+        "start_time": st["time_str"],
+        "start_minutes": st["start_minutes"],
+        "total_duration_minutes": cumulative,
+        "expected_end_time": _minutes_to_hhmm(st["start_minutes"] + cumulative),
+        "zones": zone_timeline,
+    }
+    _schedule_window_cache[st["entity_id"]] = (key, json.loads(json.dumps(schedule)))
+    print(f"[MOISTURE] Timeline: recomputed zone windows for {st['entity_id']}")
+    return schedule
+
+
 def _load_schedule_timeline() -> dict:
     """Load the calculated irrigation schedule timeline from disk."""
     if os.path.exists(SCHEDULE_TIMELINE_FILE):
@@ -1321,14 +1582,42 @@ def _load_schedule_timeline() -> dict:
 
 
 def _save_schedule_timeline(timeline: dict):
-    """Persist the schedule timeline to disk."""
+    """Persist the schedule timeline to disk (temp file + rename)."""
+    tmp_path = SCHEDULE_TIMELINE_FILE + ".tmp"
     try:
-        with open(SCHEDULE_TIMELINE_FILE, "w") as f:
+        with open(tmp_path, "w") as f:
             json.dump(timeline, f, indent=2)
+        os.replace(tmp_path, SCHEDULE_TIMELINE_FILE)
     except IOError as e:
         print(f"[MOISTURE] Error saving schedule timeline: {e}")
 
 
+# Prep fields changed by the probe state machine (the rest of a probe_prep
+# entry is owned by calculate_irrigation_timeline)
+_PREP_RUNTIME_KEYS = (
+    "state", "skipped_zones", "active_schedule_start_time",
+    "active_zone_entity_id", "active_zone_num",
+)
+
+
+def _save_probe_prep(probe_id: str, prep: dict):
+    """Persist one probe's prep state into a fresh copy of the timeline.
+
+    Per-probe tasks and LED events hold their timeline copy across awaits,
+    so saving that whole copy would overwrite another probe's prep changes
+    (or a recalculated timeline).  Reload, update only this probe's runtime
+    fields and save — with no await in between, so tasks cannot interleave.
+    """
+    timeline = _load_schedule_timeline()
+    fresh = (timeline.get("probe_prep", {}) if timeline else {}).get(probe_id)
+    if fresh is None:
+        return  # timeline recalculated without this probe
+    for key in _PREP_RUNTIME_KEYS:
+        if key in prep:
+            fresh[key] = prep[key]
+    _save_schedule_timeline(timeline)
+
+
 async def calculate_irrigation_timeline() -> dict:
     """Build the irrigation schedule timeline with probe prep timing.
 
@@ -1370,10 +1659,10 @@ async def calculate_irrigation_timeline() -> dict:
         print(f"[MOISTURE] Timeline: found {len(start_time_eids)} start_time entities: "
               f"{start_time_eids}")
 
-    # 2. Fetch start time values
+    # 2. Fetch start time values (event-fed cache first)
     start_times = []
     if start_time_eids:
-        states = await ha_client.get_entities_by_ids(start_time_eids)
+        states = await _get_schedule_entity_states(start_time_eids)
         for s in states:
             val = s.get("state", "")
             eid = s.get("entity_id", "")
@@ -1402,35 +1691,12 @@ async def calculate_irrigation_timeline() -> dict:
         for z in probe.get("zone_mappings", []):
             zone_probe_map.setdefault(z, []).append(pid)
 
-    # 5. Build schedules with zone timelines
-    schedules = []
-    for st in start_times:
-        cumulative = 0.0
-        zone_timeline = []
-        for z in ordered_zones:
-            zone_start = st["start_minutes"] + cumulative
-            zone_end = zone_start + z["duration_minutes"]
-            mapped_pids = zone_probe_map.get(z["zone_entity_id"], [])
-            zone_timeline.append({
-                "zone_num": z["zone_num"],
-                "zone_entity_id": z["zone_entity_id"],
-                "duration_minutes": z["duration_minutes"],
-                "expected_start_minutes": zone_start,
-                "expected_end_minutes": zone_end,
-                "expected_start_time": _minutes_to_hhmm(zone_start),
-                "expected_end_time": _minutes_to_hhmm(zone_end),
-                "has_mapped_probes": len(mapped_pids) > 0,
-                "mapped_probe_ids": mapped_pids,
-            })
-            cumulative += z["duration_minutes"]
-        schedules.append({
-            "start_time_entity": st["entity_id"],
-            "start_time": st["time_str"],
-            "start_minutes": st["start_minutes"],
-            "total_duration_minutes": cumulative,
-            "expected_end_time": _minutes_to_hhmm(st["start_minutes"] + cumulative),
-            "zones": zone_timeline,
-        })
+    # 5. Build schedules with zone timelines — only schedules whose start
+    #    time, zone order/durations or probe mappings changed are recomputed
+    schedules = [
+        _build_schedule_windows(st, ordered_zones, zone_probe_map)
+        for st in start_times
+    ]
 
     # 6. Build probe prep data — for each probe, find first mapped zone per schedule
     #    and calculate when to reprogram sleep duration
@@ -1730,6 +1996,14 @@ async def calculate_irrigation_timeline() -> dict:
         "original_start_times": dict(_original_schedule_start_times),  # persist for restart recovery
     }
 
+    # Only rewrite irrigation_schedule.json when the result actually changed
+    unchanged = bool(old_timeline) and all(
+        old_timeline.get(k) == v for k, v in timeline.items() if k != "calculated_at"
+    )
+    if unchanged:
+        timeline["calculated_at"] = old_timeline.get("calculated_at", timeline["calculated_at"])
+        print("[MOISTURE] Schedule timeline unchanged — not rewriting")
+        return timeline
     _save_schedule_timeline(timeline)
     probe_count = len(probe_prep)
     schedule_count = len(schedules)
@@ -1741,8 +2015,8 @@ async def calculate_irrigation_timeline() -> dict:
 def _get_schedule_entity_ids() -> set:
     """Get the set of schedule-related entity IDs that trigger timeline recalculation.
 
-    Includes start times, run durations, zone enables, schedule enable,
-    and schedule day switches (monday-sunday).
+    Includes start times, run durations, zone enables and modes, schedule
+    enable, and schedule day switches (monday-sunday).
     """
     _DAYS = {"monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"}
     try:
@@ -1759,6 +2033,9 @@ def _get_schedule_entity_ids() -> set:
             # Zone enable switches
             if eid.startswith("switch.") and "enable_zone" in eid_lower:
                 entities.add(eid)
+            # Zone mode selects (special zones run last)
+            if eid.startswith("select.") and re.search(r'zone_\d+_mode', eid_lower):
+                entities.add(eid)
             # Schedule enable switch
             if eid.startswith("switch.") and "schedule" in eid_lower and "enable" in eid_lower:
                 entities.add(eid)
@@ -2018,9 +2295,23 @@ DEFAULT_DATA = {
 
 
 # --- Persistence ---
+# moisture_probes.json is held in memory as a versioned snapshot.  Readers
+# share the current snapshot via _read_data(); _load_data() hands out a
+# private working copy and _save_data() installs it as the next version
+# (copy-on-write), marks the store dirty and schedules a write-behind flush.
+# Flushes write to a temp file and rename it over the original, so a crash
+# mid-write can never leave a truncated file.
 
-def _load_data() -> dict:
-    """Load moisture probe data from persistent storage."""
+_WRITE_BEHIND_DELAY = 1.0  # seconds — coalesces bursts of _save_data() calls
+
+_data_snapshot: dict | None = None
+_data_version = 0
+_data_dirty = False
+_data_flush_handle: asyncio.TimerHandle | None = None
+
+
+def _read_data_file() -> dict:
+    """Read moisture probe data from disk, filling in any missing default keys."""
     if os.path.exists(MOISTURE_FILE):
         try:
             with open(MOISTURE_FILE, "r") as f:
@@ -2028,18 +2319,76 @@ def _load_data() -> dict:
                 # Forward-compat: ensure all default keys exist
                 for key, default in DEFAULT_DATA.items():
                     if key not in data:
-                        data[key] = default
+                        data[key] = json.loads(json.dumps(default))
                 return data
         except (json.JSONDecodeError, IOError):
             pass
     return json.loads(json.dumps(DEFAULT_DATA))  # deep copy
 
 
+def _read_data() -> dict:
+    """Return the current shared moisture data snapshot.
+
+    For read-only use — the returned dict is shared by every reader and must
+    not be mutated.  Use _load_data() when the data will be modified.
+    """
+    global _data_snapshot
+    if _data_snapshot is None:
+        _data_snapshot = _read_data_file()
+    return _data_snapshot
+
+
+def _get_data_version() -> int:
+    """Version of the moisture data snapshot — bumped on every _save_data()."""
+    return _data_version
+
+
+def _load_data() -> dict:
+    """Load a private, mutable copy of the moisture probe data."""
+    return json.loads(json.dumps(_read_data()))
+
+
 def _save_data(data: dict):
-    """Save moisture probe data to persistent storage."""
-    os.makedirs(os.path.dirname(MOISTURE_FILE), exist_ok=True)
-    with open(MOISTURE_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    """Save moisture probe data.
+
+    The in-memory snapshot is replaced immediately; the disk write is
+    deferred by _WRITE_BEHIND_DELAY so bursts of saves cost a single write.
+    Outside a running event loop the write happens synchronously.
+    """
+    global _data_snapshot, _data_version, _data_dirty, _data_flush_handle
+    _data_snapshot = json.loads(json.dumps(data))  # caller may keep mutating
+    _data_version += 1
+    _data_dirty = True
+    if _data_flush_handle is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        flush_data()
+        return
+    _data_flush_handle = loop.call_later(_WRITE_BEHIND_DELAY, flush_data)
+
+
+def flush_data():
+    """Write the moisture data snapshot to disk if it has unsaved changes.
+
+    Called by the write-behind timer and on shutdown.
+    """
+    global _data_dirty, _data_flush_handle
+    if _data_flush_handle is not None:
+        _data_flush_handle.cancel()
+        _data_flush_handle = None
+    if not _data_dirty or _data_snapshot is None:
+        return
+    tmp_path = MOISTURE_FILE + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(MOISTURE_FILE), exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(_data_snapshot, f, indent=2)
+        os.replace(tmp_path, MOISTURE_FILE)
+        _data_dirty = False
+    except Exception as e:
+        print(f"[MOISTURE] Failed to save moisture data: {e}")
 
 
 # --- Probe Discovery ---
@@ -2175,12 +2524,17 @@ async def get_device_sensors(device_id: str) -> tuple[list[dict], list[str]]:
 
 # --- Sensor State Fetching ---
 
-async def _get_probe_sensor_states(probes: dict) -> dict:
+async def _get_probe_sensor_states(probes: dict,
+                                   prefetched: Optional[list] = None) -> dict:
     """Fetch current states for all sensors across all probes.
 
     When a sensor is unavailable (device sleeping), the last-known-good
     cached value is returned instead so the multiplier doesn't reset to 1.0x.
 
+    Args:
+        prefetched: HA state dicts already read by the caller (e.g. the
+            shared mid-run monitor tick).  When given, no HA call is made.
+
     Returns:
         {entity_id: {state: float|None, last_updated: str, stale: bool, cached: bool}}
     """
@@ -2212,7 +2566,11 @@ async def _get_probe_sensor_states(probes: dict) -> dict:
     ha_sensor_ids = [eid for eid in sensor_ids if not eid.startswith("cellular.")]
     cellular_sensor_ids = [eid for eid in sensor_ids if eid.startswith("cellular.")]
 
-    all_states = await ha_client.get_entities_by_ids(ha_sensor_ids) if ha_sensor_ids else []
+    if prefetched is not None:
+        wanted = set(ha_sensor_ids)
+        all_states = [s for s in prefetched if s.get("entity_id") in wanted]
+    else:
+        all_states = await ha_client.get_entities_by_ids(ha_sensor_ids) if ha_sensor_ids else []
     result = {}
     cache_dirty = False
 
@@ -2236,13 +2594,15 @@ async def _get_probe_sensor_states(probes: dict) -> dict:
             }
         elif numeric_val is not None:
             # Good reading from awake probe — update the cache
-            _sensor_cache[eid] = {
+            entry = {
                 "state": numeric_val,
                 "raw_state": state_val,
                 "last_updated": s.get("last_updated", ""),
                 "friendly_name": s.get("attributes", {}).get("friendly_name", eid),
             }
-            cache_dirty = True
+            if _sensor_cache.get(eid) != entry:
+                _sensor_cache[eid] = entry
+                cache_dirty = True
             result[eid] = {
                 "state": numeric_val,
                 "raw_state": state_val,
@@ -2616,108 +2976,73 @@ def _analyze_probe_gradient(
     }
 
 
-def calculate_zone_moisture_multiplier(
-    zone_entity_id: str,
+def _build_depth_readings(sensors: dict, sensor_states: dict, stale_threshold: int) -> dict:
+    """Build a probe's {depth: reading} dict from cached sensor states."""
+    depth_readings = {}
+    for depth in ("shallow", "mid", "deep"):
+        sensor_eid = sensors.get(depth)
+        if not sensor_eid:
+            continue
+
+        sensor_data = sensor_states.get(sensor_eid, {})
+        value = sensor_data.get("state")
+        last_updated = sensor_data.get("last_updated", "")
+        stale = _is_stale(last_updated, stale_threshold)
+
+        if value is not None and not stale:
+            depth_readings[depth] = {
+                "value": value,
+                "stale": False,
+                "entity_id": sensor_eid,
+            }
+        else:
+            depth_readings[depth] = {
+                "value": value,
+                "stale": stale,
+                "entity_id": sensor_eid,
+                "reason": "stale" if stale else "unavailable",
+            }
+    return depth_readings
+
+
+def _analyze_probes(
+    probes: dict,
     data: dict,
     sensor_states: dict,
+    precip_probability: float,
+    weather_condition: str,
 ) -> dict:
-    """Calculate the moisture multiplier for a specific zone.
-
-    Uses a gradient-based algorithm that treats each sensor depth as a
-    distinct signal rather than computing a simple weighted average:
-      - Mid (root zone): PRIMARY decision driver
-      - Shallow (surface): Rain detection signal
-      - Deep (reserve): Over-irrigation / reserve guard
+    """Run the gradient analysis once for each probe.
 
-    Args:
-        zone_entity_id: The zone's HA entity_id (e.g., switch.irrigator_zone_1)
-        data: The full moisture probes JSON data
-        sensor_states: Dict of {entity_id: {state, last_updated, ...}}
-
-    Returns:
-        {
-            "multiplier": float (0.0 to ~1.5),
-            "avg_moisture": float or None,
-            "skip": bool,
-            "probe_count": int,
-            "probe_details": [...],
-            "reason": str,
-        }
+    Returns {probe_id: (depth_readings, gradient_result)}.  Batch callers
+    share these results across every zone a probe is mapped to.
     """
-    # If moisture probes are globally disabled, return 1.0x for all zones
-    if not data.get("enabled"):
-        return {
-            "multiplier": 1.0,
-            "avg_moisture": None,
-            "skip": False,
-            "probe_count": 0,
-            "probe_details": [],
-            "reason": "Moisture probes not enabled",
-        }
-
     stale_threshold = data.get("stale_reading_threshold_minutes", 120)
     default_thresholds = data.get("default_thresholds", DEFAULT_DATA["default_thresholds"])
+    analyses = {}
+    for probe_id, probe in probes.items():
+        depth_readings = _build_depth_readings(
+            probe.get("sensors", {}), sensor_states, stale_threshold,
+        )
+        thresholds = probe.get("thresholds") or default_thresholds
+        analyses[probe_id] = (
+            depth_readings,
+            _analyze_probe_gradient(
+                depth_readings, thresholds, precip_probability, weather_condition,
+            ),
+        )
+    return analyses
 
-    # Find all probes mapped to this zone
-    mapped_probes = []
-    for probe_id, probe in data.get("probes", {}).items():
-        if zone_entity_id in probe.get("zone_mappings", []):
-            mapped_probes.append((probe_id, probe))
-
-    if not mapped_probes:
-        return {
-            "multiplier": 1.0,
-            "avg_moisture": None,
-            "skip": False,
-            "probe_count": 0,
-            "probe_details": [],
-            "reason": "No probes mapped to this zone",
-        }
-
-    # Get weather context for rain detection
-    precip_probability = _get_precipitation_probability()
-    weather_condition = _get_weather_condition()
 
-    # Analyze each probe using gradient-based logic
+def _aggregate_zone_result(mapped_probes: list, analyses: dict, data: dict) -> dict:
+    """Combine the per-probe analyses of a zone's mapped probes into its result."""
     probe_details = []
     probe_multipliers = []
     any_skip = False
     all_reasons = []
 
     for probe_id, probe in mapped_probes:
-        sensors = probe.get("sensors", {})
-        thresholds = probe.get("thresholds") or default_thresholds
-
-        # Build depth readings dict
-        depth_readings = {}
-        for depth in ("shallow", "mid", "deep"):
-            sensor_eid = sensors.get(depth)
-            if not sensor_eid:
-                continue
-
-            sensor_data = sensor_states.get(sensor_eid, {})
-            value = sensor_data.get("state")
-            last_updated = sensor_data.get("last_updated", "")
-            stale = _is_stale(last_updated, stale_threshold)
-
-            if value is not None and not stale:
-                depth_readings[depth] = {
-                    "value": value,
-                    "stale": False,
-                    "entity_id": sensor_eid,
-                }
-            else:
-                depth_readings[depth] = {
-                    "value": value,
-                    "stale": stale,
-                    "entity_id": sensor_eid,
-                    "reason": "stale" if stale else "unavailable",
-                }
-
-        # Run gradient analysis
-        result = _analyze_probe_gradient(
-            depth_readings, thresholds, precip_probability, weather_condition,
-        )
+        depth_readings, result = analyses[probe_id]
 
         if result["skip"]:
             any_skip = True
@@ -2823,6 +3148,105 @@ def calculate_zone_moisture_multiplier(
     }
 
 
+def calculate_zone_moisture_multipliers(
+    zone_entity_ids,
+    data: dict,
+    sensor_states: dict,
+    zone_index: "ZoneIndex | None" = None,
+) -> dict:
+    """Calculate moisture multipliers for many zones in one pass.
+
+    Produces exactly what calculate_zone_moisture_multiplier() returns for
+    each zone, but reads the weather context once and runs the gradient
+    analysis once per mapped probe instead of once per (zone, probe) pair.
+    Zone → probe mappings come from the zone index (_get_zone_index() unless
+    one built from ``data`` is passed).
+
+    Returns {zone_entity_id: zone_result}.
+    """
+    zone_entity_ids = list(dict.fromkeys(zone_entity_ids))
+
+    # If moisture probes are globally disabled, return 1.0x for all zones
+    if not data.get("enabled"):
+        return {zid: {
+            "multiplier": 1.0,
+            "avg_moisture": None,
+            "skip": False,
+            "probe_count": 0,
+            "probe_details": [],
+            "reason": "Moisture probes not enabled",
+        } for zid in zone_entity_ids}
+
+    # Find all probes mapped to each zone
+    zone_to_probes = (zone_index or _get_zone_index()).zone_to_probes
+    probes = data.get("probes", {})
+    mapped_by_zone: dict[str, list] = {}
+    mapped_probes = {}
+    for zid in zone_entity_ids:
+        mapped_by_zone[zid] = [(pid, probes[pid]) for pid in zone_to_probes.get(zid, ())
+                               if pid in probes]
+        for pid, probe in mapped_by_zone[zid]:
+            mapped_probes[pid] = probe
+
+    analyses = {}
+    if mapped_probes:
+        # Get weather context for rain detection
+        analyses = _analyze_probes(
+            mapped_probes, data, sensor_states,
+            _get_precipitation_probability(), _get_weather_condition(),
+        )
+
+    results = {}
+    for zid, zone_probes in mapped_by_zone.items():
+        if not zone_probes:
+            results[zid] = {
+                "multiplier": 1.0,
+                "avg_moisture": None,
+                "skip": False,
+                "probe_count": 0,
+                "probe_details": [],
+                "reason": "No probes mapped to this zone",
+            }
+        else:
+            results[zid] = _aggregate_zone_result(zone_probes, analyses, data)
+    return results
+
+
+def calculate_zone_moisture_multiplier(
+    zone_entity_id: str,
+    data: dict,
+    sensor_states: dict,
+) -> dict:
+    """Calculate the moisture multiplier for a specific zone.
+
+    Uses a gradient-based algorithm that treats each sensor depth as a
+    distinct signal rather than computing a simple weighted average:
+      - Mid (root zone): PRIMARY decision driver
+      - Shallow (surface): Rain detection signal
+      - Deep (reserve): Over-irrigation / reserve guard
+
+    Use calculate_zone_moisture_multipliers() when evaluating several zones.
+
+    Args:
+        zone_entity_id: The zone's HA entity_id (e.g., switch.irrigator_zone_1)
+        data: The full moisture probes JSON data
+        sensor_states: Dict of {entity_id: {state, last_updated, ...}}
+
+    Returns:
+        {
+            "multiplier": float (0.0 to ~1.5),
+            "avg_moisture": float or None,
+            "skip": bool,
+            "probe_count": int,
+            "probe_details": [...],
+            "reason": str,
+        }
+    """
+    return calculate_zone_moisture_multipliers(
+        [zone_entity_id], data, sensor_states,
+    )[zone_entity_id]
+
+
 def get_weather_multiplier() -> float:
     """Get the current weather watering multiplier from weather rules data."""
     try:
@@ -2833,6 +3257,70 @@ def get_weather_multiplier() -> float:
         return 1.0
 
 
+# --- Memoized Zone Multipliers ---
+# A zone's result depends only on the moisture data snapshot, the sensor
+# cache, the weather rules (rain context) and the age of its readings.  The
+# first three carry generation counters; results are reused until one of
+# them moves or a reading used by a result crosses its stale threshold.
+
+_zone_multiplier_memo: dict = {"key": None, "valid_until": None, "results": {}}
+
+
+def _weather_generation() -> int:
+    try:
+        from routes.weather import get_weather_rules_version
+        return get_weather_rules_version()
+    except Exception:
+        return 0
+
+
+def _stale_deadline(data: dict, sensor_states: dict, now: datetime) -> datetime | None:
+    """Earliest time at which a currently fresh reading becomes stale."""
+    threshold = timedelta(minutes=data.get("stale_reading_threshold_minutes", 120))
+    deadline = None
+    for state in sensor_states.values():
+        try:
+            updated = datetime.fromisoformat(state.get("last_updated", "").replace("Z", "+00:00"))
+            expires = updated + threshold
+            if expires > now and (deadline is None or expires < deadline):
+                deadline = expires
+        except (ValueError, TypeError):
+            continue
+    return deadline
+
+
+def get_memoized_zone_multipliers(zone_entity_ids) -> dict:
+    """Zone moisture multipliers from the sensor cache, memoized by generation.
+
+    Equivalent to calculate_zone_moisture_multipliers() over the current data
+    snapshot and get_cached_sensor_states(), but repeated reads between
+    changes are free.  The returned results are shared — do not mutate them.
+
+    Returns {zone_entity_id: zone_result}.
+    """
+    global _zone_multiplier_memo
+    _load_sensor_cache()
+    key = (_get_data_version(), _sensor_cache_generation, _weather_generation())
+    now = datetime.now(timezone.utc)
+    memo = _zone_multiplier_memo
+    if (memo["key"] != key or
+            (memo["valid_until"] is not None and now >= memo["valid_until"])):
+        memo = _zone_multiplier_memo = {"key": key, "valid_until": None, "results": {}}
+
+    zone_entity_ids = list(zone_entity_ids)
+    missing = [zid for zid in zone_entity_ids if zid not in memo["results"]]
+    if missing:
+        data = _read_data()
+        sensor_states = get_cached_sensor_states(data.get("probes", {}))
+        memo["results"].update(
+            calculate_zone_moisture_multipliers(missing, data, sensor_states)
+        )
+        deadline = _stale_deadline(data, sensor_states, now)
+        if deadline is not None and (memo["valid_until"] is None or deadline < memo["valid_until"]):
+            memo["valid_until"] = deadline
+    return {zid: memo["results"][zid] for zid in zone_entity_ids}
+
+
 async def get_combined_multiplier(zone_entity_id: str) -> dict:
     """Get the combined weather × moisture multiplier for a specific zone.
 
@@ -2849,7 +3337,7 @@ async def get_combined_multiplier(zone_entity_id: str) -> dict:
             "moisture_reason": str,
         }
     """
-    data = _load_data()
+    data = _read_data()
 
     weather_mult = get_weather_multiplier()
 
@@ -2862,10 +3350,9 @@ async def get_combined_multiplier(zone_entity_id: str) -> dict:
             "moisture_reason": "Moisture probes not enabled",
         }
 
-    sensor_states = await _get_probe_sensor_states(data.get("probes", {}))
-    zone_result = calculate_zone_moisture_multiplier(
-        zone_entity_id, data, sensor_states,
-    )
+    # Refresh the sensor cache from HA, then reuse the memoized result
+    await _get_probe_sensor_states(data.get("probes", {}))
+    zone_result = get_memoized_zone_multipliers([zone_entity_id])[zone_entity_id]
     moisture_mult = zone_result.get("multiplier", 1.0)
     skip = zone_result.get("skip", False)
 
@@ -3024,6 +3511,8 @@ def _find_zone_entity(zone_num: int, config) -> str:
     """
     if not zone_num:
         return ""
+    if config is get_config():
+        return _get_zone_index().zone_num_to_entity.get(zone_num, "")
     for eid in config.allowed_zone_entities:
         m = _ZONE_NUMBER_RE.search(eid)
         if m and int(m.group(1)) == zone_num:
@@ -3039,6 +3528,8 @@ def _find_enable_zone_switch(zone_num: int, config) -> str:
     """
     if not zone_num:
         return ""
+    if config is get_config():
+        return _get_zone_index().zone_num_to_enable.get(zone_num, "")
     for eid in config.allowed_control_entities:
         if not eid.startswith("switch."):
             continue
@@ -3059,6 +3550,123 @@ def _extract_zone_number(zone_entity_id: str) -> int:
     return int(m.group(1)) if m else 0
 
 
+@dataclass(frozen=True)
+class ZoneIndex:
+    """Immutable zone ↔ probe ↔ duration index.
+
+    Built from one moisture data version and one set of resolved config
+    entity lists, so the event and scheduling paths answer "which probes
+    cover this zone", "which zones does this probe cover" and "which
+    duration entity belongs to this zone" with a single dict hit instead of
+    scanning every probe or matching entity-id substrings (which confused
+    zone_1 with zone_10).  Never mutated — see _get_zone_index().
+    """
+    data_version: int
+    zone_entities_ref: object  # config.allowed_zone_entities list it was built from
+    control_entities_ref: object  # config.allowed_control_entities list it was built from
+    zone_to_probes: dict  # zone entity_id -> tuple of probe_ids (probe order)
+    probe_to_zones: dict  # probe_id -> tuple of zone entity_ids
+    sensor_to_probes: dict  # depth sensor entity_id -> tuple of probe_ids
+    led_to_probe: dict  # status LED entity_id -> probe_id
+    zone_num_to_entity: dict  # zone number -> zone switch/valve entity_id
+    zone_num_to_enable: dict  # zone number -> switch.*enable_zone_N
+    zone_to_duration: dict  # zone entity_id -> duration number entity_id
+    duration_to_zone: dict  # duration number entity_id -> zone entity_id
+
+
+_zone_index: ZoneIndex | None = None
+
+
+def _build_zone_index(data: dict, data_version: int, config) -> ZoneIndex:
+    zone_to_probes: dict[str, list] = {}
+    probe_to_zones = {}
+    sensor_to_probes: dict[str, list] = {}
+    led_to_probe = {}
+    for pid, probe in data.get("probes", {}).items():
+        zones = tuple(dict.fromkeys(probe.get("zone_mappings", [])))
+        probe_to_zones[pid] = zones
+        for zid in zones:
+            zone_to_probes.setdefault(zid, []).append(pid)
+        for depth in ("shallow", "mid", "deep"):
+            eid = (probe.get("sensors") or {}).get(depth)
+            if eid and pid not in sensor_to_probes.setdefault(eid, []):
+                sensor_to_probes[eid].append(pid)
+        led = (probe.get("extra_sensors") or {}).get("status_led")
+        if led:
+            led_to_probe.setdefault(led, pid)
+
+    zone_num_to_entity = {}
+    for eid in config.allowed_zone_entities:
+        zn = _extract_zone_number(eid)
+        if zn:
+            zone_num_to_entity.setdefault(zn, eid)
+
+    zone_num_to_enable = {}
+    for eid in config.allowed_control_entities:
+        if eid.startswith("switch.") and "enable_zone" in eid.lower():
+            zn = _extract_zone_number(eid)
+            if zn:
+                zone_num_to_enable.setdefault(zn, eid)
+
+    zone_to_duration = {}
+    duration_to_zone = {}
+    for dur_eid in _find_duration_entities(config.allowed_control_entities):
+        zid = zone_num_to_entity.get(_extract_zone_num_from_duration(dur_eid))
+        if zid:
+            zone_to_duration.setdefault(zid, dur_eid)
+            duration_to_zone[dur_eid] = zid
+
+    return ZoneIndex(
+        data_version=data_version,
+        zone_entities_ref=config.allowed_zone_entities,
+        control_entities_ref=config.allowed_control_entities,
+        zone_to_probes={z: tuple(p) for z, p in zone_to_probes.items()},
+        probe_to_zones=probe_to_zones,
+        sensor_to_probes={e: tuple(p) for e, p in sensor_to_probes.items()},
+        led_to_probe=led_to_probe,
+        zone_num_to_entity=zone_num_to_entity,
+        zone_num_to_enable=zone_num_to_enable,
+        zone_to_duration=zone_to_duration,
+        duration_to_zone=duration_to_zone,
+    )
+
+
+def _get_zone_index() -> ZoneIndex:
+    """Return the zone index, rebuilding it when probes or entities change.
+
+    Rebuilt when the moisture data version moves (probe add/remove, zone
+    mapping edits) or when config resolves a new zone/control entity list.
+    """
+    global _zone_index
+    config = get_config()
+    index = _zone_index
+    if (index is None
+            or index.data_version != _get_data_version()
+            or index.zone_entities_ref is not config.allowed_zone_entities
+            or index.control_entities_ref is not config.allowed_control_entities):
+        index = _build_zone_index(_read_data(), _get_data_version(), config)
+        _zone_index = index  # single reference swap
+    return index
+
+
+def _duration_entity_for_zone(zone_entity_id: str, durations: dict) -> Optional[str]:
+    """Find the key in a duration-keyed dict that belongs to a zone.
+
+    Uses the zone index; duration entities outside the configured control
+    list fall back to an exact zone-number match (never a substring match).
+    """
+    dur_eid = _get_zone_index().zone_to_duration.get(zone_entity_id)
+    if dur_eid in durations:
+        return dur_eid
+    zone_num = _extract_zone_number(zone_entity_id)
+    if not zone_num:
+        return None
+    for eid in durations:
+        if _extract_zone_num_from_duration(eid) == zone_num:
+            return eid
+    return None
+
+
 async def _get_ordered_enabled_zones() -> list[dict]:
     """Get the ordered list of enabled zones matching ESPHome execution order.
 
@@ -3090,11 +3698,11 @@ async def _get_ordered_enabled_zones() -> list[dict]:
     # 3. Find all duration entities
     duration_entities = _find_duration_entities(config.allowed_control_entities)
 
-    # 4. Batch-fetch all states
+    # 4. Batch-fetch all states (event-fed cache first)
     all_eids = enable_entities + mode_entities + duration_entities
     if not all_eids:
         return []
-    states = await ha_client.get_entities_by_ids(all_eids)
+    states = await _get_schedule_entity_states(all_eids)
     state_map = {s["entity_id"]: s for s in states}
 
     # 5. Build zone info by zone number
@@ -3161,6 +3769,35 @@ async def _get_ordered_enabled_zones() -> list[dict]:
     return result
 
 
+# Snapshot of _get_ordered_enabled_zones() for per-cycle consumers (weather
+# precip credit).  While the watcher is live every relevant change bumps the
+# event generation; while it is down the snapshot is refreshed after a while.
+_ENABLED_ZONES_MAX_AGE = 900  # seconds, only used while the watcher is down
+
+_enabled_zones_snapshot: dict = {"key": None, "taken_at": 0.0, "zones": None}
+
+
+async def get_enabled_zones_snapshot() -> list[dict]:
+    """Ordered enabled zones, reused until a schedule entity changes.
+
+    Same result as _get_ordered_enabled_zones(); the list is shared and
+    keeps its identity until it is rebuilt — do not mutate it.
+    """
+    global _enabled_zones_snapshot
+    config = get_config()
+    key = (_schedule_event_generation, id(config.allowed_control_entities),
+           config.detected_zone_count)
+    snap = _enabled_zones_snapshot
+    now = time.monotonic()
+    fresh = snap["zones"] is not None and snap["key"] == key and (
+        _event_watched is not None or now - snap["taken_at"] < _ENABLED_ZONES_MAX_AGE
+    )
+    if not fresh:
+        zones = await _get_ordered_enabled_zones()
+        snap = _enabled_zones_snapshot = {"key": key, "taken_at": now, "zones": zones}
+    return snap["zones"]
+
+
 async def _calculate_sleep_until_next_mapped_zone(
     probe_id: str,
     current_zone_entity_id: str,
@@ -3350,17 +3987,24 @@ async def apply_adjusted_durations() -> dict:
     print(f"[MOISTURE] Applying per-zone factors: {len(base_durations)} duration entities, "
           f"weather_mult={weather_mult}")
 
+    # Per-zone moisture multipliers for every duration entity, in one pass
+    # (only zones with mapped probes are affected)
+    zone_for_duration = {
+        dur_eid: _find_zone_entity(_extract_zone_num_from_duration(dur_eid), config)
+        for dur_eid in base_durations
+    }
+    zone_results = calculate_zone_moisture_multipliers(
+        zone_for_duration.values(), data, sensor_states,
+    )
+
     for dur_eid, dur_data in base_durations.items():
         base = dur_data["base_value"]
 
         # Extract zone number from duration entity → find matching zone entity
         zone_num = _extract_zone_num_from_duration(dur_eid)
-        zone_entity_id = _find_zone_entity(zone_num, config)
+        zone_entity_id = zone_for_duration[dur_eid]
 
-        # Get per-zone moisture multiplier (only zones with mapped probes are affected)
-        zone_result = calculate_zone_moisture_multiplier(
-            zone_entity_id, data, sensor_states,
-        )
+        zone_result = zone_results[zone_entity_id]
         moisture_mult = zone_result.get("multiplier", 1.0)
         skip = zone_result.get("skip", False)
 
@@ -5291,12 +5935,13 @@ async def calculate_overall_moisture_multiplier() -> dict:
         }
 
     sensor_states = await _get_probe_sensor_states(probes)
-    stale_threshold = data.get("stale_reading_threshold_minutes", 120)
-    default_thresholds = data.get("default_thresholds", DEFAULT_DATA["default_thresholds"])
 
     # Get weather context for rain detection
     precip_probability = _get_precipitation_probability()
     weather_condition = _get_weather_condition()
+    analyses = _analyze_probes(
+        probes, data, sensor_states, precip_probability, weather_condition,
+    )
 
     probe_multipliers = []
     mid_values = []
@@ -5306,38 +5951,7 @@ async def calculate_overall_moisture_multiplier() -> dict:
     rain_detected = False
 
     for probe_id, probe in probes.items():
-        sensors = probe.get("sensors", {})
-        thresholds = probe.get("thresholds") or default_thresholds
-
-        # Build depth readings dict
-        depth_readings = {}
-        for depth in ("shallow", "mid", "deep"):
-            sensor_eid = sensors.get(depth)
-            if not sensor_eid:
-                continue
-            sensor_data = sensor_states.get(sensor_eid, {})
-            value = sensor_data.get("state")
-            last_updated = sensor_data.get("last_updated", "")
-            stale = _is_stale(last_updated, stale_threshold)
-
-            if value is not None and not stale:
-                depth_readings[depth] = {
-                    "value": value,
-                    "stale": False,
-                    "entity_id": sensor_eid,
-                }
-            else:
-                depth_readings[depth] = {
-                    "value": value,
-                    "stale": stale,
-                    "entity_id": sensor_eid,
-                    "reason": "stale" if stale else "unavailable",
-                }
-
-        # Run gradient analysis
-        result = _analyze_probe_gradient(
-            depth_readings, thresholds, precip_probability, weather_condition,
-        )
+        _, result = analyses[probe_id]
 
         if result["skip"]:
             any_skip = True
@@ -5424,19 +6038,16 @@ async def api_overall_multiplier():
         }
 
     probes = data.get("probes", {})
-    sensor_states = await _get_probe_sensor_states(probes)
+    # Refresh the sensor cache from HA; results below come from the memo
+    await _get_probe_sensor_states(probes)
 
     # Build per-zone multipliers for all zones that have mapped probes
     per_zone = {}
-    mapped_zone_eids = set()
-    for probe_id, probe in probes.items():
-        for zone_eid in probe.get("zone_mappings", []):
-            mapped_zone_eids.add(zone_eid)
+    mapped_zone_eids = set(_get_zone_index().zone_to_probes)
 
+    zone_results = get_memoized_zone_multipliers(mapped_zone_eids)
     for zone_eid in mapped_zone_eids:
-        zone_result = calculate_zone_moisture_multiplier(
-            zone_eid, data, sensor_states,
-        )
+        zone_result = zone_results[zone_eid]
         moisture_mult = zone_result.get("multiplier", 1.0)
         skip = zone_result.get("skip", False)
         combined = round(weather_mult * moisture_mult, 3) if not skip else 0.0
@@ -5610,6 +6221,98 @@ _active_schedule_run: dict | None = None
 # runnable zone so ESPHome never tries to start a skipped zone.
 _preemptive_advance_timers: dict[str, asyncio.Task] = {}
 
+# Run plan — position and entity indexes over the active run's
+# zone_sequence, so advancing to the next zone needs no HA reads.  Rebuilt
+# whenever _active_schedule_run gets a new zone_sequence (run start or
+# crash-recovery rehydration) and kept current from enable/duration events.
+_run_plan: dict | None = None
+
+# Next-zone start latency (advance requested → next zone ON), most recent first
+_ADVANCE_LATENCY_SAMPLES = 100
+_advance_latencies: list[dict] = []
+
+
+def _get_run_plan() -> dict | None:
+    """Return the plan for the active run, building it on first use."""
+    global _run_plan
+    run = _active_schedule_run
+    if run is None:
+        return None
+    seq = run["zone_sequence"]
+    plan = _run_plan
+    if plan is None or plan["seq"] is not seq:
+        by_entity = {}
+        for i, z in enumerate(seq):
+            for key in ("enable_entity_id", "duration_entity_id"):
+                if z.get(key):
+                    by_entity[z[key]] = i
+        plan = {
+            "seq": seq,
+            "position": {z["zone_entity_id"]: i for i, z in enumerate(seq)},
+            "by_entity": by_entity,
+            "auto_advance_on": False,  # auto_advance switched on during this run
+        }
+        _run_plan = plan
+    return plan
+
+
+def _update_run_plan(entity_id: str, new_state: str):
+    """Apply an enable-switch or duration change to the active run sequence."""
+    plan = _get_run_plan()
+    if plan is None or entity_id not in plan["by_entity"]:
+        return
+    z = plan["seq"][plan["by_entity"][entity_id]]
+    if entity_id == z.get("enable_entity_id"):
+        if new_state not in ("on", "off"):
+            return
+        field, value = "original_enabled", new_state == "on"
+    else:
+        try:
+            field, value = "duration_minutes", float(new_state)
+        except (ValueError, TypeError):
+            return
+    if z.get(field) == value:
+        return
+    z[field] = value
+    _debug_log(f"RUN PLAN: zone {z['zone_num']} {field} → {value}")
+    data = _load_data()
+    data["active_run"] = _active_schedule_run
+    _save_data(data)
+
+
+def _record_advance_latency(zone_num: int, plan_ms: float, start_ms: float, ok: bool):
+    _advance_latencies.insert(0, {
+        "at": datetime.now(timezone.utc).isoformat(),
+        "zone_num": zone_num,
+        "plan_ms": round(plan_ms, 1),
+        "start_ms": round(start_ms, 1),
+        "ok": ok,
+    })
+    del _advance_latencies[_ADVANCE_LATENCY_SAMPLES:]
+
+
+def get_advance_metrics() -> dict:
+    """Next-zone start latency for recent moisture-driven advances.
+
+    plan_ms is the time spent choosing the next zone; start_ms is the total
+    from the advance request until HA acknowledged the zone start.
+    """
+    samples = sorted(a["start_ms"] for a in _advance_latencies if a["ok"])
+
+    def pct(q):
+        return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else None
+
+    return {
+        "count": len(_advance_latencies),
+        "failures": sum(1 for a in _advance_latencies if not a["ok"]),
+        "start_ms": {
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "max": samples[-1] if samples else None,
+        },
+        "recent": _advance_latencies[:20],
+    }
+
 # --- Debug log for schedule skip troubleshooting ---
 _DEBUG_LOG_FILE = "/data/moisture_debug.log"
 _DEBUG_LOG_MAX_LINES = 500
@@ -5681,12 +6384,9 @@ async def _preemptive_advance_timer(zone_entity_id: str, delay_seconds: float):
     import run_log as _rl
 
     # Log skip events for all consecutive moisture-disabled zones
-    seq = _active_schedule_run["zone_sequence"]
-    current_idx = None
-    for i, z in enumerate(seq):
-        if z["zone_entity_id"] == zone_entity_id:
-            current_idx = i
-            break
+    plan = _get_run_plan()
+    seq = plan["seq"]
+    current_idx = plan["position"].get(zone_entity_id)
     if current_idx is not None:
         for j in range(current_idx + 1, len(seq)):
             sz = seq[j]
@@ -5859,10 +6559,86 @@ async def press_probe_sleep_now(probe_id: str) -> bool:
     return success
 
 
+_MONITOR_INTERVAL = 30  # seconds between mid-run moisture checks
+
+# Shared mid-run monitor scheduler: one batched HA read per tick for every
+# active monitor, fanned out through a future replaced on each tick.
+_monitor_subscribers: dict[str, str] = {}  # zone_entity_id -> probe_id
+_monitor_tick: Optional[asyncio.Future] = None
+_monitor_scheduler_task: Optional[asyncio.Task] = None
+
+
+async def _read_monitor_tick() -> Optional[dict]:
+    """Read everything the active mid-run monitors need in one HA call.
+
+    Returns {"data", "zone_states", "zone_results"} or None when there is
+    nothing to monitor.  Zone multipliers are evaluated in one batch.
+    """
+    if not _monitor_subscribers:
+        return None
+    data = _read_data()
+    probes = {
+        pid: data.get("probes", {})[pid]
+        for pid in set(_monitor_subscribers.values())
+        if pid in data.get("probes", {})
+    }
+    zone_eids = list(_monitor_subscribers)
+    sensor_eids = {
+        eid for probe in probes.values()
+        for eid in (probe.get("sensors") or {}).values()
+        if eid and not eid.startswith("cellular.")
+    }
+    states = await ha_client.get_entities_by_ids(zone_eids + sorted(sensor_eids))
+    sensor_states = await _get_probe_sensor_states(probes, prefetched=states)
+    zone_states = {
+        s.get("entity_id"): s for s in states if s.get("entity_id") in _monitor_subscribers
+    }
+    return {
+        "data": data,
+        "zone_states": zone_states,
+        "zone_results": calculate_zone_moisture_multipliers(
+            zone_eids, data, sensor_states,
+        ),
+    }
+
+
+async def _monitor_scheduler_loop():
+    """Tick every _MONITOR_INTERVAL while any mid-run monitor is subscribed."""
+    global _monitor_tick, _monitor_scheduler_task
+    try:
+        while _monitor_subscribers:
+            await asyncio.sleep(_MONITOR_INTERVAL)
+            try:
+                snapshot = await _read_monitor_tick()
+            except Exception as e:
+                print(f"[MOISTURE] Mid-run monitor tick failed: {e}")
+                continue
+            tick, _monitor_tick = _monitor_tick, None
+            if tick is not None and not tick.done():
+                tick.set_result(snapshot)
+    finally:
+        _monitor_scheduler_task = None
+
+
+async def _wait_monitor_tick(zone_entity_id: str, probe_id: str) -> Optional[dict]:
+    """Subscribe a monitor and wait for the next shared tick."""
+    global _monitor_tick, _monitor_scheduler_task
+    _monitor_subscribers[zone_entity_id] = probe_id
+    if _monitor_tick is None:
+        _monitor_tick = asyncio.get_running_loop().create_future()
+    tick = _monitor_tick
+    if _monitor_scheduler_task is None:
+        _monitor_scheduler_task = asyncio.create_task(_monitor_scheduler_loop())
+    # Shielded: cancelling one monitor must not cancel the tick for the rest
+    return await asyncio.shield(tick)
+
+
 async def monitor_zone_moisture(zone_entity_id: str, probe_id: str):
     """Monitor moisture during an active zone run.
 
-    Polls the probe's sensor readings every 30 seconds while the zone is running.
+    Checks the probe's sensor readings every 30 seconds while the zone is
+    running.  All active monitors share one scheduler tick, so zones sharing
+    a probe (or overlapping pump/master zones) cost a single HA read.
     If moisture exceeds the skip threshold:
     1. Turns off the current zone
     2. Finds the next enabled zone in execution order
@@ -5871,7 +6647,7 @@ async def monitor_zone_moisture(zone_entity_id: str, probe_id: str):
     """
     import run_log
 
-    data = _load_data()
+    data = _read_data()
     probe = data.get("probes", {}).get(probe_id)
     if not probe:
         return
@@ -5882,26 +6658,21 @@ async def monitor_zone_moisture(zone_entity_id: str, probe_id: str):
 
     try:
         while True:
-            await asyncio.sleep(30)
+            snapshot = await _wait_monitor_tick(zone_entity_id, probe_id)
+            if snapshot is None or zone_entity_id not in snapshot["zone_results"]:
+                continue  # subscribed while this tick was already reading
 
             # Check if zone is still running
-            zone_states = await ha_client.get_entities_by_ids([zone_entity_id])
-            if not zone_states or zone_states[0].get("state") not in ("on", "open"):
+            zone_state = snapshot["zone_states"].get(zone_entity_id)
+            if not zone_state or zone_state.get("state") not in ("on", "open"):
                 print(f"[MOISTURE] Mid-run monitor: zone {zone_entity_id} no longer running")
                 break
 
-            # Get fresh sensor readings (bypass cache for real-time)
-            fresh_data = _load_data()
-            fresh_probe = fresh_data.get("probes", {}).get(probe_id)
-            if not fresh_probe:
+            if probe_id not in snapshot["data"].get("probes", {}):
                 break
 
-            sensor_states = await _get_probe_sensor_states({probe_id: fresh_probe})
-
             # Check moisture level using zone-specific multiplier
-            zone_result = calculate_zone_moisture_multiplier(
-                zone_entity_id, fresh_data, sensor_states,
-            )
+            zone_result = snapshot["zone_results"][zone_entity_id]
 
             if zone_result.get("skip"):
                 # Moisture exceeded threshold mid-run. Start the next
@@ -5931,8 +6702,7 @@ async def monitor_zone_moisture(zone_entity_id: str, probe_id: str):
                           f"last enabled zone, stopped directly")
 
                 # Resolve zone name for logging
-                attrs = (zone_states[0].get("attributes", {})
-                         if zone_states else {})
+                attrs = zone_state.get("attributes", {})
                 zone_name = attrs.get("friendly_name", zone_entity_id)
 
                 run_log.log_zone_event(
@@ -5955,8 +6725,9 @@ async def monitor_zone_moisture(zone_entity_id: str, probe_id: str):
     except Exception as e:
         print(f"[MOISTURE] Mid-run monitor error: {zone_entity_id}: {e}")
     finally:
-        # Clean up from active monitors dict
+        # Clean up from active monitors dict and the shared scheduler
         _active_moisture_monitors.pop(zone_entity_id, None)
+        _monitor_subscribers.pop(zone_entity_id, None)
         # NOTE: Sleep re-enable is handled by on_zone_state_change()
         # which runs the dynamic mid-run sleep calculation
         print(f"[MOISTURE] Mid-run monitor ended: {zone_entity_id}")
@@ -5989,7 +6760,7 @@ async def _get_all_ordered_zones() -> list[dict]:
     all_eids = enable_entities + mode_entities + duration_entities
     if not all_eids:
         return []
-    states = await ha_client.get_entities_by_ids(all_eids)
+    states = await _get_schedule_entity_states(all_eids)
     state_map = {s["entity_id"]: s for s in states}
 
     zone_info: dict[int, dict] = {}
@@ -6094,6 +6865,7 @@ async def _start_active_run():
             "zone_num": z["zone_num"],
             "zone_entity_id": zone_eid,
             "enable_entity_id": enable_eid,
+            "duration_entity_id": z.get("duration_entity_id", ""),
             "duration_minutes": z.get("duration_minutes", 0),
             "original_enabled": switch_is_on,
             "moisture_disabled": is_moisture_skip,
@@ -6222,11 +6994,16 @@ async def _refresh_moisture_disabled_flags():
         return
 
     changed = False
+    zone_results = calculate_zone_moisture_multipliers(
+        [z["zone_entity_id"] for z in _active_schedule_run["zone_sequence"]
+         if z["original_enabled"]],
+        data, sensor_states,
+    )
     for z in _active_schedule_run["zone_sequence"]:
         if not z["original_enabled"]:
             continue  # user-disabled — don't touch
         zone_eid = z["zone_entity_id"]
-        zone_result = calculate_zone_moisture_multiplier(zone_eid, data, sensor_states)
+        zone_result = zone_results[zone_eid]
         should_skip = bool(zone_result.get("skip"))
         old_skip = z.get("moisture_disabled", False)
         if should_skip != old_skip:
@@ -6245,16 +7022,14 @@ def _get_next_zone_in_run(current_zone_eid: str) -> dict | None:
 
     Returns the next zone dict or None if current is last.
     """
-    if _active_schedule_run is None:
+    plan = _get_run_plan()
+    if plan is None:
         return None
 
-    seq = _active_schedule_run["zone_sequence"]
-    for i, z in enumerate(seq):
-        if z["zone_entity_id"] == current_zone_eid:
-            if i + 1 < len(seq):
-                return seq[i + 1]
-            return None
-    return None
+    i = plan["position"].get(current_zone_eid)
+    if i is None or i + 1 >= len(plan["seq"]):
+        return None
+    return plan["seq"][i + 1]
 
 
 async def _advance_to_next_zone(current_zone_eid: str) -> bool:
@@ -6270,19 +7045,15 @@ async def _advance_to_next_zone(current_zone_eid: str) -> bool:
     import run_log
 
     config = get_config()
+    t0 = time.monotonic()
     current_num = _extract_zone_number(current_zone_eid)
     _debug_log(f"_advance_to_next_zone called: from zone {current_num} ({current_zone_eid})")
 
-    # --- Active run path: use the full zone sequence ---
-    if _active_schedule_run is not None:
-        seq = _active_schedule_run["zone_sequence"]
-
-        # Find current zone's position
-        current_idx = None
-        for i, z in enumerate(seq):
-            if z["zone_entity_id"] == current_zone_eid:
-                current_idx = i
-                break
+    # --- Active run path: use the precomputed run plan (no HA reads) ---
+    plan = _get_run_plan()
+    if plan is not None:
+        seq = plan["seq"]
+        current_idx = plan["position"].get(current_zone_eid)
 
         if current_idx is None:
             _debug_log(f"  zone {current_num} NOT FOUND in active run sequence — falling back")
@@ -6305,18 +7076,22 @@ async def _advance_to_next_zone(current_zone_eid: str) -> bool:
                 # Found a runnable zone
                 next_eid = candidate["zone_entity_id"]
                 next_num = candidate["zone_num"]
+                plan_ms = (time.monotonic() - t0) * 1000
                 _debug_log(f"  FOUND runnable zone {next_num} ({next_eid})")
 
-                # Enable auto advance
-                auto_advance_entities = [
-                    eid for eid in config.allowed_control_entities
-                    if "auto_advance" in eid.lower() and eid.startswith("switch.")
-                ]
-                for aa_eid in auto_advance_entities:
-                    await ha_client.call_service("switch", "turn_on", {
-                        "entity_id": aa_eid,
-                    })
-                    _debug_log(f"  auto_advance enabled: {aa_eid}")
+                # Enable auto advance (once per run)
+                if not plan["auto_advance_on"]:
+                    auto_advance_entities = [
+                        eid for eid in config.allowed_control_entities
+                        if "auto_advance" in eid.lower() and eid.startswith("switch.")
+                    ]
+                    aa_ok = True
+                    for aa_eid in auto_advance_entities:
+                        aa_ok = await ha_client.call_service("switch", "turn_on", {
+                            "entity_id": aa_eid,
+                        }) and aa_ok
+                        _debug_log(f"  auto_advance enabled: {aa_eid}")
+                    plan["auto_advance_on"] = aa_ok
 
                 # Start the next zone
                 next_domain = (next_eid.split(".")[0]
@@ -6326,6 +7101,8 @@ async def _advance_to_next_zone(current_zone_eid: str) -> bool:
                 success = await ha_client.call_service(
                     next_domain, next_svc, {"entity_id": next_eid}
                 )
+                start_ms = (time.monotonic() - t0) * 1000
+                _record_advance_latency(next_num, plan_ms, start_ms, bool(success))
 
                 if success:
                     run_log.log_zone_event(
@@ -6334,7 +7111,8 @@ async def _advance_to_next_zone(current_zone_eid: str) -> bool:
                         source="moisture_advance",
                         zone_name=f"Zone {next_num}",
                     )
-                    _debug_log(f"  SUCCESS: started zone {next_num}")
+                    _debug_log(f"  SUCCESS: started zone {next_num} "
+                               f"({start_ms:.0f} ms after advance request)")
                     return True
                 else:
                     _debug_log(f"  FAILED: ha_client returned False for zone {next_num}")
@@ -6364,6 +7142,7 @@ async def _advance_to_next_zone(current_zone_eid: str) -> bool:
     next_zone = ordered_zones[current_idx + 1]
     next_eid = next_zone["zone_entity_id"]
     next_num = next_zone["zone_num"]
+    plan_ms = (time.monotonic() - t0) * 1000
 
     auto_advance_entities = [
         eid for eid in config.allowed_control_entities
@@ -6378,6 +7157,8 @@ async def _advance_to_next_zone(current_zone_eid: str) -> bool:
     success = await ha_client.call_service(next_domain, next_svc, {
         "entity_id": next_eid,
     })
+    start_ms = (time.monotonic() - t0) * 1000
+    _record_advance_latency(next_num, plan_ms, start_ms, bool(success))
 
     if success:
         run_log.log_zone_event(
@@ -6387,7 +7168,7 @@ async def _advance_to_next_zone(current_zone_eid: str) -> bool:
             zone_name=f"Zone {next_num}",
         )
         print(f"[MOISTURE] Advance: started zone {next_num} ({next_eid}), "
-              f"auto_advance ON")
+              f"auto_advance ON ({start_ms:.0f} ms)")
         return True
     else:
         print(f"[MOISTURE] Advance: FAILED to start zone {next_num} "
@@ -6508,8 +7289,9 @@ async def on_zone_state_change(zone_entity_id: str, new_state: str,
     probe_prep = timeline.get("probe_prep", {}) if timeline else {}
 
     # Find probes mapped to this zone
-    for probe_id, probe in data.get("probes", {}).items():
-        if zone_entity_id not in probe.get("zone_mappings", []):
+    for probe_id in _get_zone_index().zone_to_probes.get(zone_entity_id, ()):
+        probe = data.get("probes", {}).get(probe_id)
+        if probe is None:
             continue
 
         sleep_switch = (probe.get("extra_sensors") or {}).get("sleep_disabled")
@@ -6544,7 +7326,7 @@ async def on_zone_state_change(zone_entity_id: str, new_state: str,
                     prep["state"] = "monitoring"
                     prep["active_zone_entity_id"] = zone_entity_id
                     if timeline:
-                        _save_schedule_timeline(timeline)
+                        _save_probe_prep(probe_id, prep)
 
             # --- Moisture monitoring & auto-skip (schedule runs only) ---
             # Manual runs (API/dashboard) are allowed to continue — the user
@@ -6664,7 +7446,7 @@ async def on_zone_state_change(zone_entity_id: str, new_state: str,
                     if prep:
                         prep["state"] = "monitoring"
                         if timeline:
-                            _save_schedule_timeline(timeline)
+                            _save_probe_prep(probe_id, prep)
 
                 elif sleep_info and sleep_info["sleep_minutes"] > 0:
                     # There IS a next mapped zone with a gap — sleep until before it starts
@@ -6683,7 +7465,7 @@ async def on_zone_state_change(zone_entity_id: str, new_state: str,
                         prep["state"] = "prep_pending"
                         prep["active_zone_entity_id"] = sleep_info["next_zone_entity_id"]
                         if timeline:
-                            _save_schedule_timeline(timeline)
+                            _save_probe_prep(probe_id, prep)
 
                 else:
                     # No more mapped zones — finish the cycle
@@ -6801,14 +7583,11 @@ async def check_skip_factor_transition(entity_id: str, new_state: str, old_state
 
     # Find which probe(s) own this sensor entity
     probes = data.get("probes", {})
+    index = _get_zone_index()
     affected_zones = set()
-    for probe_id, probe in probes.items():
-        for depth in ("shallow", "mid", "deep"):
-            if probe.get("sensors", {}).get(depth) == entity_id:
-                # This probe's sensor changed — check all mapped zones
-                for zone_eid in probe.get("zone_mappings", []):
-                    affected_zones.add(zone_eid)
-                break
+    for probe_id in index.sensor_to_probes.get(entity_id, ()):
+        # This probe's sensor changed — check all mapped zones
+        affected_zones.update(index.probe_to_zones.get(probe_id, ()))
 
     if not affected_zones:
         return False
@@ -6818,11 +7597,12 @@ async def check_skip_factor_transition(entity_id: str, new_state: str, old_state
     adjusted = data.get("adjusted_durations", {})
     sensor_states = await _get_probe_sensor_states(probes)
 
+    zone_results = calculate_zone_moisture_multipliers(
+        affected_zones, data, sensor_states,
+    )
     for zone_eid in affected_zones:
         # Get new factor with current sensor readings
-        zone_result = calculate_zone_moisture_multiplier(
-            zone_eid, data, sensor_states,
-        )
+        zone_result = zone_results[zone_eid]
         new_skip = zone_result.get("skip", False)
 
         # Check what the current applied state is
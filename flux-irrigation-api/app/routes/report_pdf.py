@@ -1010,6 +1010,11 @@ async def generate_report_pdf(
         moisture = _get_moisture()
         issues = _get_issues()
         history = run_log.get_run_history(hours=hours)
+        try:
+            from routes.weather import enrich_events_with_weather
+            enrich_events_with_weather(history)
+        except Exception:
+            pass
 
         # Water source settings
         try:
@@ -478,6 +478,8 @@ async def store_coordinates(request: Request):
     cache["source"] = "management_server"
     cache["updated_at"] = datetime.now(timezone.utc).isoformat()
     _save_geocode_cache(cache)
+    import location_service
+    location_service.location_changed()
 
     print(f"[SYSTEM] Stored coordinates from management server: ({lat}, {lon})")
     return {"success": True, "latitude": lat, "longitude": lon}
@@ -7,11 +7,16 @@ Supports two weather sources:
   - Built-in NWS API (address-based, no HA integration needed)
 """
 
-import hashlib
+import asyncio
+import bisect
 import json
+import math
 import os
 import re
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import Callable
 from fastapi import APIRouter, HTTPException, Query, Request
 from config import get_config
 import ha_client
@@ -22,8 +27,9 @@ router = APIRouter(prefix="/admin/api", tags=["Weather Control"])
 
 WEATHER_RULES_FILE = "/data/weather_rules.json"
 WEATHER_LOG_FILE = "/data/weather_log.jsonl"
-NWS_CACHE_FILE = "/data/nws_location_cache.json"
+NWS_RESPONSE_CACHE_FILE = "/data/nws_response_cache.json"
 EXTERNAL_WEATHER_FILE = "/data/external_weather.json"
+WEATHER_INDEX_FILE = "/data/weather_hourly_index.json"
 
 
 def _save_external_weather(weather_data: dict):
@@ -125,6 +131,9 @@ def _log_weather_event(event_type: str, details: dict):
             f.write(json.dumps(entry) + "\n")
     except Exception as e:
         print(f"[WEATHER] Failed to write log: {e}")
+        return
+    _index_weather_entry(entry)
+    _schedule_weather_index_flush()
 
 
 def get_weather_log(limit: int = 200, hours: int = 0) -> list[dict]:
@@ -176,37 +185,164 @@ def cleanup_weather_log(retention_days: int = 30):
                 f.write(line + "\n")
     except Exception as e:
         print(f"[WEATHER] Failed to cleanup log: {e}")
+    _prune_weather_index(_hour_key(cutoff))
 
-def get_weather_context_for_events(events: list[dict]) -> dict:
-    """Build a weather context lookup from the weather log.
 
-    Returns a dict of approximate weather snapshots keyed by hour bucket
-    (YYYY-MM-DDTHH) so run events can look up the closest weather state.
-    Also returns the current weather state from weather_rules.json.
+# --- Hourly Weather Index ---
+# One snapshot per UTC hour (the last logged entry in that hour wins),
+# kept in memory with a sorted key list and persisted with a short
+# write-behind.  Appended to by _log_weather_event so run-history
+# enrichment never has to re-read the weather log.
+
+_WEATHER_INDEX_FLUSH_DELAY = 10.0  # seconds
+
+_weather_index: dict | None = None  # {"YYYY-MM-DDTHH": snapshot}
+_weather_index_keys: list = []         # sorted keys of _weather_index
+_weather_index_flush_handle = None
+
+# Snapshot field → weather log entry field
+_INDEX_FIELDS = {
+    "condition": "condition",
+    "temperature": "temperature",
+    "humidity": "humidity",
+    "wind_speed": "wind_speed",
+    "watering_multiplier": "watering_multiplier",
+}
+
+
+def _hour_key(timestamp: str) -> str | None:
+    """UTC hour bucket (YYYY-MM-DDTHH) for an ISO timestamp."""
+    if not timestamp or len(timestamp) < 13:
+        return None
+    try:
+        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return timestamp[:13]
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H")
+
+
+def _hour_ordinal(hour_key: str) -> int:
+    """Hours since the epoch for a YYYY-MM-DDTHH key."""
+    dt = datetime.strptime(hour_key, "%Y-%m-%dT%H").replace(tzinfo=timezone.utc)
+    return int(dt.timestamp()) // 3600
+
+
+def _index_weather_entry(entry: dict):
+    """Fold one weather log entry into its hour bucket.
+
+    Fields the entry does not carry (e.g. a resume event has no
+    temperature) keep the value from earlier in the same hour.
     """
-    log_entries = get_weather_log(limit=10000)
-    if not log_entries:
-        return {"snapshots": {}, "current": _get_current_weather_snapshot()}
-
-    # Build hourly snapshots from weather log (evaluation events have the most data)
-    snapshots = {}
-    for entry in log_entries:
-        ts = entry.get("timestamp", "")
-        if len(ts) < 13:
-            continue
-        hour_key = ts[:13]  # YYYY-MM-DDTHH
-        snapshots[hour_key] = {
-            "condition": entry.get("condition", ""),
-            "temperature": entry.get("temperature"),
-            "humidity": entry.get("humidity"),
-            "wind_speed": entry.get("wind_speed"),
-            "watering_multiplier": entry.get("watering_multiplier"),
-            "event": entry.get("event", ""),
-            "rules_triggered": entry.get("triggered_rules", []),
-            "reason": entry.get("reason", ""),
+    key = _hour_key(entry.get("timestamp", ""))
+    if key is None:
+        return
+    index = _get_weather_index()
+    snap = index.get(key)
+    if snap is None:
+        snap = index[key] = {
+            "condition": "", "temperature": None, "humidity": None,
+            "wind_speed": None, "watering_multiplier": None,
+            "event": "", "rules_triggered": [], "reason": "",
         }
+        if not _weather_index_keys or key > _weather_index_keys[-1]:
+            _weather_index_keys.append(key)
+        else:
+            bisect.insort(_weather_index_keys, key)
+    for field, src in _INDEX_FIELDS.items():
+        value = entry.get(src)
+        if value is not None and value != "":
+            snap[field] = value
+    snap["event"] = entry.get("event", "")
+    rules = entry.get("triggered_rules", entry.get("rules_triggered"))
+    if rules is not None:
+        snap["rules_triggered"] = rules
+    if entry.get("reason"):
+        snap["reason"] = entry["reason"]
+
+
+def _get_weather_index() -> dict:
+    """Return the hourly weather index, loading or rebuilding it on first use."""
+    global _weather_index, _weather_index_keys
+    if _weather_index is not None:
+        return _weather_index
+    _weather_index = {}
+    if os.path.exists(WEATHER_INDEX_FILE):
+        try:
+            with open(WEATHER_INDEX_FILE, "r") as f:
+                _weather_index = json.load(f).get("hours", {})
+        except (json.JSONDecodeError, IOError, AttributeError):
+            _weather_index = {}
+    _weather_index_keys = sorted(_weather_index)
+    if not _weather_index and os.path.exists(WEATHER_LOG_FILE):
+        # First run (or lost index file) — build it from the log once
+        for entry in get_weather_log(limit=1_000_000):
+            _index_weather_entry(entry)
+        if _weather_index:
+            print(f"[WEATHER] Built hourly weather index: {len(_weather_index)} hours")
+            _schedule_weather_index_flush()
+    return _weather_index
+
+
+def flush_weather_index():
+    """Write the hourly weather index to disk now (atomic replace)."""
+    global _weather_index_flush_handle
+    if _weather_index_flush_handle is not None:
+        _weather_index_flush_handle.cancel()
+        _weather_index_flush_handle = None
+    if _weather_index is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(WEATHER_INDEX_FILE), exist_ok=True)
+        tmp = WEATHER_INDEX_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"hours": _weather_index}, f, separators=(",", ":"))
+        os.replace(tmp, WEATHER_INDEX_FILE)
+    except Exception as e:
+        print(f"[WEATHER] Failed to save hourly weather index: {e}")
+
+
+def _schedule_weather_index_flush():
+    global _weather_index_flush_handle
+    if _weather_index_flush_handle is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        flush_weather_index()
+        return
+    _weather_index_flush_handle = loop.call_later(_WEATHER_INDEX_FLUSH_DELAY, flush_weather_index)
+
+
+def _prune_weather_index(cutoff_key: str | None):
+    """Drop hour buckets older than cutoff_key (follows log retention)."""
+    if cutoff_key is None or not _get_weather_index():
+        return
+    drop = bisect.bisect_left(_weather_index_keys, cutoff_key)
+    if not drop:
+        return
+    for key in _weather_index_keys[:drop]:
+        del _weather_index[key]
+    del _weather_index_keys[:drop]
+    flush_weather_index()
+
+
+def clear_weather_index():
+    """Forget all indexed hours (used when the weather log is cleared)."""
+    global _weather_index, _weather_index_keys
+    _weather_index = {}
+    _weather_index_keys = []
+    flush_weather_index()
 
-    return {"snapshots": snapshots, "current": _get_current_weather_snapshot()}
+
+def get_weather_context_for_events(events: list[dict]) -> dict:
+    """Return the hourly weather snapshots plus the current weather state.
+
+    Snapshots are keyed by UTC hour bucket (YYYY-MM-DDTHH); pass them to
+    lookup_weather_at() or use enrich_events_with_weather() directly.
+    """
+    return {"snapshots": _get_weather_index(), "current": _get_current_weather_snapshot()}
 
 
 def _get_current_weather_snapshot() -> dict:
@@ -224,23 +360,83 @@ def _get_current_weather_snapshot() -> dict:
     }
 
 
-def lookup_weather_at(snapshots: dict, timestamp: str) -> dict:
-    """Find the closest weather snapshot for a given event timestamp."""
-    if not timestamp or len(timestamp) < 13:
+def lookup_weather_at(snapshots: dict, timestamp: str,
+                      max_gap_hours: int | None = None) -> dict:
+    """Find the closest weather snapshot for a given event timestamp.
+
+    Takes the nearest hour bucket on either side (ties go to the earlier
+    hour).  With max_gap_hours set, snapshots further away than that
+    are ignored.
+    """
+    key = _hour_key(timestamp)
+    if key is None or not snapshots:
         return {}
-    hour_key = timestamp[:13]
-    # Exact hour match
-    if hour_key in snapshots:
-        return snapshots[hour_key]
-    # Try previous hour
+    if key in snapshots:
+        return snapshots[key]
+    keys = _weather_index_keys if snapshots is _weather_index else sorted(snapshots)
+    nearest = _nearest_hour(keys, key, max_gap_hours)
+    return snapshots[nearest] if nearest else {}
+
+
+def _nearest_hour(keys: list, key: str, max_gap_hours: int | None) -> str | None:
+    pos = bisect.bisect_left(keys, key)
+    if pos < len(keys) and keys[pos] == key:
+        return key
     try:
-        dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-        prev_hour = (dt - timedelta(hours=1)).isoformat()[:13]
-        if prev_hour in snapshots:
-            return snapshots[prev_hour]
-    except (ValueError, TypeError):
-        pass
-    return {}
+        target = _hour_ordinal(key)
+        candidates = []
+        if pos > 0:
+            candidates.append((target - _hour_ordinal(keys[pos - 1]), keys[pos - 1]))
+        if pos < len(keys):
+            candidates.append((_hour_ordinal(keys[pos]) - target, keys[pos]))
+    except ValueError:
+        return None
+    if not candidates:
+        return None
+    gap, nearest = min(candidates)
+    if max_gap_hours is not None and gap > max_gap_hours:
+        return None
+    return nearest
+
+
+def enrich_events_with_weather(events: list[dict],
+                               max_gap_hours: int | None = None) -> list[dict]:
+    """Fill in weather for run events that were logged without it.
+
+    Events are bucketed by hour first, so each distinct hour costs one
+    index lookup no matter how many events fall in it.  Events already
+    carrying weather (captured when they were logged) are left alone;
+    filled-in weather is marked "approximate".
+    """
+    missing: dict[str, list] = {}
+    for e in events:
+        if e.get("weather"):
+            continue
+        key = _hour_key(e.get("timestamp", ""))
+        if key is not None:
+            missing.setdefault(key, []).append(e)
+    if not missing:
+        return events
+    index = _get_weather_index()
+    if not index:
+        return events
+    for key, bucket in missing.items():
+        nearest = _nearest_hour(_weather_index_keys, key, max_gap_hours)
+        snap = index.get(nearest) if nearest else None
+        if not snap or not snap.get("condition"):
+            continue
+        weather = {
+            "condition": snap.get("condition", ""),
+            "temperature": snap.get("temperature"),
+            "humidity": snap.get("humidity"),
+            "wind_speed": snap.get("wind_speed"),
+            "watering_multiplier": snap.get("watering_multiplier"),
+            "active_adjustments": list(snap.get("rules_triggered") or []),
+            "approximate": True,
+        }
+        for e in bucket:
+            e["weather"] = weather
+    return events
 
 
 DEFAULT_RULES = {
@@ -252,6 +448,29 @@ DEFAULT_RULES = {
     "watering_multiplier": 1.0,
     "precip_zone_factors": {},  # {entity_id: factor} when intelligent_precip active
     "precip_qpf_inches": None,  # Last QPF reading in inches
+    # weather_snapshot entries are only logged when a value moves past its
+    # deadband (or the condition/multiplier changes), or as a heartbeat
+    "snapshot_logging": {
+        "heartbeat_minutes": 60,
+        "deadbands": {
+            "temperature": 1.0,
+            "humidity": 3.0,
+            "wind_speed": 2.0,
+            "precipitation_inches": 0.01,
+            "qpf_inches": 0.02,
+            "dew_point": 1.0,
+            "pressure": 1.0,
+            "cloud_cover": 10.0,
+            "uv_index": 1.0,
+        },
+    },
+    # Re-evaluate lead_minutes before each scheduled start unless an
+    # evaluation already ran within max_age_minutes of that start
+    "prestart_refresh": {
+        "enabled": True,
+        "lead_minutes": 10,
+        "max_age_minutes": 20,
+    },
     "rules": {
         "rain_detection": {
             "enabled": True,
@@ -329,159 +548,287 @@ def _load_weather_rules() -> dict:
                     data["precip_zone_factors"] = {}
                 if "precip_qpf_inches" not in data:
                     data["precip_qpf_inches"] = None
+                if "snapshot_logging" not in data:
+                    data["snapshot_logging"] = json.loads(json.dumps(DEFAULT_RULES["snapshot_logging"]))
+                if "prestart_refresh" not in data:
+                    data["prestart_refresh"] = dict(DEFAULT_RULES["prestart_refresh"])
+                if _unsaved_evaluation:
+                    data.update(json.loads(json.dumps(_unsaved_evaluation)))
                 return data
         except (json.JSONDecodeError, IOError):
             pass
-    return json.loads(json.dumps(DEFAULT_RULES))  # deep copy
+    data = json.loads(json.dumps(DEFAULT_RULES))  # deep copy
+    if _unsaved_evaluation:
+        data.update(json.loads(json.dumps(_unsaved_evaluation)))
+    return data
+
+
+_weather_rules_version = 0  # bumped on every save — lets readers cache derived values
+
+# Evaluation results that only refreshed timestamps/readings are kept here
+# instead of being written to weather_rules.json every cycle;
+# _load_weather_rules() overlays them so readers always see the latest.
+_unsaved_evaluation: dict = {}
+_weather_rules_saved_at = 0.0  # time.time() of the last save
+_RULES_SAVE_HEARTBEAT = 3600  # seconds — refresh the file at least this often
 
 
 def _save_weather_rules(data: dict):
     """Save weather rules to persistent storage."""
+    global _weather_rules_version, _weather_rules_saved_at
     os.makedirs(os.path.dirname(WEATHER_RULES_FILE), exist_ok=True)
     with open(WEATHER_RULES_FILE, "w") as f:
         json.dump(data, f, indent=2)
+    _weather_rules_version += 1
+    _weather_rules_saved_at = time.time()
+    _unsaved_evaluation.clear()
+
+
+def flush_weather_evaluation():
+    """Write any evaluation results still held in memory (shutdown)."""
+    if _unsaved_evaluation:
+        _save_weather_rules(_load_weather_rules())
+
+
+def _evaluation_fingerprint(data: dict, with_reasons: bool = False) -> str:
+    """The parts of an evaluation result that matter to readers.
+
+    Adjustment timestamps and the raw readings refresh every cycle and are
+    left out; anything else changing is a transition worth persisting.
+    Reasons quote the current reading ("Hot temperature 96°F, ..."), so
+    they only count with with_reasons.
+    """
+    volatile = ("applied_at", "expires_at") if with_reasons else ("applied_at", "expires_at", "reason")
+    return json.dumps({
+        "watering_multiplier": data.get("watering_multiplier"),
+        "rule_states": data.get("rule_states"),
+        "active_adjustments": [
+            {k: v for k, v in adj.items() if k not in volatile}
+            for adj in data.get("active_adjustments", [])
+        ],
+        "condition": (data.get("last_weather_data") or {}).get("condition"),
+        "precip_zone_factors": data.get("precip_zone_factors"),
+        "precip_factors_source": data.get("precip_factors_source"),
+        "precip_factors_pushed_at": data.get("precip_factors_pushed_at"),
+    }, sort_keys=True, default=str)
+
+
+def get_weather_rules_version() -> int:
+    """Generation counter for weather_rules.json (multiplier, rain context)."""
+    return _weather_rules_version
 
 
 # --- NWS Built-In Weather Helpers ---
 
-def _nws_address_hash(config) -> str:
-    """Create a hash of the homeowner address fields for cache invalidation."""
-    parts = f"{config.homeowner_address}|{config.homeowner_city}|{config.homeowner_state}|{config.homeowner_zip}"
-    return hashlib.md5(parts.encode()).hexdigest()
+# One pooled client for every api.weather.gov request, plus a response cache
+# keyed by URL.  Each product is reused without a request until it expires
+# (Cache-Control max-age, else the Expires header), then revalidated with
+# its ETag / Last-Modified so an unchanged product costs a 304.  The cache
+# is persisted to NWS_RESPONSE_CACHE_FILE so restarts and config reloads
+# start warm, and concurrent requests for one URL share a single fetch.
+_NWS_TIMEOUT = 15.0
+_NWS_HEDGE_DELAY = 2.0  # seconds before racing the next backup station
+_NWS_CACHE_FLUSH_DELAY = 5.0  # write-behind delay for the response cache file
+_NWS_CACHE_KEEP_SECONDS = 86400  # drop entries this long past expiry
+_nws_client = None  # httpx.AsyncClient, created on first use
+_nws_responses: dict[str, dict] | None = None  # url -> {"body", "etag", "last_modified", "expires_at", "fetched_at"}
+_nws_inflight: dict[tuple, asyncio.Task] = {}  # (url, timeout, stale_if_error) -> shared fetch
+_nws_cache_flush_handle = None
+_nws_cache_stats = {"hits": 0, "revalidated": 0, "fetched": 0, "shared": 0, "stale_on_error": 0}
+
+
+def _get_nws_client():
+    """Return the shared NWS HTTP client, creating it on first use."""
+    global _nws_client
+    import httpx
+    if _nws_client is None or _nws_client.is_closed:
+        _nws_client = httpx.AsyncClient(
+            timeout=_NWS_TIMEOUT,
+            headers={"User-Agent": NWS_USER_AGENT, "Accept": "application/geo+json"},
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        )
+    return _nws_client
+
+
+async def close_nws_client():
+    """Flush the response cache and close the shared NWS client (shutdown)."""
+    global _nws_client
+    flush_nws_response_cache()
+    if _nws_client is not None:
+        await _nws_client.aclose()
+        _nws_client = None
+
+
+def _get_nws_responses() -> dict:
+    """Return the NWS response cache, loading it from disk on first use."""
+    global _nws_responses
+    if _nws_responses is None:
+        _nws_responses = {}
+        if os.path.exists(NWS_RESPONSE_CACHE_FILE):
+            try:
+                with open(NWS_RESPONSE_CACHE_FILE, "r") as f:
+                    _nws_responses = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+    return _nws_responses
 
 
-def _load_nws_cache() -> dict:
-    """Load the cached NWS location data."""
-    if os.path.exists(NWS_CACHE_FILE):
-        try:
-            with open(NWS_CACHE_FILE, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
-    return {}
+def flush_nws_response_cache():
+    """Write the NWS response cache to disk now (atomic replace)."""
+    global _nws_cache_flush_handle
+    if _nws_cache_flush_handle is not None:
+        _nws_cache_flush_handle.cancel()
+        _nws_cache_flush_handle = None
+    if _nws_responses is None:
+        return
+    cutoff = time.time() - _NWS_CACHE_KEEP_SECONDS
+    for url in [u for u, e in _nws_responses.items() if e.get("expires_at", 0) < cutoff]:
+        del _nws_responses[url]
+    try:
+        os.makedirs(os.path.dirname(NWS_RESPONSE_CACHE_FILE), exist_ok=True)
+        tmp = NWS_RESPONSE_CACHE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(_nws_responses, f, separators=(",", ":"))
+        os.replace(tmp, NWS_RESPONSE_CACHE_FILE)
+    except Exception as e:
+        print(f"[WEATHER-NWS] Failed to save response cache: {e}")
 
 
-def _save_nws_cache(data: dict):
-    """Save NWS location data to cache."""
-    os.makedirs(os.path.dirname(NWS_CACHE_FILE), exist_ok=True)
-    with open(NWS_CACHE_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+def _schedule_nws_cache_flush():
+    global _nws_cache_flush_handle
+    if _nws_cache_flush_handle is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        flush_nws_response_cache()
+        return
+    _nws_cache_flush_handle = loop.call_later(_NWS_CACHE_FLUSH_DELAY, flush_nws_response_cache)
 
 
-async def _get_or_create_nws_location(config) -> dict | None:
-    """Get cached NWS location or geocode + lookup from NWS API.
+def _nws_expires_at(headers) -> float:
+    """Epoch time until which a response may be reused without revalidation.
 
-    Returns dict with station_url, forecast_url, lat, lon, etc. or None on failure.
+    Cache-Control max-age takes precedence over Expires (as in HTTP);
+    no-cache / no-store or missing headers mean "revalidate every time".
     """
-    import httpx
+    from email.utils import parsedate_to_datetime
+
+    now = time.time()
+    directives = [d.strip().lower() for d in (headers.get("cache-control") or "").split(",")]
+    if "no-cache" in directives or "no-store" in directives:
+        return now
+    for d in directives:
+        if d.startswith("max-age="):
+            try:
+                return now + max(0.0, float(d.split("=", 1)[1]))
+            except ValueError:
+                return now
+    expires = headers.get("expires")
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError):
+            pass
+    return now
 
-    addr_hash = _nws_address_hash(config)
-    cache = _load_nws_cache()
 
-    # Use cache if address hasn't changed
-    if cache.get("address_hash") == addr_hash and cache.get("station_url"):
-        return cache
+def get_nws_cache_status() -> dict:
+    """Per-URL expiry and hit counters for the NWS response cache."""
+    now = time.time()
+    return {
+        "stats": dict(_nws_cache_stats),
+        "in_flight": [url for url, _, _ in _nws_inflight],
+        "entries": {
+            url: {
+                "fetched_at": e.get("fetched_at"),
+                "expires_in_seconds": round(e.get("expires_at", 0) - now),
+                "etag": bool(e.get("etag")),
+                "last_modified": bool(e.get("last_modified")),
+            }
+            for url, e in _get_nws_responses().items()
+        },
+    }
 
-    # Build address string for geocoding
-    addr_parts = [config.homeowner_address, config.homeowner_city,
-                  config.homeowner_state, config.homeowner_zip]
-    address_str = ", ".join(p for p in addr_parts if p)
-    if not address_str:
-        print("[WEATHER-NWS] No address configured for geocoding")
-        return None
 
+async def _nws_fetch(url: str, timeout: float | None, stale_if_error: bool) -> dict:
+    responses = _get_nws_responses()
+    cached = responses.get(url)
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    client = _get_nws_client()
+    kwargs = {"headers": headers}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            # Step 1: Geocode address — try stored coordinates first (pushed by management server),
-            # then fall back to Nominatim (free, but misses newer subdivisions)
-            lat = None
-            lon = None
-
-            # Check for pre-geocoded coordinates from management server
-            from routes.system import _load_geocode_cache
-            stored = _load_geocode_cache()
-            if stored.get("latitude") is not None and stored.get("longitude") is not None:
-                lat = round(float(stored["latitude"]), 4)
-                lon = round(float(stored["longitude"]), 4)
-                print(f"[WEATHER-NWS] Using stored coordinates: ({lat}, {lon})")
-            else:
-                # Fall back to Nominatim geocoding
-                geo_resp = await client.get(
-                    "https://nominatim.openstreetmap.org/search",
-                    params={"format": "json", "limit": "1", "q": address_str},
-                    headers={"User-Agent": NWS_USER_AGENT},
-                )
-                geo_resp.raise_for_status()
-                geo_results = geo_resp.json()
-                if not geo_results:
-                    print(f"[WEATHER-NWS] Geocoding returned no results for: {address_str}")
-                    return None
-
-                lat = round(float(geo_results[0]["lat"]), 4)
-                lon = round(float(geo_results[0]["lon"]), 4)
-                print(f"[WEATHER-NWS] Geocoded address to {lat}, {lon}")
-
-            # Step 2: NWS points lookup
-            points_resp = await client.get(
-                f"https://api.weather.gov/points/{lat},{lon}",
-                headers={"User-Agent": NWS_USER_AGENT, "Accept": "application/geo+json"},
-            )
-            points_resp.raise_for_status()
-            points_data = points_resp.json()
-            props = points_data.get("properties", {})
+        resp = await client.get(url, **kwargs)
+        if resp.status_code == 304 and cached:
+            cached["expires_at"] = _nws_expires_at(resp.headers)
+            _nws_cache_stats["revalidated"] += 1
+            _schedule_nws_cache_flush()
+            return cached["body"]
+        resp.raise_for_status()
+        body = resp.json()
+    except Exception as e:
+        if (stale_if_error and cached
+                and cached.get("expires_at", 0) > time.time() - _NWS_CACHE_KEEP_SECONDS):
+            _nws_cache_stats["stale_on_error"] += 1
+            print(f"[WEATHER-NWS] Fetch failed ({url}): {e} — using cached response "
+                  f"from {cached.get('fetched_at')}")
+            return cached["body"]
+        raise
+
+    _nws_cache_stats["fetched"] += 1
+    responses[url] = {
+        "body": body,
+        "etag": resp.headers.get("etag"),
+        "last_modified": resp.headers.get("last-modified"),
+        "expires_at": _nws_expires_at(resp.headers),
+        "fetched_at": datetime.now(timezone.utc).isoformat(),
+    }
+    _schedule_nws_cache_flush()
+    return body
 
-            forecast_url = props.get("forecast", "")
-            stations_url = props.get("observationStations", "")
 
-            if not forecast_url or not stations_url:
-                print(f"[WEATHER-NWS] Points response missing forecast/stations URLs")
-                return None
+def _nws_fetch_done(key: tuple, task: asyncio.Task):
+    _nws_inflight.pop(key, None)
+    if not task.cancelled():
+        task.exception()  # retrieved here in case every caller gave up
 
-            # Step 3: Get nearest observation station
-            stations_resp = await client.get(
-                stations_url,
-                headers={"User-Agent": NWS_USER_AGENT, "Accept": "application/geo+json"},
-            )
-            stations_resp.raise_for_status()
-            stations_data = stations_resp.json()
-            station_features = stations_data.get("features", [])
-            if not station_features:
-                print(f"[WEATHER-NWS] No observation stations found near {lat}, {lon}")
-                return None
-
-            # Use the first (nearest) station
-            station_props = station_features[0].get("properties", {})
-            station_id = station_props.get("stationIdentifier", "")
-            station_url = f"https://api.weather.gov/stations/{station_id}"
-
-            # Also save backup station IDs in case primary fails
-            backup_stations = []
-            for feat in station_features[1:4]:  # Next 3 closest
-                sid = feat.get("properties", {}).get("stationIdentifier", "")
-                if sid:
-                    backup_stations.append(sid)
-
-            cache_data = {
-                "address_hash": addr_hash,
-                "lat": lat,
-                "lon": lon,
-                "station_id": station_id,
-                "station_url": station_url,
-                "backup_stations": backup_stations,
-                "forecast_url": forecast_url,
-                "grid_id": props.get("gridId", ""),
-                "grid_x": props.get("gridX"),
-                "grid_y": props.get("gridY"),
-                "cached_at": datetime.now(timezone.utc).isoformat(),
-            }
-            _save_nws_cache(cache_data)
-            print(f"[WEATHER-NWS] Cached location: station={station_id}, "
-                  f"grid={props.get('gridId')}/{props.get('gridX')},{props.get('gridY')}")
-            return cache_data
 
-    except Exception as e:
-        print(f"[WEATHER-NWS] Location lookup failed: {e}")
-        return None
+async def _nws_get_json(url: str, timeout: float | None = None,
+                        stale_if_error: bool = False) -> dict:
+    """GET an api.weather.gov product as JSON through the response cache.
+
+    Returns the cached body while it has not expired, revalidates it
+    afterwards, and joins an in-flight fetch of the same URL instead of
+    starting another — only one made with the same timeout and
+    stale_if_error, so a caller never inherits another's error handling
+    (e.g. stale data when it asked for errors).  Raises on HTTP or network errors like
+    resp.raise_for_status() unless stale_if_error allows falling back to an
+    expired copy; the returned dict is shared and must not be mutated.
+    """
+    cached = _get_nws_responses().get(url)
+    if cached and time.time() < cached.get("expires_at", 0):
+        _nws_cache_stats["hits"] += 1
+        return cached["body"]
+
+    key = (url, timeout, stale_if_error)
+    task = _nws_inflight.get(key)
+    if task is not None:
+        _nws_cache_stats["shared"] += 1
+    else:
+        task = asyncio.create_task(_nws_fetch(url, timeout, stale_if_error))
+        _nws_inflight[key] = task
+        task.add_done_callback(lambda t, k=key: _nws_fetch_done(k, t))
+    # Shielded: one caller giving up (e.g. a losing hedged station) must not
+    # cancel the fetch for the others
+    return await asyncio.shield(task)
 
 
 def _extract_nws_value(field_data) -> float | None:
@@ -622,51 +969,70 @@ def _nws_cloud_cover(props: dict):
     return cover
 
 
+def _parse_nws_observation(data: dict) -> dict:
+    """Flatten an NWS latest-observation response into extracted values."""
+    props = data.get("properties", {})
+
+    # Precipitation: NWS reports in mm; try last hour, then last 6 hours
+    precip_mm = _extract_nws_value(props.get("precipitationLastHour"))
+    if precip_mm is None:
+        p6 = _extract_nws_value(props.get("precipitationLast6Hours"))
+        if p6 is not None:
+            precip_mm = p6
+
+    return {
+        "textDescription": props.get("textDescription", ""),
+        "temperature": _extract_nws_value(props.get("temperature")),
+        "relativeHumidity": _extract_nws_value(props.get("relativeHumidity")),
+        "windSpeed": _extract_nws_value(props.get("windSpeed")),
+        "windDirection": _extract_nws_value(props.get("windDirection")),
+        "barometricPressure": _extract_nws_value(props.get("barometricPressure")),
+        "precipitationMm": precip_mm,
+        "dewpoint": _extract_nws_value(props.get("dewpoint")),
+        "cloudCover": _nws_cloud_cover(props),
+        "timestamp": props.get("timestamp"),
+    }
+
+
 async def _fetch_nws_observations(station_url: str, backup_stations: list = None) -> dict:
     """Fetch latest observations from an NWS station.
 
     Returns a flat dict with extracted values (not raw NWS objects).
-    Falls back to backup stations if the primary fails.
+    Backup stations are hedged: if the primary has not answered within
+    _NWS_HEDGE_DELAY (or fails), the next backup is raced alongside it and
+    the first successful response wins.
     """
-    import httpx
-
     urls_to_try = [f"{station_url}/observations/latest"]
     for sid in (backup_stations or []):
         urls_to_try.append(f"https://api.weather.gov/stations/{sid}/observations/latest")
 
-    for url in urls_to_try:
+    async def fetch(url):
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(
-                    url,
-                    headers={"User-Agent": NWS_USER_AGENT, "Accept": "application/geo+json"},
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                props = data.get("properties", {})
-
-                # Precipitation: NWS reports in mm; try last hour, then last 6 hours
-                precip_mm = _extract_nws_value(props.get("precipitationLastHour"))
-                if precip_mm is None:
-                    p6 = _extract_nws_value(props.get("precipitationLast6Hours"))
-                    if p6 is not None:
-                        precip_mm = p6
-
-                return {
-                    "textDescription": props.get("textDescription", ""),
-                    "temperature": _extract_nws_value(props.get("temperature")),
-                    "relativeHumidity": _extract_nws_value(props.get("relativeHumidity")),
-                    "windSpeed": _extract_nws_value(props.get("windSpeed")),
-                    "windDirection": _extract_nws_value(props.get("windDirection")),
-                    "barometricPressure": _extract_nws_value(props.get("barometricPressure")),
-                    "precipitationMm": precip_mm,
-                    "dewpoint": _extract_nws_value(props.get("dewpoint")),
-                    "cloudCover": _nws_cloud_cover(props),
-                    "timestamp": props.get("timestamp"),
-                }
+            return url, await _nws_get_json(url)
         except Exception as e:
             print(f"[WEATHER-NWS] Observation fetch failed ({url}): {e}")
-            continue
+            return url, None
+
+    pending: set[asyncio.Task] = set()
+    remaining = list(urls_to_try)
+    try:
+        while remaining or pending:
+            if remaining:
+                pending.add(asyncio.create_task(fetch(remaining.pop(0))))
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=_NWS_HEDGE_DELAY if remaining else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                url, data = task.result()
+                if data is not None:
+                    if url != urls_to_try[0]:
+                        print(f"[WEATHER-NWS] Using backup station observation ({url})")
+                    return _parse_nws_observation(data)
+    finally:
+        for task in pending:
+            task.cancel()
 
     print("[WEATHER-NWS] All observation stations failed")
     return {}
@@ -674,18 +1040,10 @@ async def _fetch_nws_observations(station_url: str, backup_stations: list = None
 
 async def _fetch_nws_forecast(forecast_url: str) -> list:
     """Fetch forecast periods from NWS and map to HA format."""
-    import httpx
-
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                forecast_url,
-                headers={"User-Agent": NWS_USER_AGENT, "Accept": "application/geo+json"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            periods = data.get("properties", {}).get("periods", [])
-            return [_map_nws_forecast_period(p) for p in periods[:14]]  # ~7 days (day+night)
+        data = await _nws_get_json(forecast_url, stale_if_error=True)
+        periods = data.get("properties", {}).get("periods", [])
+        return [_map_nws_forecast_period(p) for p in periods[:14]]  # ~7 days (day+night)
     except Exception as e:
         print(f"[WEATHER-NWS] Forecast fetch failed: {e}")
         return []
@@ -693,30 +1051,21 @@ async def _fetch_nws_forecast(forecast_url: str) -> list:
 
 # --- QPF (Quantitative Precipitation Forecast) for Intelligent Precip ---
 
-_qpf_cache: dict = {}  # {"value_mm": float, "fetched_at": str}
-_QPF_CACHE_TTL_SECONDS = 7200  # 2 hours
+_qpf_cache: dict = {}  # {"value_mm", "fetched_at", "source", "lookahead_hours"}
+_QPF_CACHE_TTL_SECONDS = 7200  # recompute at least this often (lookahead window moves)
 
 
 async def _fetch_nws_qpf(lookahead_hours: int = 24) -> float | None:
     """Fetch quantitative precipitation forecast from NWS gridpoints API.
 
     Returns total expected precipitation in mm for the next `lookahead_hours`,
-    or None if data is unavailable.  Results are cached for 2 hours.
+    or None if data is unavailable.  The gridpoint response itself is cached
+    until NWS says it expires; the derived total is only recomputed when that
+    response changes, the lookahead changes, or after 2 hours.
     """
-    import httpx
-
-    # Check cache
-    if _qpf_cache.get("fetched_at"):
-        try:
-            age = (datetime.now(timezone.utc) -
-                   datetime.fromisoformat(_qpf_cache["fetched_at"])).total_seconds()
-            if age < _QPF_CACHE_TTL_SECONDS and _qpf_cache.get("value_mm") is not None:
-                return _qpf_cache["value_mm"]
-        except (ValueError, TypeError):
-            pass
-
     # Load NWS grid data from location cache
-    location = _load_nws_cache()
+    import location_service
+    location = location_service.get_nws_location(get_config()) or {}
     grid_id = location.get("grid_id", "")
     grid_x = location.get("grid_x")
     grid_y = location.get("grid_y")
@@ -726,13 +1075,19 @@ async def _fetch_nws_qpf(lookahead_hours: int = 24) -> float | None:
 
     url = f"https://api.weather.gov/gridpoints/{grid_id}/{grid_x},{grid_y}"
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.get(
-                url,
-                headers={"User-Agent": NWS_USER_AGENT, "Accept": "application/geo+json"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        data = await _nws_get_json(url, timeout=20.0, stale_if_error=True)
+
+        source = (_get_nws_responses().get(url) or {}).get("fetched_at")
+        if (_qpf_cache.get("value_mm") is not None
+                and _qpf_cache.get("source") == source
+                and _qpf_cache.get("lookahead_hours") == lookahead_hours):
+            try:
+                age = (datetime.now(timezone.utc) -
+                       datetime.fromisoformat(_qpf_cache["fetched_at"])).total_seconds()
+                if age < _QPF_CACHE_TTL_SECONDS:
+                    return _qpf_cache["value_mm"]
+            except (ValueError, TypeError):
+                pass
 
         props = data.get("properties", {})
         qpf_obj = props.get("quantitativePrecipitation", {})
@@ -742,7 +1097,8 @@ async def _fetch_nws_qpf(lookahead_hours: int = 24) -> float | None:
             avail_keys = [k for k in props.keys() if "precip" in k.lower() or "rain" in k.lower()]
             print(f"[WEATHER-QPF] No quantitativePrecipitation values in response. "
                   f"Available precip-related keys: {avail_keys}")
-            _qpf_cache.update({"value_mm": None, "fetched_at": datetime.now(timezone.utc).isoformat()})
+            _qpf_cache.update({"value_mm": None, "fetched_at": datetime.now(timezone.utc).isoformat(),
+                               "source": source, "lookahead_hours": lookahead_hours})
             return None
 
         now = datetime.now(timezone.utc)
@@ -781,6 +1137,8 @@ async def _fetch_nws_qpf(lookahead_hours: int = 24) -> float | None:
         _qpf_cache.update({
             "value_mm": round(total_mm, 2),
             "fetched_at": datetime.now(timezone.utc).isoformat(),
+            "source": source,
+            "lookahead_hours": lookahead_hours,
         })
         print(f"[WEATHER-QPF] Fetched QPF: {total_mm:.2f}mm ({total_mm / 25.4:.3f}\") "
               f"over next {lookahead_hours}h")
@@ -795,6 +1153,77 @@ async def _fetch_nws_qpf(lookahead_hours: int = 24) -> float | None:
         return None
 
 
+# --- Intelligent Precip Zone Table ---
+# Everything in a zone's precip factor except the QPF itself depends only on
+# the enabled zone list and the nozzle data, so those are folded into
+# parallel per-zone columns once and every QPF update is a single pass.
+
+@dataclass(frozen=True)
+class PrecipZoneTable:
+    zones_ref: list                # the zone list this table was built from
+    nozzle_stamp: tuple            # (mtime_ns, size) of the nozzle data file
+    entity_ids: tuple
+    durations: tuple               # scheduled run minutes
+    irrigation_inches: tuple       # inches applied per scheduled run; None = no GPM/area data
+
+
+_precip_table: PrecipZoneTable | None = None
+
+
+def _nozzle_stamp() -> tuple:
+    import zone_nozzle_data
+    try:
+        st = os.stat(zone_nozzle_data.ZONE_NOZZLE_FILE)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return (0, 0)
+
+
+def _build_precip_zone_table(zones: list, stamp: tuple) -> PrecipZoneTable:
+    import zone_nozzle_data
+
+    heads = zone_nozzle_data.get_all_zones_heads()
+    entity_ids, durations, inches = [], [], []
+    no_data = []
+    for z in zones:
+        eid = z.get("zone_entity_id", "")
+        if not eid or z.get("is_special"):
+            continue  # Skip pump/master/relay
+        zone_heads = heads.get(eid) or {}
+        total_gpm = zone_heads.get("total_gpm", 0)
+        area_sqft = zone_heads.get("area_sqft", 0)
+        duration_min = z.get("duration_minutes", 0)
+        if total_gpm <= 0 or area_sqft <= 0:
+            # No GPM/area data — can't calculate credit, always skip
+            entity_ids.append(eid)
+            durations.append(duration_min)
+            inches.append(None)
+            no_data.append(eid)
+            continue
+        if duration_min <= 0:
+            continue
+        # Zone precipitation rate in inches/hour × scheduled hours
+        zone_irrigation_inches = (total_gpm * 96.25) / area_sqft * (duration_min / 60.0)
+        if zone_irrigation_inches <= 0:
+            continue
+        entity_ids.append(eid)
+        durations.append(duration_min)
+        inches.append(zone_irrigation_inches)
+    if no_data:
+        print(f"[WEATHER] Precip: {len(no_data)} zone(s) have no GPM data — skip: {no_data}")
+    return PrecipZoneTable(zones, stamp, tuple(entity_ids), tuple(durations), tuple(inches))
+
+
+def _get_precip_zone_table(zones: list) -> PrecipZoneTable:
+    """Per-zone precip columns for this zone list, rebuilt when it or the nozzle data changes."""
+    global _precip_table
+    stamp = _nozzle_stamp()
+    table = _precip_table
+    if table is None or table.zones_ref is not zones or table.nozzle_stamp != stamp:
+        table = _precip_table = _build_precip_zone_table(zones, stamp)
+    return table
+
+
 def _calculate_precip_reductions(
     qpf_mm: float,
     zones: list,
@@ -813,55 +1242,22 @@ def _calculate_precip_reductions(
         Zones without GPM/area data are set to 0.0 (skip) — we can't
         calculate credit without nozzle data, so skip to be safe.
     """
-    import zone_nozzle_data
-
     rain_inches = qpf_mm / 25.4
     if rain_inches <= 0:
         return {}
 
-    factors = {}
-    for z in zones:
-        eid = z.get("zone_entity_id", "")
-        if not eid:
-            continue
-        if z.get("is_special"):
-            continue  # Skip pump/master/relay
-
-        heads = zone_nozzle_data.get_zone_heads(eid)
-        total_gpm = heads.get("total_gpm", 0)
-        area_sqft = heads.get("area_sqft", 0)
-
-        if total_gpm <= 0 or area_sqft <= 0:
-            # No GPM/area data — skip zone (can't calculate credit)
-            factors[eid] = 0.0
-            print(f"[WEATHER] Precip: zone {eid} has no GPM data — skip")
-            continue
-
-        duration_min = z.get("duration_minutes", 0)
-        if duration_min <= 0:
-            continue
-
-        # Zone precipitation rate in inches/hour
-        precip_rate = (total_gpm * 96.25) / area_sqft
-        # How many inches this zone puts down in its scheduled run
-        zone_irrigation_inches = precip_rate * (duration_min / 60.0)
-
-        if zone_irrigation_inches <= 0:
-            continue
-
-        # Credit from rain (can't credit more than zone needs)
-        rain_credit = min(rain_inches, zone_irrigation_inches)
-        reduction = rain_credit / zone_irrigation_inches
-        factor = round(max(0.0, 1.0 - reduction), 4)
-
-        # If adjusted run time would be below minimum, skip entirely
-        adjusted_min = duration_min * factor
-        if 0 < adjusted_min < min_run_minutes:
-            factor = 0.0
-
-        factors[eid] = factor
-
-    return factors
+    table = _get_precip_zone_table(zones)
+    # Credit from rain (can't credit more than the zone needs) as a fraction
+    # of what the zone applies; None columns (no nozzle data) are skipped
+    factors = [
+        round(max(0.0, 1.0 - min(rain_inches, inches) / inches), 4) if inches is not None else 0.0
+        for inches in table.irrigation_inches
+    ]
+    # If adjusted run time would be below minimum, skip entirely
+    return {
+        eid: 0.0 if 0 < duration * factor < min_run_minutes else factor
+        for eid, duration, factor in zip(table.entity_ids, table.durations, factors)
+    }
 
 
 async def get_weather_data_nws() -> dict:
@@ -872,40 +1268,39 @@ async def get_weather_data_nws() -> dict:
     """
     config = get_config()
 
-    # Get cached NWS location or geocode + lookup
-    location = await _get_or_create_nws_location(config)
+    # Cached NWS location (resolved in the background by location_service)
+    import location_service
+    location = location_service.get_nws_location(config)
     if not location:
         return {"error": "Could not determine location from address for NWS weather"}
 
-    # Fetch current observations from nearest station
-    obs = await _fetch_nws_observations(
-        location["station_url"],
-        backup_stations=location.get("backup_stations", []),
-    )
+    # Include QPF (expected precipitation) — read from rules cache, or fetch live
+    rules_data = _load_weather_rules()
+    qpf_inches = rules_data.get("precip_qpf_inches")
+
+    # Observations, forecast and (if needed) gridpoint QPF in one round trip
+    fetches = [
+        _fetch_nws_observations(
+            location["station_url"],
+            backup_stations=location.get("backup_stations", []),
+        ),
+        _fetch_nws_forecast(location["forecast_url"]),
+    ]
+    if qpf_inches is None:
+        ip_rules = rules_data.get("rules", {}).get("intelligent_precip", {})
+        fetches.append(_fetch_nws_qpf(
+            lookahead_hours=ip_rules.get("qpf_lookahead_hours", 24)
+        ))
+    obs, forecast, *qpf = await asyncio.gather(*fetches)
     if not obs:
         return {"error": "Could not fetch NWS observations"}
+    if qpf and qpf[0] is not None:
+        qpf_inches = round(qpf[0] / 25.4, 3)
 
-    # Fetch forecast
-    forecast = await _fetch_nws_forecast(location["forecast_url"])
-
-    # Precipitation: convert mm to inches; also include QPF from rules
+    # Precipitation: convert mm to inches
     precip_mm = obs.get("precipitationMm")
     precip_inches = round(precip_mm / 25.4, 2) if precip_mm is not None else None
 
-    # Include QPF (expected precipitation) — read from rules cache, or fetch live
-    rules_data = _load_weather_rules()
-    qpf_inches = rules_data.get("precip_qpf_inches")
-    if qpf_inches is None:
-        try:
-            ip_rules = rules_data.get("rules", {}).get("intelligent_precip", {})
-            qpf_mm = await _fetch_nws_qpf(
-                lookahead_hours=ip_rules.get("qpf_lookahead_hours", 24)
-            )
-            if qpf_mm is not None:
-                qpf_inches = round(qpf_mm / 25.4, 3)
-        except Exception:
-            pass
-
     return {
         "entity_id": "nws_builtin",
         "condition": _map_nws_condition(obs.get("textDescription", "")),
@@ -995,181 +1390,289 @@ async def get_weather_data() -> dict:
 
 # --- Schedule Skip Detection (for already-paused systems) ---
 
-# Tracks which schedule start times we've already logged weather_skip for
-# so we don't double-log on every evaluation cycle.
-# Persisted to disk so service restarts don't cause duplicate entries.
-# Format: {"YYYY-MM-DD HH:MM": True}
+# Tracks which schedule occurrences we've already logged weather_skip for
+# so we don't double-log on every evaluation cycle.  Each entry expires
+# after two days and the ledger never holds more than _SKIP_LEDGER_MAX
+# entries; it is persisted (write-behind) so service restarts don't cause
+# duplicate entries.
+# Format: {"YYYY-MM-DD <start_time>": expires_at (epoch seconds)}
 _LOGGED_SKIPS_FILE = "/data/logged_schedule_skips.json"
+_SKIP_LEDGER_TTL = 2 * 86400  # seconds
+_SKIP_LEDGER_MAX = 64
+_SKIP_LEDGER_FLUSH_DELAY = 5.0  # seconds
+
 _logged_schedule_skips: dict = {}
+_logged_skips_flush_handle = None
 
 
 def _load_logged_skips():
     """Load persisted skip tracker from disk."""
     global _logged_schedule_skips
+    _logged_schedule_skips = {}
     try:
         if os.path.exists(_LOGGED_SKIPS_FILE):
             with open(_LOGGED_SKIPS_FILE, "r") as f:
-                _logged_schedule_skips = json.load(f)
+                raw = json.load(f)
+            now = time.time()
+            for key, expires_at in raw.items():
+                if expires_at is True:
+                    # Old format ({key: True}) — give it a fresh TTL
+                    expires_at = now + _SKIP_LEDGER_TTL
+                if isinstance(expires_at, (int, float)) and expires_at > now:
+                    _logged_schedule_skips[key] = expires_at
     except Exception:
         _logged_schedule_skips = {}
 
 
-def _save_logged_skips():
-    """Persist skip tracker to disk."""
+def flush_logged_skips():
+    """Persist the skip tracker to disk now (atomic replace)."""
+    global _logged_skips_flush_handle
+    if _logged_skips_flush_handle is not None:
+        _logged_skips_flush_handle.cancel()
+        _logged_skips_flush_handle = None
     try:
-        with open(_LOGGED_SKIPS_FILE, "w") as f:
+        tmp = _LOGGED_SKIPS_FILE + ".tmp"
+        with open(tmp, "w") as f:
             json.dump(_logged_schedule_skips, f)
+        os.replace(tmp, _LOGGED_SKIPS_FILE)
     except Exception:
         pass
 
 
+def _schedule_logged_skips_flush():
+    global _logged_skips_flush_handle
+    if _logged_skips_flush_handle is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        flush_logged_skips()
+        return
+    _logged_skips_flush_handle = loop.call_later(_SKIP_LEDGER_FLUSH_DELAY, flush_logged_skips)
+
+
+def _skip_logged(key: str) -> bool:
+    expires_at = _logged_schedule_skips.get(key)
+    if expires_at is None:
+        return False
+    if expires_at <= time.time():
+        del _logged_schedule_skips[key]
+        return False
+    return True
+
+
+def _mark_skip_logged(key: str):
+    """Record an occurrence as logged, evicting expired and then oldest entries."""
+    now = time.time()
+    _logged_schedule_skips.pop(key, None)
+    _logged_schedule_skips[key] = now + _SKIP_LEDGER_TTL
+    for k in [k for k, exp in _logged_schedule_skips.items() if exp <= now]:
+        del _logged_schedule_skips[k]
+    while len(_logged_schedule_skips) > _SKIP_LEDGER_MAX:
+        del _logged_schedule_skips[next(iter(_logged_schedule_skips))]
+    _schedule_logged_skips_flush()
+
+
+def _clear_logged_skips():
+    """Forget all logged occurrences so the next pause cycle starts fresh."""
+    if _logged_schedule_skips:
+        _logged_schedule_skips.clear()
+        _schedule_logged_skips_flush()
+
+
 # Load on module init
 _load_logged_skips()
 
 
+# Calendar of upcoming schedule occurrences, derived from the irrigation
+# timeline and the schedule day switches.  Rebuilt only when the timeline
+# file, the enabled days or the calendar window change, so each skip check
+# is a bisect over precomputed start times.
+_CALENDAR_DAYS_BACK = 1
+_CALENDAR_DAYS_AHEAD = 7
+_DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+@dataclass(frozen=True)
+class ScheduleOccurrence:
+    start: datetime               # local, naive (schedule times are local)
+    start_time: str               # start time as shown on the controller
+    total_duration_minutes: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.start.strftime('%Y-%m-%d')} {self.start_time}"
+
+
+@dataclass(frozen=True)
+class ScheduleCalendar:
+    stamp: tuple                  # (timeline file stamp, enabled weekdays, first day)
+    first_day: object             # date
+    last_day: object              # date
+    occurrences: tuple            # ScheduleOccurrence, sorted by start
+    starts: tuple                 # occurrence start datetimes, for bisect
+    max_duration_minutes: float
+
+    def between(self, lo: datetime, hi: datetime) -> tuple:
+        """Occurrences starting in [lo, hi]."""
+        i = bisect.bisect_left(self.starts, lo)
+        j = bisect.bisect_right(self.starts, hi)
+        return self.occurrences[i:j]
+
+
+_schedule_calendar: ScheduleCalendar | None = None
+
+
+async def _enabled_schedule_weekdays(config) -> frozenset | None:
+    """Weekdays (0=Monday) whose schedule day switch is on; None if the controller has none."""
+    day_eids = [
+        eid for eid in config.allowed_control_entities
+        if eid.startswith("switch.") and "schedule" in eid.lower()
+        and any(day in eid.lower() for day in _DAY_NAMES)
+    ]
+    if not day_eids:
+        return None
+    from routes.moisture import _get_schedule_entity_states
+    enabled = set()
+    for st in await _get_schedule_entity_states(day_eids):
+        eid_lower = st.get("entity_id", "").lower()
+        for i, day in enumerate(_DAY_NAMES):
+            if day in eid_lower and st.get("state") == "on":
+                enabled.add(i)
+    return frozenset(enabled)
+
+
+def _build_schedule_calendar(schedules: list, weekdays: frozenset | None,
+                             first_day, stamp: tuple) -> ScheduleCalendar:
+    from routes.moisture import _parse_time_to_minutes
+
+    last_day = first_day + timedelta(days=_CALENDAR_DAYS_BACK + _CALENDAR_DAYS_AHEAD)
+    # The timeline stores start_minutes (minutes-since-midnight), already
+    # parsed from any time format (12h/24h); fall back to parsing the string.
+    parsed = []
+    for sched in schedules:
+        start_time_str = sched.get("start_time", "")
+        if not start_time_str:
+            continue
+        try:
+            start_mins = sched.get("start_minutes")
+            if start_mins is None:
+                start_mins = _parse_time_to_minutes(start_time_str)
+            parsed.append((int(start_mins), start_time_str,
+                           sched.get("total_duration_minutes", 60)))
+        except (ValueError, IndexError, TypeError) as parse_err:
+            print(f"[WEATHER] Schedule calendar: could not parse start_time "
+                  f"'{start_time_str}' (start_minutes={sched.get('start_minutes')}): {parse_err}")
+
+    occurrences = []
+    day = first_day
+    while day <= last_day:
+        if weekdays is None or day.weekday() in weekdays:
+            for start_mins, start_time_str, total_dur in parsed:
+                start = datetime(day.year, day.month, day.day, start_mins // 60, start_mins % 60)
+                occurrences.append(ScheduleOccurrence(start, start_time_str, total_dur))
+        day += timedelta(days=1)
+    occurrences.sort(key=lambda o: o.start)
+    return ScheduleCalendar(
+        stamp=stamp,
+        first_day=first_day,
+        last_day=last_day,
+        occurrences=tuple(occurrences),
+        starts=tuple(o.start for o in occurrences),
+        max_duration_minutes=max((p[2] for p in parsed), default=0),
+    )
+
+
+async def _get_schedule_calendar(config, now: datetime) -> ScheduleCalendar | None:
+    """Schedule occurrences around `now` (local), or None without a timeline."""
+    global _schedule_calendar
+    from routes.moisture import SCHEDULE_TIMELINE_FILE, _load_schedule_timeline
+
+    try:
+        st = os.stat(SCHEDULE_TIMELINE_FILE)
+        file_stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+    weekdays = await _enabled_schedule_weekdays(config)
+    first_day = now.date() - timedelta(days=_CALENDAR_DAYS_BACK)
+    stamp = (file_stamp, weekdays, first_day)
+    if _schedule_calendar is None or _schedule_calendar.stamp != stamp:
+        schedules = _load_schedule_timeline().get("schedules", [])
+        _schedule_calendar = _build_schedule_calendar(schedules, weekdays, first_day, stamp)
+        print(f"[WEATHER] Schedule calendar rebuilt: {len(schedules)} schedule(s), "
+              f"{len(_schedule_calendar.occurrences)} occurrence(s) "
+              f"{_schedule_calendar.first_day}..{_schedule_calendar.last_day}")
+    return _schedule_calendar
+
+
 async def _log_skipped_schedules(config, schedule_data: dict, pause_reason: str):
     """Log weather_skip events when scheduled start times pass while already paused.
 
     Called every weather evaluation cycle when system is already weather-paused.
-    Reads the irrigation timeline to find schedule start times, checks if any
-    have passed since we last checked, and logs weather_skip for every zone
-    in that schedule.  Only logs once per schedule occurrence (tracked by date+time).
+    Asks the schedule calendar for occurrences that started recently and logs
+    weather_skip for every zone in each one.  Only logs once per schedule
+    occurrence (tracked by date+time).
 
     IMPORTANT: Only logs skips when:
-    1. A schedule start time has actually passed today
-    2. Today is an enabled schedule day (checks schedule_monday..sunday switches)
+    1. A schedule start time has actually passed, no longer ago than the
+       schedule's total duration + 30 minutes (avoids logging old
+       schedules on restart)
+    2. That day is an enabled schedule day (schedule_monday..sunday switches)
     """
-    global _logged_schedule_skips
     import run_log
 
     try:
-        from routes.moisture import _load_schedule_timeline, _get_ordered_enabled_zones
-
-        timeline = _load_schedule_timeline()
-        schedules = timeline.get("schedules", [])
-        if not schedules:
-            print("[WEATHER] _log_skipped_schedules: no schedules in timeline — nothing to check")
+        now = datetime.now()  # local time (schedule times are local)
+        calendar = await _get_schedule_calendar(config, now)
+        if calendar is None or not calendar.occurrences:
+            print("[WEATHER] _log_skipped_schedules: no schedule occurrences in timeline "
+                  "(or all schedule days disabled) — nothing to check")
             return
 
-        now = datetime.now()  # local time (schedule times are local)
-        today_str = now.strftime("%Y-%m-%d")
-        print(f"[WEATHER] _log_skipped_schedules: checking {len(schedules)} "
-              f"schedule(s), time now = {now.strftime('%H:%M')}")
-
-        # Check if today is an enabled schedule day by reading schedule day switches.
-        # If the controller has schedule_monday..sunday switches and today's day is OFF,
-        # no schedule would have run — don't log any skips.
-        _DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        today_day = _DAY_NAMES[now.weekday()]  # 0=monday
-        day_switch_found = False
-        today_enabled = True  # default to True if no day switches exist
-        try:
-            for eid in config.allowed_control_entities:
-                eid_lower = eid.lower()
-                if (eid.startswith("switch.") and "schedule" in eid_lower
-                        and today_day in eid_lower):
-                    day_switch_found = True
-                    states = await ha_client.get_entities_by_ids([eid])
-                    if states:
-                        today_enabled = states[0].get("state") == "on"
-                    break
-        except Exception:
-            pass  # If we can't check, assume today is enabled
-        if day_switch_found and not today_enabled:
-            print(f"[WEATHER] _log_skipped_schedules: {today_day} is disabled — "
-                  f"no schedule runs today, skipping")
+        window_start = now - timedelta(minutes=calendar.max_duration_minutes + 30)
+        due = [
+            occ for occ in calendar.between(window_start, now)
+            if (now - occ.start).total_seconds() <= (occ.total_duration_minutes + 30) * 60
+            and not _skip_logged(occ.key)
+        ]
+        if not due:
             return
 
-        # Clean out old entries (older than 2 days)
-        cutoff = (now - timedelta(days=2)).strftime("%Y-%m-%d")
-        _logged_schedule_skips = {
-            k: v for k, v in _logged_schedule_skips.items()
-            if k >= cutoff
+        from routes.moisture import get_enabled_zones_snapshot
+        from routes.homeowner import is_zone_not_used
+
+        zones = await ha_client.get_entities_by_ids(config.allowed_zone_entities)
+        zone_names = {
+            z.get("entity_id"): z.get("attributes", {}).get("friendly_name")
+            for z in zones
         }
+        enabled_zones = await get_enabled_zones_snapshot()
 
-        for sched in schedules:
-            start_time_str = sched.get("start_time", "")
-            if not start_time_str:
-                continue
-
-            # Build a datetime for today's occurrence of this schedule.
-            # The timeline stores start_minutes (minutes-since-midnight)
-            # which is already parsed from any time format (12h/24h).
-            # Fall back to parsing the string if start_minutes is missing.
-            try:
-                start_mins = sched.get("start_minutes")
-                if start_mins is not None:
-                    sched_hour = int(start_mins) // 60
-                    sched_min = int(start_mins) % 60
-                else:
-                    # Fallback: use _parse_time_to_minutes which handles
-                    # "7:00 AM", "5:00 PM", "17:30", etc.
-                    from routes.moisture import _parse_time_to_minutes
-                    total_mins = _parse_time_to_minutes(start_time_str)
-                    sched_hour = total_mins // 60
-                    sched_min = total_mins % 60
-                sched_dt = now.replace(hour=sched_hour, minute=sched_min,
-                                       second=0, microsecond=0)
-            except (ValueError, IndexError) as parse_err:
-                print(f"[WEATHER] _log_skipped_schedules: could not parse "
-                      f"start_time '{start_time_str}' (start_minutes={sched.get('start_minutes')}): {parse_err}")
-                continue
-
-            # Only process schedules that have already passed today
-            if sched_dt > now:
-                continue
-
-            # Don't log if it passed more than the total schedule duration + 30min ago
-            # (avoids logging old schedules on restart)
-            total_dur = sched.get("total_duration_minutes", 60)
-            if (now - sched_dt).total_seconds() > (total_dur + 30) * 60:
-                continue
-
-            # Check if we already logged this schedule occurrence
-            skip_key = f"{today_str} {start_time_str}"
-            if skip_key in _logged_schedule_skips:
-                continue
-
-            # This schedule start time has passed while we're paused — log it!
-            print(f"[WEATHER] Schedule {start_time_str} passed while "
-                  f"weather-paused — logging weather_skip events")
-
-            zones = await ha_client.get_entities_by_ids(config.allowed_zone_entities)
-            enabled_zones = await _get_ordered_enabled_zones()
-            skip_count = 0
-
-            # Load not-used zones to exclude from skip reporting
-            from routes.homeowner import is_zone_not_used
-
-            for ez in enabled_zones:
-                zone_eid = ez["zone_entity_id"]
-                if ez.get("is_special"):
-                    continue  # Skip pump/master/relay
-                if is_zone_not_used(zone_eid):
-                    continue  # Skip zones marked as "not used"
-
-                zone_name = f"Zone {ez.get('zone_num', 0)}"
-                for z in zones:
-                    if z.get("entity_id") == zone_eid:
-                        zone_name = z.get("attributes", {}).get(
-                            "friendly_name", zone_name
-                        )
-                        break
+        for occ in due:
+            # This schedule start time has passed while we're paused — log it!
+            print(f"[WEATHER] Schedule {occ.start_time} passed while "
+                  f"weather-paused — logging weather_skip events")
+            skip_count = 0
+            for ez in enabled_zones:
+                zone_eid = ez["zone_entity_id"]
+                if ez.get("is_special"):
+                    continue  # Skip pump/master/relay
+                if is_zone_not_used(zone_eid):
+                    continue  # Skip zones marked as "not used"
 
                 run_log.log_zone_event(
                     entity_id=zone_eid,
                     state="weather_skip",
                     source="weather_skip",
-                    zone_name=zone_name,
+                    zone_name=zone_names.get(zone_eid) or f"Zone {ez.get('zone_num', 0)}",
                     duration_seconds=0,
                     scheduled_minutes=ez.get("duration_minutes", 0),
                 )
                 skip_count += 1
 
-            _logged_schedule_skips[skip_key] = True
-            _save_logged_skips()
+            _mark_skip_logged(occ.key)
             print(f"[WEATHER] Logged weather_skip for {skip_count} zones "
-                  f"(schedule {start_time_str}, reason: {pause_reason})")
+                  f"(schedule {occ.start_time}, reason: {pause_reason})")
 
     except Exception as e:
         print(f"[WEATHER] Error in _log_skipped_schedules: {e}")
@@ -1257,7 +1760,7 @@ async def _auto_resume_stuck_weather_pause(caller: str = "unknown"):
     rules_data["watering_multiplier"] = 1.0
     _save_weather_rules(rules_data)
 
-    _logged_schedule_skips.clear()
+    _clear_logged_skips()
 
     await ha_client.fire_event("flux_irrigation_weather_resume", {
         "reason": f"Auto-resumed: stuck pause safety net ({caller})",
@@ -1277,11 +1780,623 @@ async def _auto_resume_stuck_weather_pause(caller: str = "unknown"):
 
 # --- Rules Engine ---
 
-async def run_weather_evaluation() -> dict:
+# --- Compiled Weather Rules Engine ---
+# weather_rules.json is compiled into a WeatherRulePlan when the rules are
+# saved: each enabled rule becomes a check with its thresholds already
+# resolved, run in the order of _RULE_TABLE.  Evaluating a plan is a single
+# synchronous pass over a weather snapshot with no I/O, so the live
+# evaluation, the what-if API and replays all share it.
+
+_RAIN_CONDITIONS = frozenset({"rainy", "pouring", "lightning-rainy"})
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """One enabled rule with its thresholds bound into ``check``."""
+    name: str
+    action: str  # pause | skip | reduce | increase | multiply
+    gate: str  # always | unless_paused | rain_holds (see evaluate_weather_rules)
+    check: Callable[[dict, datetime], tuple | None]  # (weather, now) -> (factor, reason) or None
+
+
+@dataclass(frozen=True)
+class WeatherRulePlan:
+    """Immutable evaluation plan built by compile_weather_rules()."""
+    rules: dict  # the rules config this plan was compiled from
+    rain_mode: str  # rain_holds | intelligent_precip
+    steps: tuple  # CompiledRule, in evaluation order
+    qpf_lookahead_hours: float
+    min_run_minutes: float
+
+
+def _temp_threshold(weather: dict, f_value, c_value):
+    unit = weather.get("temperature_unit", "°F")
+    return unit, (c_value if "C" in unit else f_value)
+
+
+def _compile_rain_detection(cfg):
+    def check(weather, now):
+        if weather.get("condition") in _RAIN_CONDITIONS:
+            return 0, f"Currently raining ({weather['condition']})"
+        return None
+    return check
+
+
+def _compile_rain_forecast(cfg):
+    prob_threshold = cfg.get("probability_threshold", 60)
+    lookahead = timedelta(hours=cfg.get("lookahead_hours", 48))
+
+    def check(weather, now):
+        cutoff = now + lookahead
+        for f in weather.get("forecast") or []:
+            # Filter by lookahead window — only check forecast periods within range
+            fc_dt = None
+            fc_dt_str = f.get("datetime") or f.get("start_time") or ""
+            if fc_dt_str:
+                try:
+                    fc_dt = datetime.fromisoformat(fc_dt_str)
+                    # Ensure timezone-aware for comparison
+                    aware = fc_dt if fc_dt.tzinfo else fc_dt.replace(tzinfo=timezone.utc)
+                    if aware > cutoff:
+                        continue  # Outside lookahead window — skip this period
+                except (ValueError, TypeError):
+                    pass  # Can't parse datetime — include it to be safe
+            precip_prob = _safe_float(f.get("precipitation_probability", 0)) or 0
+            if precip_prob >= prob_threshold:
+                # Include which day the rain is forecast for in the reason
+                day_label = f" on {fc_dt.strftime('%A')}" if fc_dt else ""
+                return 0, f"Rain forecasted ({precip_prob}% probability{day_label})"
+        return None
+    return check
+
+
+def _compile_precipitation_threshold(cfg):
+    threshold_mm = cfg.get("skip_if_rain_above_mm", 6.0)
+
+    def check(weather, now):
+        forecast = weather.get("forecast") or []
+        total_precip = sum((_safe_float(f.get("precipitation", 0)) or 0) for f in forecast[:2])
+        if total_precip >= threshold_mm:
+            return 0, f"Expected rainfall {total_precip:.1f}mm exceeds {threshold_mm}mm threshold"
+        return None
+    return check
+
+
+def _compile_temperature_freeze(cfg):
+    f_value, c_value = cfg.get("freeze_threshold_f", 35), cfg.get("freeze_threshold_c", 2)
+
+    def check(weather, now):
+        temp = _safe_float(weather.get("temperature"))
+        unit, threshold = _temp_threshold(weather, f_value, c_value)
+        if temp is not None and temp <= threshold:
+            return 0, f"Temperature {temp}{unit} at or below freeze threshold ({threshold}{unit})"
+        return None
+    return check
+
+
+def _compile_temperature_cool(cfg):
+    f_value, c_value = cfg.get("cool_threshold_f", 60), cfg.get("cool_threshold_c", 15)
+    reduction = cfg.get("reduction_percent", 25)
+    factor = round(1 - reduction / 100, 3)
+
+    def check(weather, now):
+        temp = _safe_float(weather.get("temperature"))
+        unit, threshold = _temp_threshold(weather, f_value, c_value)
+        if temp is not None and temp < threshold:
+            return factor, f"Cool temperature {temp}{unit}, reducing watering {reduction}%"
+        return None
+    return check
+
+
+def _compile_temperature_hot(cfg):
+    f_value, c_value = cfg.get("hot_threshold_f", 95), cfg.get("hot_threshold_c", 35)
+    increase = cfg.get("increase_percent", 25)
+    factor = round(1 + increase / 100, 3)
+
+    def check(weather, now):
+        temp = _safe_float(weather.get("temperature"))
+        unit, threshold = _temp_threshold(weather, f_value, c_value)
+        if temp is not None and temp > threshold:
+            return factor, f"Hot temperature {temp}{unit}, increasing watering {increase}%"
+        return None
+    return check
+
+
+def _compile_wind_speed(cfg):
+    mph, kmh = cfg.get("max_wind_speed_mph", 20), cfg.get("max_wind_speed_kmh", 32)
+
+    def check(weather, now):
+        wind = _safe_float(weather.get("wind_speed"))
+        unit = weather.get("wind_speed_unit", "mph")
+        threshold = kmh if "km" in unit.lower() else mph
+        if wind is not None and wind > threshold:
+            return 0, f"Wind speed {wind} {unit} exceeds {threshold} {unit} threshold"
+        return None
+    return check
+
+
+def _compile_humidity(cfg):
+    threshold = cfg.get("high_humidity_threshold", 80)
+    reduction = cfg.get("reduction_percent", 20)
+    factor = round(1 - reduction / 100, 3)
+
+    def check(weather, now):
+        humidity = _safe_float(weather.get("humidity"))
+        if humidity is not None and humidity > threshold:
+            return factor, f"High humidity {humidity}%, reducing watering {reduction}%"
+        return None
+    return check
+
+
+def _compile_seasonal_adjustment(cfg):
+    monthly = {}
+    for m, v in (cfg.get("monthly_multipliers") or {}).items():
+        value = _safe_float(v)
+        if value is not None:
+            monthly[str(m)] = value
+
+    def check(weather, now):
+        month = str(now.astimezone().month)
+        season_mult = monthly.get(month, 1.0)
+        if season_mult <= 0:
+            season_mult = 1.0  # Treat 0 as 1.0 to avoid zeroing out the multiplier
+        return season_mult, f"Seasonal adjustment for month {month}: {season_mult}x"
+    return check
+
+
+# Evaluation order.  Gates: "always" runs even after a pause/skip fired,
+# "unless_paused" only while nothing has paused, "rain_holds" additionally
+# only in rain-holds mode (or when intelligent precip falls back to it).
+# intelligent_precip runs between rain_detection and the rain_holds rules.
+_RULE_TABLE = (
+    ("rain_detection", "pause", "always", _compile_rain_detection),
+    ("rain_forecast", "skip", "rain_holds", _compile_rain_forecast),
+    ("precipitation_threshold", "skip", "rain_holds", _compile_precipitation_threshold),
+    ("temperature_freeze", "skip", "unless_paused", _compile_temperature_freeze),
+    ("temperature_cool", "reduce", "unless_paused", _compile_temperature_cool),
+    ("temperature_hot", "increase", "unless_paused", _compile_temperature_hot),
+    ("wind_speed", "skip", "unless_paused", _compile_wind_speed),
+    ("humidity", "reduce", "always", _compile_humidity),
+    ("seasonal_adjustment", "multiply", "always", _compile_seasonal_adjustment),
+)
+
+_rule_plan: WeatherRulePlan | None = None
+
+
+def _build_rule_plan(rules_data: dict) -> WeatherRulePlan:
+    """Compile a rules config into an evaluation plan (not made current)."""
+    rules = json.loads(json.dumps(rules_data.get("rules", {})))
+    steps = tuple(
+        CompiledRule(name, action, gate, compiler(rules[name]))
+        for name, action, gate, compiler in _RULE_TABLE
+        if (rules.get(name) or {}).get("enabled")
+    )
+    ip_rules = rules.get("intelligent_precip", {})
+    return WeatherRulePlan(
+        rules=rules,
+        rain_mode=rules_data.get("rain_control_mode", "rain_holds"),
+        steps=steps,
+        qpf_lookahead_hours=ip_rules.get("qpf_lookahead_hours", 24),
+        min_run_minutes=ip_rules.get("min_run_minutes", 2.0),
+    )
+
+
+def compile_weather_rules(rules_data: dict) -> WeatherRulePlan:
+    """Compile a rules config and make it the plan used by evaluations."""
+    global _rule_plan
+    _rule_plan = _build_rule_plan(rules_data)
+    return _rule_plan
+
+
+def _get_rule_plan(rules_data: dict) -> WeatherRulePlan:
+    """Return the compiled plan, recompiling only if the rules config changed."""
+    plan = _rule_plan
+    if (plan is None
+            or plan.rain_mode != rules_data.get("rain_control_mode", "rain_holds")
+            or plan.rules != rules_data.get("rules", {})):
+        plan = compile_weather_rules(rules_data)
+    return plan
+
+
+def evaluate_weather_rules(
+    plan: WeatherRulePlan,
+    weather: dict,
+    now: datetime | None = None,
+    qpf_mm: float | None = None,
+    precip_factors: dict | None = None,
+    external_precip: dict | None = None,
+) -> dict:
+    """Run a compiled plan against one weather snapshot (no I/O).
+
+    Args:
+        now: Evaluation time (UTC); defaults to the current time.  Replays
+            and what-if runs pass the snapshot's own timestamp.
+        qpf_mm: Expected precipitation for intelligent precip.
+        precip_factors: Per-zone factors from _calculate_precip_reductions()
+            for qpf_mm (only consulted in intelligent_precip mode).
+        external_precip: Management-pushed factors still in force —
+            {"factors", "qpf_inches", "pushed_at", "source"} — or None.
+
+    Returns {"triggered", "adjustments", "multiplier", "should_pause",
+    "pause_reason", "rule_states", "precip_zone_factors"}.  precip_zone_factors
+    is None when external factors are kept.
+    """
+    now = now or datetime.now(timezone.utc)
+    applied_at = now.isoformat()
+    triggered = []
+    adjustments = []
+    rule_states = {}
+    multiplier = 1.0
+    should_pause = False
+    pause_reason = ""
+    rain_mode = plan.rain_mode
+    zone_factors = None if external_precip else {}
+    precip_done = False
+
+    for step in plan.steps:
+        if step.name != "rain_detection" and not precip_done:
+            precip_done = True
+            rain_mode, zone_factors = _evaluate_precip_stage(
+                plan, rain_mode, should_pause, qpf_mm, precip_factors,
+                external_precip, zone_factors, triggered, adjustments,
+                rule_states, applied_at,
+            )
+        if step.gate != "always" and should_pause:
+            rule_states.setdefault(step.name, False)
+            continue
+        if step.gate == "rain_holds" and rain_mode != "rain_holds":
+            rule_states.setdefault(step.name, False)
+            continue
+        hit = step.check(weather, now)
+        rule_states[step.name] = hit is not None
+        if hit is None:
+            continue
+        factor, reason = hit
+        triggered.append({"rule": step.name, "action": step.action, "reason": reason})
+        if step.action in ("pause", "skip"):
+            should_pause = True
+            pause_reason = pause_reason or reason
+            adjustment = {"rule": step.name, "action": step.action, "factor": 0,
+                          "reason": reason, "applied_at": applied_at}
+            if step.name == "rain_detection":
+                delay_hours = plan.rules["rain_detection"].get("resume_delay_hours", 2)
+                adjustment["expires_at"] = (now + timedelta(hours=delay_hours)).isoformat()
+            adjustments.append(adjustment)
+        else:
+            multiplier *= factor
+            if step.action != "multiply" or abs(factor - 1.0) >= 0.005:
+                adjustments.append({"rule": step.name, "action": step.action,
+                                    "factor": round(factor, 3), "reason": reason,
+                                    "applied_at": applied_at})
+    if not precip_done:
+        rain_mode, zone_factors = _evaluate_precip_stage(
+            plan, rain_mode, should_pause, qpf_mm, precip_factors,
+            external_precip, zone_factors, triggered, adjustments,
+            rule_states, applied_at,
+        )
+
+    # If any rule says skip/pause, multiplier is 0 — no watering
+    if should_pause:
+        multiplier = 0.0
+
+    return {
+        "triggered": triggered,
+        "adjustments": adjustments,
+        "multiplier": multiplier,
+        "should_pause": should_pause,
+        "pause_reason": pause_reason,
+        "rule_states": rule_states,
+        "precip_zone_factors": zone_factors,
+    }
+
+
+def _evaluate_precip_stage(plan, rain_mode, should_pause, qpf_mm, precip_factors,
+                           external_precip, zone_factors, triggered, adjustments,
+                           rule_states, applied_at):
+    """Intelligent precip / external factor stage of evaluate_weather_rules().
+
+    Returns (rain_mode, zone_factors); rain_mode falls back to rain_holds
+    when intelligent precip has no QPF or no zone factors.
+    """
+    if external_precip:
+        # Keep existing factors from external push — don't clear them
+        ext_factors = external_precip.get("factors") or {}
+        if ext_factors:
+            avg_factor = round(sum(ext_factors.values()) / len(ext_factors), 3)
+            ext_qpf = external_precip.get("qpf_inches") or 0
+            adjustments.append({
+                "rule": "intelligent_precip", "action": "reduce",
+                "factor": avg_factor,
+                "reason": (f"Precipitation Credit (Management): "
+                           f"{ext_qpf:.2f}\" forecast, avg zone factor {avg_factor}"),
+                "applied_at": external_precip.get("pushed_at"),
+                "source": external_precip.get("source"),
+            })
+        return rain_mode, zone_factors
+
+    if rain_mode != "intelligent_precip" or should_pause:
+        return rain_mode, zone_factors
+    if qpf_mm is None:
+        # QPF unavailable — fall back to rain_holds
+        return "rain_holds", zone_factors
+    if qpf_mm <= 0:
+        rule_states["intelligent_precip"] = False
+        return rain_mode, zone_factors
+    if not precip_factors:
+        # No non-special zones — fall back to rain_holds for this eval
+        return "rain_holds", {}
+
+    rain_inches = round(qpf_mm / 25.4, 3)
+    avg_factor = round(sum(precip_factors.values()) / len(precip_factors), 3)
+    reason = (f"Intelligent Precip: {rain_inches:.2f}\" expected, "
+              f"avg zone factor {avg_factor}")
+    rule_states["intelligent_precip"] = True
+    triggered.append({"rule": "intelligent_precip", "action": "reduce", "reason": reason})
+    adjustments.append({
+        "rule": "intelligent_precip", "action": "reduce",
+        "factor": avg_factor,
+        "reason": reason,
+        "applied_at": applied_at,
+        "qpf_mm": qpf_mm,
+        "qpf_inches": rain_inches,
+        "zone_factors": precip_factors,
+    })
+    return rain_mode, dict(precip_factors)
+
+
+def _rule_state_changes(old_states: dict, new_states: dict) -> list[dict]:
+    """Rules whose triggered state differs from the previous evaluation."""
+    changes = []
+    for rule in sorted(set(old_states) | set(new_states)):
+        was, now_on = bool(old_states.get(rule)), bool(new_states.get(rule))
+        if was != now_on:
+            changes.append({"rule": rule, "triggered": now_on})
+    return changes
+
+
+# --- Weather Log Change Detection ---
+# Each evaluation cycle only appends a weather_snapshot when a reading moved
+# past its deadband (compared with the last *logged* value, so slow drift
+# still shows up), the condition or multiplier changed, or the heartbeat
+# is due — the chart stays faithful while the log stops growing with
+# identical rows.
+
+_SNAPSHOT_FIELDS = (
+    "condition", "temperature", "humidity", "wind_speed", "precipitation_inches",
+    "qpf_inches", "dew_point", "pressure", "cloud_cover", "uv_index",
+    "watering_multiplier", "source",
+)
+_FORECAST_PERIODS = 7  # forecast periods kept with a snapshot (HA entities give 7 days)
+_last_logged_snapshot: dict | None = None
+_last_snapshot_logged_at = 0.0  # time.time()
+_snapshot_log_stats = {"logged": 0, "suppressed": 0}
+
+
+def _compact_forecast(forecast) -> list:
+    """The forecast fields rain_forecast/precipitation_threshold read, for the log."""
+    compact = []
+    for f in (forecast or [])[:_FORECAST_PERIODS]:
+        compact.append({
+            "datetime": f.get("datetime") or f.get("start_time"),
+            "precipitation_probability": f.get("precipitation_probability"),
+            "precipitation": f.get("precipitation"),
+        })
+    return compact
+
+
+def _setting_number(value) -> float | None:
+    """A finite, non-negative number from a settings payload, else None."""
+    if isinstance(value, bool):
+        return None
+    number = _safe_float(value)
+    if number is None or not math.isfinite(number) or number < 0:
+        return None
+    return number
+
+
+def _merge_snapshot_logging(current: dict | None, update) -> dict:
+    """Validate a snapshot_logging update and merge it (deadbands key by key).
+
+    Raises HTTPException(400) on non-numeric or negative values.
+    """
+    if not isinstance(update, dict):
+        raise HTTPException(status_code=400, detail="snapshot_logging must be an object")
+    merged = json.loads(json.dumps(current or DEFAULT_RULES["snapshot_logging"]))
+    for key, value in update.items():
+        if key == "heartbeat_minutes":
+            minutes = _setting_number(value)
+            if minutes is None:
+                raise HTTPException(status_code=400,
+                                    detail="snapshot_logging.heartbeat_minutes must be a number >= 0")
+            merged[key] = minutes
+        elif key == "deadbands":
+            if not isinstance(value, dict):
+                raise HTTPException(status_code=400, detail="snapshot_logging.deadbands must be an object")
+            for field, band in value.items():
+                if field not in _SNAPSHOT_FIELDS:
+                    raise HTTPException(status_code=400, detail=f"Unknown deadband field: {field}")
+                band_f = _setting_number(band)
+                if band is not None and band_f is None:
+                    raise HTTPException(status_code=400,
+                                        detail=f"Deadband for {field} must be a number >= 0 or null")
+                merged.setdefault("deadbands", {})[field] = band_f
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown snapshot_logging setting: {key}")
+    return merged
+
+
+def _snapshot_log_reason(snapshot: dict, settings: dict, now: float) -> str | None:
+    """Why this snapshot should be logged, or None if it adds nothing."""
+    last = _last_logged_snapshot
+    if last is None:
+        return "first"
+    heartbeat = (_safe_float(settings.get("heartbeat_minutes", 60)) or 0) * 60
+    if heartbeat and now - _last_snapshot_logged_at >= heartbeat:
+        return "heartbeat"
+    deadbands = settings.get("deadbands", {})
+    for field in _SNAPSHOT_FIELDS:
+        new, old = snapshot.get(field), last.get(field)
+        if new == old:
+            continue
+        band = _safe_float(deadbands.get(field))
+        new_f, old_f = _safe_float(new), _safe_float(old)
+        if band is None or new_f is None or old_f is None:
+            return field  # categorical field, or a reading appeared/disappeared
+        if abs(new_f - old_f) >= band:
+            return field
+    # Period times roll forward on every fetch; only changed rain inputs count
+    def rain_outlook(snap):
+        return [(f.get("precipitation_probability"), f.get("precipitation"))
+                for f in snap.get("forecast") or []]
+    if rain_outlook(snapshot) != rain_outlook(last):
+        return "forecast"
+    return None
+
+
+def _log_weather_snapshot(snapshot: dict, settings: dict) -> bool:
+    """Append a weather_snapshot entry if it differs enough from the last one."""
+    global _last_logged_snapshot, _last_snapshot_logged_at
+    now = time.time()
+    if _snapshot_log_reason(snapshot, settings, now) is None:
+        _snapshot_log_stats["suppressed"] += 1
+        return False
+    _log_weather_event("weather_snapshot", snapshot)
+    _last_logged_snapshot = dict(snapshot)
+    _last_snapshot_logged_at = now
+    _snapshot_log_stats["logged"] += 1
+    return True
+
+
+def get_weather_log_stats() -> dict:
+    """Counters for snapshot logging and rules persistence since start-up."""
+    return {
+        "snapshots_logged": _snapshot_log_stats["logged"],
+        "snapshots_suppressed": _snapshot_log_stats["suppressed"],
+        "last_snapshot_logged_at": (datetime.fromtimestamp(_last_snapshot_logged_at, timezone.utc).isoformat()
+                                    if _last_snapshot_logged_at else None),
+        "rules_saved_at": (datetime.fromtimestamp(_weather_rules_saved_at, timezone.utc).isoformat()
+                           if _weather_rules_saved_at else None),
+        "unsaved_evaluation": bool(_unsaved_evaluation),
+    }
+
+
+# --- Pre-start refresh ---
+# The periodic check runs every weather_check_interval_minutes, so a
+# schedule starting just before the next check would run on multipliers up
+# to one interval old.  plan_next_weather_check() brings the next check
+# forward to lead_minutes before a scheduled start, unless an evaluation
+# already ran within max_age_minutes of it.  Every evaluation restarts the
+# interval, so a pre-start check replaces a periodic one instead of adding
+# a fetch, and starts close together share one evaluation.
+
+_last_weather_check_at = 0.0  # time.time() of the last evaluation attempt
+_last_weather_fetch_at = 0.0  # time.time() of the last successful weather fetch
+_next_weather_check: dict = {}  # last plan, for /weather/debug
+_prestart_stats = {"refreshes": 0}
+
+
+def _prestart_settings(rules_data: dict) -> tuple[bool, float, float]:
+    """(enabled, lead seconds, max age seconds) with max age never below the lead."""
+    settings = rules_data.get("prestart_refresh") or DEFAULT_RULES["prestart_refresh"]
+    lead = max(_safe_float(settings.get("lead_minutes")) or 0.0, 1.0)
+    max_age = max(_safe_float(settings.get("max_age_minutes")) or 0.0, lead)
+    return bool(settings.get("enabled", True)), lead * 60, max_age * 60
+
+
+def _merge_prestart_refresh(current: dict | None, update) -> dict:
+    """Validate a prestart_refresh update and merge it over the current settings.
+
+    Raises HTTPException(400) on a non-boolean enabled flag, non-numeric
+    minutes (lead below 1) or unknown keys.
+    """
+    if not isinstance(update, dict):
+        raise HTTPException(status_code=400, detail="prestart_refresh must be an object")
+    merged = dict(current or DEFAULT_RULES["prestart_refresh"])
+    for key, value in update.items():
+        if key == "enabled":
+            if not isinstance(value, bool):
+                raise HTTPException(status_code=400, detail="prestart_refresh.enabled must be true or false")
+            merged[key] = value
+        elif key in ("lead_minutes", "max_age_minutes"):
+            minutes = _setting_number(value)
+            floor = 1 if key == "lead_minutes" else 0
+            if minutes is None or minutes < floor:
+                raise HTTPException(status_code=400,
+                                    detail=f"prestart_refresh.{key} must be a number >= {floor}")
+            merged[key] = minutes
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown prestart_refresh setting: {key}")
+    return merged
+
+
+async def plan_next_weather_check(config, interval_seconds: float) -> tuple[float, str]:
+    """Seconds until the next weather evaluation is due, and why.
+
+    The reason is "interval" for the regular check or "prestart" when a
+    scheduled start needs fresher numbers than the regular check would give.
+    Cheap to call repeatedly — the schedule calendar is cached.
+    """
+    global _next_weather_check
+    now_ts = time.time()
+    delay = _last_weather_check_at + interval_seconds - now_ts
+    reason, start_key = "interval", None
+
+    enabled, lead, max_age = _prestart_settings(_load_weather_rules())
+    if enabled:
+        now = datetime.now()  # local time (schedule times are local)
+        try:
+            calendar = await _get_schedule_calendar(config, now)
+        except Exception as e:
+            print(f"[WEATHER] Pre-start refresh: schedule calendar unavailable: {e}")
+            calendar = None
+        if calendar is not None:
+            last = datetime.fromtimestamp(_last_weather_fetch_at) if _last_weather_fetch_at else None
+            attempted = datetime.fromtimestamp(_last_weather_check_at)
+            # Only starts whose refresh falls before the regular check matter
+            horizon = now + timedelta(seconds=max(delay, 0.0) + lead)
+            for occ in calendar.between(now, horizon):
+                if last is not None and (occ.start - last).total_seconds() <= max_age:
+                    continue  # already evaluated close enough to this start
+                if (occ.start - attempted).total_seconds() <= lead:
+                    continue  # refresh was tried and failed — leave it to the interval
+                due = (occ.start - now).total_seconds() - lead
+                if due < delay:
+                    delay, reason, start_key = due, "prestart", occ.key
+                break
+
+    delay = max(delay, 0.0)
+    _next_weather_check = {
+        "at": datetime.fromtimestamp(now_ts + delay, timezone.utc).isoformat(),
+        "reason": reason,
+        "schedule_start": start_key,
+    }
+    return delay, reason
+
+
+def get_weather_check_status() -> dict:
+    """Last plan made by plan_next_weather_check() and pre-start refresh counters."""
+    return {
+        "last_check_at": (datetime.fromtimestamp(_last_weather_check_at, timezone.utc).isoformat()
+                          if _last_weather_check_at else None),
+        "last_fetch_at": (datetime.fromtimestamp(_last_weather_fetch_at, timezone.utc).isoformat()
+                          if _last_weather_fetch_at else None),
+        "next_check": dict(_next_weather_check),
+        "prestart_refreshes": _prestart_stats["refreshes"],
+    }
+
+
+async def run_weather_evaluation(trigger: str = "interval") -> dict:
     """Evaluate all enabled weather rules against current conditions.
 
-    Returns a summary of triggered rules and actions taken.
+    Returns a summary of triggered rules and actions taken.  `trigger` is
+    "prestart" when called ahead of a scheduled start (see
+    plan_next_weather_check()).
     """
+    global _weather_rules_version, _last_weather_check_at, _last_weather_fetch_at
+    import run_log
+
+    _last_weather_check_at = time.time()
+
     config = get_config()
     if not config.weather_enabled:
         # Even when weather is disabled, check for stuck pauses
@@ -1299,8 +2414,22 @@ async def run_weather_evaluation() -> dict:
             await _auto_resume_stuck_weather_pause("no_address")
             return {"skipped": True, "reason": "No address configured for built-in weather"}
 
-    weather = await get_weather_data()
+    # Gridpoint QPF does not depend on the observations — fetch it alongside
+    qpf_task = None
+    if config.weather_source == "nws":
+        ip_lookahead = (_load_weather_rules().get("rules", {})
+                        .get("intelligent_precip", {}).get("qpf_lookahead_hours", 24))
+        qpf_task = asyncio.create_task(_fetch_nws_qpf(lookahead_hours=ip_lookahead))
+
+    try:
+        weather = await get_weather_data()
+    except BaseException:
+        if qpf_task is not None:
+            qpf_task.cancel()
+        raise
     if "error" in weather:
+        if qpf_task is not None:
+            qpf_task.cancel()  # nothing will await it on this path
         _log_weather_event("weather_fetch_error", {
             "error": weather["error"],
             "source": config.weather_source,
@@ -1310,12 +2439,18 @@ async def run_weather_evaluation() -> dict:
         # weather API error can leave schedules disabled indefinitely.
         await _auto_resume_stuck_weather_pause("weather_fetch_error")
         return {"skipped": True, "reason": weather["error"]}
-
-    # Always log weather snapshot so chart has data even if rules evaluation
-    # has issues — this is the primary data source for the Weather Impact chart.
-    # Include the last-known multiplier so the chart line is continuous.
+    _last_weather_fetch_at = time.time()
+    if trigger == "prestart":
+        _prestart_stats["refreshes"] += 1
+
+    # Log a weather snapshot before evaluating so the chart has data even if
+    # rules evaluation has issues — this is the primary data source for the
+    # Weather Impact chart.  Include the last-known multiplier so the chart
+    # line is continuous.  Unchanged readings are skipped (deadbands/heartbeat).
     rules_data = _load_weather_rules()
-    _log_weather_event("weather_snapshot", {
+    previous_fingerprint = _evaluation_fingerprint(rules_data)
+    previous_reasons = _evaluation_fingerprint(rules_data, with_reasons=True)
+    snapshot_logged = _log_weather_snapshot({
         "condition": weather.get("condition"),
         "temperature": weather.get("temperature"),
         "humidity": weather.get("humidity"),
@@ -1328,46 +2463,23 @@ async def run_weather_evaluation() -> dict:
         "uv_index": weather.get("uv_index"),
         "watering_multiplier": rules_data.get("watering_multiplier", 1.0),
         "source": config.weather_source,
-    })
-    rules = rules_data.get("rules", {})
-
-    triggered = []
-    new_adjustments = []
-    multiplier = 1.0
-    should_pause = False
-    pause_reason = ""
-
-    # Rule 1: Rain Detection
-    rule = rules.get("rain_detection", {})
-    if rule.get("enabled"):
-        rain_conditions = {"rainy", "pouring", "lightning-rainy"}
-        if weather["condition"] in rain_conditions:
-            delay_hours = rule.get("resume_delay_hours", 2)
-            should_pause = True
-            pause_reason = f"Currently raining ({weather['condition']})"
-            triggered.append({"rule": "rain_detection", "action": "pause", "reason": pause_reason})
-            new_adjustments.append({
-                "rule": "rain_detection", "action": "pause",
-                "factor": 0,
-                "reason": pause_reason,
-                "applied_at": datetime.now(timezone.utc).isoformat(),
-                "expires_at": (datetime.now(timezone.utc) + timedelta(hours=delay_hours)).isoformat(),
-            })
-
-    # --- Rain Forecast & Precipitation Rules ---
-    rain_mode = rules_data.get("rain_control_mode", "rain_holds")
+        # Inputs the forecast rules and unit-aware thresholds need on replay
+        "temperature_unit": weather.get("temperature_unit") or "°F",
+        "wind_speed_unit": weather.get("wind_speed_unit") or "mph",
+        "forecast": _compact_forecast(weather.get("forecast")),
+    }, rules_data.get("snapshot_logging") or DEFAULT_RULES["snapshot_logging"])
+    plan = _get_rule_plan(rules_data)
 
     # Always fetch QPF when using NWS — it's useful data regardless of mode.
     # The observed precipitation from NWS stations is often null/unreliable;
     # QPF (forecast precipitation) is the real useful number.
-    ip_rules = rules_data.get("rules", {}).get("intelligent_precip", {})
-    ip_lookahead = ip_rules.get("qpf_lookahead_hours", 24)
-    ip_min_run = ip_rules.get("min_run_minutes", 2.0)
-
     config_src = get_config()
     qpf_mm = None
     if config_src.weather_source == "nws":
-        qpf_mm = await _fetch_nws_qpf(lookahead_hours=ip_lookahead)
+        if qpf_task is not None:
+            qpf_mm = await qpf_task
+        else:
+            qpf_mm = await _fetch_nws_qpf(lookahead_hours=plan.qpf_lookahead_hours)
         if qpf_mm is not None:
             rules_data["precip_qpf_inches"] = round(qpf_mm / 25.4, 3)
         else:
@@ -1375,267 +2487,70 @@ async def run_weather_evaluation() -> dict:
     else:
         rules_data["precip_qpf_inches"] = None
 
-    # Apply intelligent precip zone factors only when in that mode and not paused
     # Guard: if management server pushed external factors (OWM) within the last
     # 60 minutes, preserve them — don't overwrite with local calculation.
     _ext_source = rules_data.get("precip_factors_source", "local")
     _ext_pushed = rules_data.get("precip_factors_pushed_at")
-    _use_external_factors = False
+    external_precip = None
     if _ext_source not in ("local", "", None) and _ext_pushed:
         try:
             _pushed_dt = datetime.fromisoformat(_ext_pushed.replace("Z", "+00:00"))
             _age_min = (datetime.now(timezone.utc) - _pushed_dt).total_seconds() / 60.0
             if _age_min < 60:
-                _use_external_factors = True
+                external_precip = {
+                    "factors": rules_data.get("precip_zone_factors", {}),
+                    "qpf_inches": rules_data.get("precip_qpf_inches"),
+                    "pushed_at": _ext_pushed,
+                    "source": _ext_source,
+                }
                 print(f"[WEATHER] Using externally-pushed precip factors ({_ext_source}), "
                       f"{_age_min:.0f}min old — skipping local calculation")
         except (ValueError, TypeError):
             pass
 
-    if _use_external_factors:
-        # Keep existing factors from external push — don't clear them
-        ext_factors = rules_data.get("precip_zone_factors", {})
-        ext_qpf = rules_data.get("precip_qpf_inches")
-        if ext_factors:
-            avg_factor = round(sum(ext_factors.values()) / len(ext_factors), 3)
-            reason = (f"Precipitation Credit (Management): "
-                      f"{ext_qpf:.2f}\" forecast, avg zone factor {avg_factor}")
-            new_adjustments.append({
-                "rule": "intelligent_precip", "action": "reduce",
-                "factor": avg_factor,
-                "reason": reason,
-                "applied_at": _ext_pushed,
-                "source": _ext_source,
-            })
-    else:
-        rules_data["precip_zone_factors"] = {}
+    # Per-zone precipitation credit needs the zone list (cached snapshot) —
+    # computed up front so the rules pass itself stays synchronous
+    precip_factors = None
+    if (external_precip is None and plan.rain_mode == "intelligent_precip"
+            and qpf_mm is not None and qpf_mm > 0):
+        from routes.moisture import get_enabled_zones_snapshot
+        enabled_zones = await get_enabled_zones_snapshot()
+        precip_factors = _calculate_precip_reductions(
+            qpf_mm, enabled_zones, min_run_minutes=plan.min_run_minutes
+        )
+
+    result = evaluate_weather_rules(
+        plan, weather, qpf_mm=qpf_mm, precip_factors=precip_factors,
+        external_precip=external_precip,
+    )
+    triggered = result["triggered"]
+    new_adjustments = result["adjustments"]
+    multiplier = result["multiplier"]
+    should_pause = result["should_pause"]
+    pause_reason = result["pause_reason"]
+
+    if result["precip_zone_factors"] is not None:
+        rules_data["precip_zone_factors"] = result["precip_zone_factors"]
         # Clear external source marker when doing local calculation
         rules_data["precip_factors_source"] = "local"
         rules_data.pop("precip_factors_pushed_at", None)
-
-    if not _use_external_factors and rain_mode == "intelligent_precip" and not should_pause:
-        if qpf_mm is not None and qpf_mm > 0:
-            # We have QPF data — calculate per-zone reductions
-            from routes.moisture import _get_ordered_enabled_zones
-            enabled_zones = await _get_ordered_enabled_zones()
-            precip_factors = _calculate_precip_reductions(
-                qpf_mm, enabled_zones, min_run_minutes=ip_min_run
-            )
-            rain_inches = rules_data["precip_qpf_inches"]
-            rules_data["precip_zone_factors"] = precip_factors
-
-            if precip_factors:
-                avg_factor = round(sum(precip_factors.values()) / len(precip_factors), 3)
-                reason = (f"Intelligent Precip: {rain_inches:.2f}\" expected, "
-                          f"avg zone factor {avg_factor}")
-                triggered.append({
-                    "rule": "intelligent_precip", "action": "reduce",
-                    "reason": reason,
-                })
-                new_adjustments.append({
-                    "rule": "intelligent_precip", "action": "reduce",
-                    "factor": avg_factor,
-                    "reason": reason,
-                    "applied_at": datetime.now(timezone.utc).isoformat(),
-                    "qpf_mm": qpf_mm,
-                    "qpf_inches": rain_inches,
-                    "zone_factors": precip_factors,
-                })
-                print(f"[WEATHER] Intelligent Precip: {rain_inches:.2f}\" QPF, "
-                      f"{len(precip_factors)} zone(s) with factors, avg={avg_factor}")
-            else:
-                # No non-special zones — fall back to rain_holds for this eval
-                print("[WEATHER] Intelligent Precip: no zones returned factors, "
-                      "falling back to rain_holds logic")
-                rain_mode = "rain_holds"
-        elif qpf_mm is None:
-            # QPF unavailable — fall back to rain_holds
+    if result["rule_states"].get("intelligent_precip"):
+        factors = result["precip_zone_factors"]
+        print(f"[WEATHER] Intelligent Precip: {rules_data['precip_qpf_inches']:.2f}\" QPF, "
+              f"{len(factors)} zone(s) with factors")
+    elif plan.rain_mode == "intelligent_precip" and external_precip is None and not should_pause:
+        if qpf_mm is None:
             print("[WEATHER] Intelligent Precip: QPF unavailable, "
                   "falling back to rain_holds")
-            rain_mode = "rain_holds"
-
-    # Rain Holds rules (also used as fallback when intelligent_precip can't get data)
-    if rain_mode == "rain_holds" and not should_pause:
-        # Rule 2: Rain Forecast
-        rule = rules.get("rain_forecast", {})
-        if rule.get("enabled") and not should_pause:
-            forecast = weather.get("forecast", [])
-            prob_threshold = rule.get("probability_threshold", 60)
-            lookahead_hours = rule.get("lookahead_hours", 48)
-            cutoff = datetime.now(timezone.utc) + timedelta(hours=lookahead_hours)
-            for f in forecast:
-                # Filter by lookahead window — only check forecast periods within range
-                fc_dt_str = f.get("datetime") or f.get("start_time") or ""
-                if fc_dt_str:
-                    try:
-                        fc_dt = datetime.fromisoformat(fc_dt_str)
-                        # Ensure timezone-aware for comparison
-                        if fc_dt.tzinfo is None:
-                            fc_dt = fc_dt.replace(tzinfo=timezone.utc)
-                        if fc_dt > cutoff:
-                            continue  # Outside lookahead window — skip this period
-                    except (ValueError, TypeError):
-                        pass  # Can't parse datetime — include it to be safe
-                precip_prob = _safe_float(f.get("precipitation_probability", 0)) or 0
-                if precip_prob >= prob_threshold:
-                    # Include which day the rain is forecast for in the reason
-                    day_label = ""
-                    if fc_dt_str:
-                        try:
-                            fc_dt = datetime.fromisoformat(fc_dt_str)
-                            day_label = f" on {fc_dt.strftime('%A')}"
-                        except (ValueError, TypeError):
-                            pass
-                    reason = f"Rain forecasted ({precip_prob}% probability{day_label})"
-                    should_pause = True
-                    pause_reason = pause_reason or reason
-                    triggered.append({"rule": "rain_forecast", "action": "skip", "reason": reason})
-                    new_adjustments.append({
-                        "rule": "rain_forecast", "action": "skip",
-                        "factor": 0,
-                        "reason": reason,
-                        "applied_at": datetime.now(timezone.utc).isoformat(),
-                    })
-                    break
-
-        # Rule 3: Precipitation Threshold
-        rule = rules.get("precipitation_threshold", {})
-        if rule.get("enabled") and not should_pause:
-            threshold_mm = rule.get("skip_if_rain_above_mm", 6.0)
-            forecast = weather.get("forecast", [])
-            total_precip = sum((_safe_float(f.get("precipitation", 0)) or 0) for f in forecast[:2])
-            if total_precip >= threshold_mm:
-                reason = f"Expected rainfall {total_precip:.1f}mm exceeds {threshold_mm}mm threshold"
-                should_pause = True
-                pause_reason = pause_reason or reason
-                triggered.append({"rule": "precipitation_threshold", "action": "skip", "reason": reason})
-                new_adjustments.append({
-                    "rule": "precipitation_threshold", "action": "skip",
-                    "factor": 0,
-                    "reason": reason,
-                    "applied_at": datetime.now(timezone.utc).isoformat(),
-                })
-
-    # Rule 4: Temperature Freeze
-    rule = rules.get("temperature_freeze", {})
-    if rule.get("enabled") and not should_pause:
-        temp = _safe_float(weather.get("temperature"))
-        temp_unit = weather.get("temperature_unit", "°F")
-        threshold = rule.get("freeze_threshold_c", 2) if "C" in temp_unit else rule.get("freeze_threshold_f", 35)
-        if temp is not None and temp <= threshold:
-            reason = f"Temperature {temp}{temp_unit} at or below freeze threshold ({threshold}{temp_unit})"
-            should_pause = True
-            pause_reason = pause_reason or reason
-            triggered.append({"rule": "temperature_freeze", "action": "skip", "reason": reason})
-            new_adjustments.append({
-                "rule": "temperature_freeze", "action": "skip",
-                "factor": 0,
-                "reason": reason,
-                "applied_at": datetime.now(timezone.utc).isoformat(),
-            })
-
-    # Rule 5: Temperature Cool (reduce watering)
-    rule = rules.get("temperature_cool", {})
-    if rule.get("enabled") and not should_pause:
-        temp = _safe_float(weather.get("temperature"))
-        temp_unit = weather.get("temperature_unit", "°F")
-        threshold = rule.get("cool_threshold_c", 15) if "C" in temp_unit else rule.get("cool_threshold_f", 60)
-        reduction = rule.get("reduction_percent", 25)
-        if temp is not None and temp < threshold:
-            cool_factor = round(1 - reduction / 100, 3)
-            multiplier *= cool_factor
-            reason = f"Cool temperature {temp}{temp_unit}, reducing watering {reduction}%"
-            triggered.append({"rule": "temperature_cool", "action": "reduce", "reason": reason})
-            new_adjustments.append({
-                "rule": "temperature_cool", "action": "reduce",
-                "factor": cool_factor,
-                "reason": reason,
-                "applied_at": datetime.now(timezone.utc).isoformat(),
-            })
-
-    # Rule 6: Temperature Hot (increase watering)
-    rule = rules.get("temperature_hot", {})
-    if rule.get("enabled") and not should_pause:
-        temp = _safe_float(weather.get("temperature"))
-        temp_unit = weather.get("temperature_unit", "°F")
-        threshold = rule.get("hot_threshold_c", 35) if "C" in temp_unit else rule.get("hot_threshold_f", 95)
-        increase = rule.get("increase_percent", 25)
-        if temp is not None and temp > threshold:
-            hot_factor = round(1 + increase / 100, 3)
-            multiplier *= hot_factor
-            reason = f"Hot temperature {temp}{temp_unit}, increasing watering {increase}%"
-            triggered.append({"rule": "temperature_hot", "action": "increase", "reason": reason})
-            new_adjustments.append({
-                "rule": "temperature_hot", "action": "increase",
-                "factor": hot_factor,
-                "reason": reason,
-                "applied_at": datetime.now(timezone.utc).isoformat(),
-            })
-
-    # Rule 7: Wind Speed
-    rule = rules.get("wind_speed", {})
-    if rule.get("enabled") and not should_pause:
-        wind = _safe_float(weather.get("wind_speed"))
-        wind_unit = weather.get("wind_speed_unit", "mph")
-        threshold = rule.get("max_wind_speed_kmh", 32) if "km" in wind_unit.lower() else rule.get("max_wind_speed_mph", 20)
-        if wind is not None and wind > threshold:
-            reason = f"Wind speed {wind} {wind_unit} exceeds {threshold} {wind_unit} threshold"
-            should_pause = True
-            pause_reason = pause_reason or reason
-            triggered.append({"rule": "wind_speed", "action": "skip", "reason": reason})
-            new_adjustments.append({
-                "rule": "wind_speed", "action": "skip",
-                "factor": 0,
-                "reason": reason,
-                "applied_at": datetime.now(timezone.utc).isoformat(),
-            })
-
-    # Rule 8: Humidity (reduce rule — always evaluate, even if a skip rule fired)
-    rule = rules.get("humidity", {})
-    if rule.get("enabled"):
-        humidity = _safe_float(weather.get("humidity"))
-        threshold = rule.get("high_humidity_threshold", 80)
-        reduction = rule.get("reduction_percent", 20)
-        if humidity is not None and humidity > threshold:
-            humidity_factor = round(1 - reduction / 100, 3)
-            multiplier *= humidity_factor
-            reason = f"High humidity {humidity}%, reducing watering {reduction}%"
-            triggered.append({"rule": "humidity", "action": "reduce", "reason": reason})
-            new_adjustments.append({
-                "rule": "humidity", "action": "reduce",
-                "factor": humidity_factor,
-                "reason": reason,
-                "applied_at": datetime.now(timezone.utc).isoformat(),
-            })
-
-    # Rule 9: Seasonal Adjustment
-    rule = rules.get("seasonal_adjustment", {})
-    if rule.get("enabled"):
-        month = str(datetime.now().month)
-        monthly = rule.get("monthly_multipliers", {})
-        season_mult = float(monthly.get(month, 1.0))
-        if season_mult > 0:
-            multiplier *= season_mult
-        else:
-            season_mult = 1.0  # Treat 0 as 1.0 to avoid zeroing out the multiplier
-        reason = f"Seasonal adjustment for month {month}: {season_mult}x"
-        triggered.append({
-            "rule": "seasonal_adjustment", "action": "multiply",
-            "reason": reason,
-        })
-        if abs(season_mult - 1.0) >= 0.005:
-            new_adjustments.append({
-                "rule": "seasonal_adjustment", "action": "multiply",
-                "factor": round(season_mult, 3),
-                "reason": reason,
-                "applied_at": datetime.now(timezone.utc).isoformat(),
-            })
-
-    # --- Apply Actions ---
+        elif qpf_mm > 0:
+            print("[WEATHER] Intelligent Precip: no zones returned factors, "
+                  "falling back to rain_holds logic")
 
-    # If any rule says skip/pause, multiplier is 0 — no watering
-    if should_pause:
-        multiplier = 0.0
+    rule_changes = _rule_state_changes(rules_data.get("rule_states", {}), result["rule_states"])
+    rules_data["rule_states"] = result["rule_states"]
+    for change in rule_changes:
+        print(f"[WEATHER] Rule {change['rule']} "
+              f"{'triggered' if change['triggered'] else 'cleared'}")
 
     from routes.schedule import _load_schedules, _save_schedules
 
@@ -1668,27 +2583,15 @@ async def run_weather_evaluation() -> dict:
             # Mark schedule times that have ALREADY PASSED today as logged
             # so _log_skipped_schedules doesn't retroactively log them.
             try:
-                from routes.moisture import (
-                    _load_schedule_timeline, _parse_time_to_minutes,
-                )
-                tl = _load_schedule_timeline()
                 mark_now = datetime.now()
-                today_str = mark_now.strftime("%Y-%m-%d")
-                now_minutes = mark_now.hour * 60 + mark_now.minute
-                for s in tl.get("schedules", []):
-                    st = s.get("start_time", "")
-                    if not st:
-                        continue
-                    s_mins = s.get("start_minutes")
-                    if s_mins is None:
-                        try:
-                            s_mins = _parse_time_to_minutes(st)
-                        except (ValueError, IndexError):
-                            continue
-                    if s_mins <= now_minutes:
-                        _logged_schedule_skips[f"{today_str} {st}"] = True
-                _save_logged_skips()
-                print(f"[WEATHER] Schedules disabled — marked {len(_logged_schedule_skips)} "
+                calendar = await _get_schedule_calendar(config, mark_now)
+                marked = 0
+                if calendar is not None:
+                    day_start = mark_now.replace(hour=0, minute=0, second=0, microsecond=0)
+                    for occ in calendar.between(day_start, mark_now):
+                        _mark_skip_logged(occ.key)
+                        marked += 1
+                print(f"[WEATHER] Schedules disabled — marked {marked} "
                       f"past schedule time(s) as already logged")
             except Exception as e:
                 print(f"[WEATHER] Error marking past schedule skips: {e}")
@@ -1735,7 +2638,7 @@ async def run_weather_evaluation() -> dict:
             print("[WEATHER] schedule_data saved: weather_schedule_disabled=False, system_paused=False")
 
             # Clear schedule skip tracking so next disable cycle starts fresh
-            _logged_schedule_skips.clear()
+            _clear_logged_skips()
 
             await ha_client.fire_event("flux_irrigation_weather_resume", {
                 "reason": "Weather conditions cleared",
@@ -1748,7 +2651,6 @@ async def run_weather_evaluation() -> dict:
                 "wind_speed": weather.get("wind_speed"),
             })
             # Log to run history so it appears alongside zone events
-            import run_log
             run_log.log_zone_event(
                 entity_id="system",
                 state="weather_resume",
@@ -1757,25 +2659,9 @@ async def run_weather_evaluation() -> dict:
             )
             print("[WEATHER] Schedule re-enabled: weather conditions cleared")
 
-    # Log every weather evaluation so Data Nerd charts have data
-    _log_weather_event("weather_evaluation", {
-        "triggered_rules": [t["rule"] for t in triggered] if triggered else [],
-        "actions": [t["action"] for t in triggered] if triggered else [],
-        "watering_multiplier": round(multiplier, 2),
-        "should_pause": should_pause,
-        "condition": weather.get("condition"),
-        "temperature": weather.get("temperature"),
-        "humidity": weather.get("humidity"),
-        "wind_speed": weather.get("wind_speed"),
-        "precipitation_inches": weather.get("precipitation_inches"),
-        "qpf_inches": weather.get("qpf_inches"),
-        "dew_point": weather.get("dew_point"),
-        "pressure": weather.get("pressure"),
-        "cloud_cover": weather.get("cloud_cover"),
-        "uv_index": weather.get("uv_index"),
-    })
-
-    # Save evaluation results
+    # Save evaluation results — weather_rules.json is only rewritten when
+    # something readers care about changed (or the heartbeat is due);
+    # otherwise the fresh timestamps/readings are held in memory
     rules_data["last_evaluation"] = datetime.now(timezone.utc).isoformat()
     rules_data["last_weather_data"] = {
         "condition": weather.get("condition"),
@@ -1785,7 +2671,43 @@ async def run_weather_evaluation() -> dict:
     }
     rules_data["active_adjustments"] = new_adjustments
     rules_data["watering_multiplier"] = round(multiplier, 2)
-    _save_weather_rules(rules_data)
+    transition = _evaluation_fingerprint(rules_data) != previous_fingerprint
+
+    # Log the evaluation for the Data Nerd charts whenever its inputs were
+    # logged or its outcome changed
+    if snapshot_logged or transition or rule_changes:
+        _log_weather_event("weather_evaluation", {
+            "triggered_rules": [t["rule"] for t in triggered] if triggered else [],
+            "rule_changes": rule_changes,
+            "actions": [t["action"] for t in triggered] if triggered else [],
+            "watering_multiplier": round(multiplier, 2),
+            "should_pause": should_pause,
+            "condition": weather.get("condition"),
+            "temperature": weather.get("temperature"),
+            "humidity": weather.get("humidity"),
+            "wind_speed": weather.get("wind_speed"),
+            "precipitation_inches": weather.get("precipitation_inches"),
+            "qpf_inches": weather.get("qpf_inches"),
+            "dew_point": weather.get("dew_point"),
+            "pressure": weather.get("pressure"),
+            "cloud_cover": weather.get("cloud_cover"),
+            "uv_index": weather.get("uv_index"),
+        })
+
+    if transition or time.time() - _weather_rules_saved_at >= _RULES_SAVE_HEARTBEAT:
+        _save_weather_rules(rules_data)
+    else:
+        if _evaluation_fingerprint(rules_data, with_reasons=True) != previous_reasons:
+            # Only the wording moved (e.g. rain_forecast probability) — let
+            # cached readers (moisture rain context) pick it up
+            _weather_rules_version += 1
+        _unsaved_evaluation.clear()
+        _unsaved_evaluation.update({
+            key: rules_data.get(key) for key in (
+                "last_evaluation", "last_weather_data", "active_adjustments",
+                "watering_multiplier", "precip_qpf_inches", "rule_states",
+            )
+        })
 
     # Re-apply duration adjustments if apply_factors_to_schedule is on
     try:
@@ -1816,6 +2738,7 @@ async def run_weather_evaluation() -> dict:
     return {
         "evaluated": True,
         "triggered_rules": triggered,
+        "rule_changes": rule_changes,
         "should_pause": should_pause,
         "pause_reason": pause_reason if should_pause else None,
         "watering_multiplier": round(multiplier, 2),
@@ -1886,7 +2809,24 @@ async def update_weather_rules(body: dict, request: Request):
     # Accept rain_control_mode at top level
     if "rain_control_mode" in body:
         data["rain_control_mode"] = body["rain_control_mode"]
+    old_logging = data.get("snapshot_logging")
+    if "snapshot_logging" in body:
+        data["snapshot_logging"] = _merge_snapshot_logging(old_logging, body["snapshot_logging"])
+    old_prestart = data.get("prestart_refresh")
+    if "prestart_refresh" in body:
+        data["prestart_refresh"] = _merge_prestart_refresh(old_prestart, body["prestart_refresh"])
     _save_weather_rules(data)
+    compile_weather_rules(data)
+
+    if data.get("snapshot_logging") != old_logging:
+        log_change(get_actor(request), "Weather Rules",
+                   f"Snapshot logging: heartbeat {data['snapshot_logging'].get('heartbeat_minutes')} min, "
+                   f"deadbands {data['snapshot_logging'].get('deadbands')}")
+    if data.get("prestart_refresh") != old_prestart:
+        prestart = data["prestart_refresh"]
+        log_change(get_actor(request), "Weather Rules",
+                   f"Pre-start refresh: {'Enabled' if prestart.get('enabled', True) else 'Disabled'}, "
+                   f"lead {prestart.get('lead_minutes')} min, max age {prestart.get('max_age_minutes')} min")
 
     # Log rain control mode change
     new_mode = data.get("rain_control_mode", "rain_holds")
@@ -2051,6 +2991,457 @@ async def evaluate_weather_now():
     return result
 
 
+# --- Weather Replay / Backtest ---
+
+def _snapshot_time(snap: dict) -> datetime | None:
+    """Aware datetime of a weather snapshot's timestamp, or None."""
+    ts = snap.get("timestamp")
+    if not ts:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(ts).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def _replay_plan(plan: WeatherRulePlan, snapshots: list, enabled_zones: list | None = None):
+    """Evaluate a compiled plan over snapshots in order (oldest first).
+
+    Yields (snapshot, evaluation, rule_changes) for each snapshot.  Pass
+    enabled_zones to compute per-zone precipitation credit in
+    intelligent_precip mode; factors are reused for repeated QPF values.
+
+    Pause state carries forward: once rain_detection fires, later snapshots
+    stay paused until its resume_delay_hours have passed since the last
+    rain.  The evaluation's "hold_until" is the end of that hold (or None).
+    """
+    precip_memo: dict = {}
+    prev_states: dict = {}
+    hold_until = None
+    delay = timedelta(hours=(plan.rules.get("rain_detection") or {}).get("resume_delay_hours", 2))
+    for snap in snapshots:
+        qpf_in = _safe_float(snap.get("qpf_inches"))
+        qpf_mm = qpf_in * 25.4 if qpf_in is not None else None
+        precip_factors = None
+        if enabled_zones is not None and qpf_mm:
+            precip_factors = precip_memo.get(qpf_mm)
+            if precip_factors is None:
+                precip_factors = precip_memo[qpf_mm] = _calculate_precip_reductions(
+                    qpf_mm, enabled_zones, min_run_minutes=plan.min_run_minutes
+                )
+        snap_time = _snapshot_time(snap)
+        result = evaluate_weather_rules(plan, snap, now=snap_time, qpf_mm=qpf_mm,
+                                        precip_factors=precip_factors)
+        if snap_time is not None:
+            if result["rule_states"].get("rain_detection"):
+                hold_until = snap_time + delay
+            elif hold_until is not None and snap_time < hold_until and not result["should_pause"]:
+                result["should_pause"] = True
+                result["multiplier"] = 0.0
+                result["pause_reason"] = f"Rain delay: holding until {hold_until.isoformat()}"
+            if hold_until is not None and snap_time >= hold_until:
+                hold_until = None
+        result["hold_until"] = hold_until
+        yield snap, result, _rule_state_changes(prev_states, result["rule_states"])
+        prev_states = result["rule_states"]
+
+
+_FORECAST_RULES = ("rain_forecast", "precipitation_threshold")
+
+
+def _unevaluable_rules(plan: WeatherRulePlan, snapshots: list) -> dict:
+    """Enabled rules the snapshots lack inputs for: {rule: explanation}.
+
+    Snapshots logged before forecasts were recorded carry none, so the
+    forecast rules cannot fire for them and pauses/savings are understated.
+    """
+    enabled = [step.name for step in plan.steps if step.name in _FORECAST_RULES]
+    if not enabled:
+        return {}
+    with_forecast = sum(1 for snap in snapshots if snap.get("forecast"))
+    if with_forecast == len(snapshots):
+        return {}
+    note = (f"no forecast in {len(snapshots) - with_forecast} of {len(snapshots)} "
+            f"snapshots — rule cannot fire for them")
+    return {name: note for name in enabled}
+
+
+def _schedule_opportunities(start: datetime, end: datetime, start_minutes: list,
+                            weekdays: set | None) -> list[datetime]:
+    """Scheduled start times (aware, local) between start and end."""
+    local_tz = datetime.now().astimezone().tzinfo
+    day = start.astimezone(local_tz).date()
+    last_day = end.astimezone(local_tz).date()
+    times = []
+    while day <= last_day:
+        if weekdays is None or day.weekday() in weekdays:
+            for mins in sorted(start_minutes):
+                dt = datetime(day.year, day.month, day.day, int(mins) // 60, int(mins) % 60,
+                              tzinfo=local_tz)
+                if start <= dt <= end:
+                    times.append(dt)
+        day += timedelta(days=1)
+    return times
+
+
+def _moisture_history(events: list) -> dict:
+    """{zone_entity_id: ([timestamps], [(multiplier, skip)])} from run history, oldest first."""
+    history: dict[str, tuple[list, list]] = {}
+    for e in sorted(events, key=lambda ev: ev.get("timestamp", "")):
+        mo = e.get("moisture") or {}
+        if mo.get("moisture_multiplier") is None:
+            continue
+        ts = _snapshot_time(e)
+        if ts is None:
+            continue
+        times, values = history.setdefault(e.get("entity_id", ""), ([], []))
+        times.append(ts)
+        values.append((float(mo["moisture_multiplier"]), bool(mo.get("skip"))))
+    return history
+
+
+def backtest_weather_rules(plans: dict, snapshots: list, opportunities: list,
+                           zones: list, moisture_history: dict | None = None,
+                           enabled_zones: list | None = None,
+                           include_runs: bool = False) -> dict:
+    """Replay candidate rule plans over logged weather and estimate water use.
+
+    Each scheduled start in ``opportunities`` uses the newest snapshot at or
+    before it (the multiplier that was in effect).  Zone minutes follow
+    apply_adjusted_durations(): base × weather × moisture × precip credit,
+    at least one minute, and nothing when paused or moisture-skipped.
+
+    Args:
+        plans: {candidate name: WeatherRulePlan}
+        snapshots: weather_snapshot entries, oldest first
+        opportunities: aware datetimes of scheduled starts, oldest first
+        zones: [{"zone_entity_id", "base_minutes", "gpm"}]
+        moisture_history: from _moisture_history(); the last logged zone
+            multiplier within 24 h before a start is used, else 1.0x
+        enabled_zones: zone list for intelligent_precip credit
+    """
+    timed = [(t, snap) for snap in snapshots if (t := _snapshot_time(snap)) is not None]
+    snap_times = [t for t, _ in timed]
+    moisture_history = moisture_history or {}
+    moisture_window = timedelta(hours=24)
+
+    # Moisture and water-use inputs do not depend on the rules — resolve once
+    slots = []
+    for start in opportunities:
+        pos = bisect.bisect_right(snap_times, start) - 1
+        zone_moisture = {}
+        for z in zones:
+            times, values = moisture_history.get(z["zone_entity_id"], ((), ()))
+            mpos = bisect.bisect_right(times, start) - 1
+            if mpos >= 0 and start - times[mpos] <= moisture_window:
+                zone_moisture[z["zone_entity_id"]] = values[mpos]
+        slots.append((start, pos, zone_moisture))
+
+    unadjusted_minutes = sum(z["base_minutes"] for z in zones) * len(opportunities)
+    unadjusted_gallons = sum(z["base_minutes"] * z["gpm"] for z in zones) * len(opportunities)
+
+    candidates = {}
+    for name, plan in plans.items():
+        evaluations = [result for _, result, _ in _replay_plan(plan, [s for _, s in timed], enabled_zones)]
+        pause_snapshots = sum(1 for r in evaluations if r["should_pause"])
+        runs = []
+        total_minutes = total_gallons = 0.0
+        paused_runs = skipped_zones = no_data = 0
+        for start, pos, zone_moisture in slots:
+            if pos < 0:
+                no_data += 1
+                continue
+            result = evaluations[pos]
+            # A rain delay that began at/before the snapshot may still hold at the start
+            held = result["hold_until"] is not None and start < result["hold_until"]
+            paused = result["should_pause"] or held
+            weather_mult = 0.0 if paused else result["multiplier"]
+            precip = result.get("precip_zone_factors") or {}
+            run_minutes = run_gallons = 0.0
+            if paused:
+                paused_runs += 1
+            else:
+                for z in zones:
+                    eid = z["zone_entity_id"]
+                    moisture_mult, skip = zone_moisture.get(eid, (1.0, False))
+                    combined = weather_mult * moisture_mult * precip.get(eid, 1.0)
+                    if skip or combined <= 0:
+                        skipped_zones += 1
+                        continue
+                    minutes = float(max(1, round(z["base_minutes"] * combined)))
+                    run_minutes += minutes
+                    run_gallons += minutes * z["gpm"]
+            total_minutes += run_minutes
+            total_gallons += run_gallons
+            if include_runs:
+                runs.append({
+                    "start": start.isoformat(),
+                    "weather_timestamp": snap_times[pos].isoformat(),
+                    "watering_multiplier": round(weather_mult, 2),
+                    "paused": paused,
+                    "triggered_rules": [t["rule"] for t in result["triggered"]],
+                    "minutes": round(run_minutes, 1),
+                    "gallons": round(run_gallons, 1),
+                })
+        count = len(evaluations)
+        unevaluable = _unevaluable_rules(plan, [s for _, s in timed])
+        candidates[name] = {
+            "rain_control_mode": plan.rain_mode,
+            "rules_evaluated": [step.name for step in plan.steps if step.name not in unevaluable],
+            "rules_not_evaluable": unevaluable,
+            "avg_multiplier": (round(sum(r["multiplier"] for r in evaluations) / count, 3)
+                               if count else None),
+            "paused_snapshots": pause_snapshots,
+            "scheduled_runs": len(slots) - no_data,
+            "paused_runs": paused_runs,
+            "skipped_zone_runs": skipped_zones,
+            "total_minutes": round(total_minutes, 1),
+            "estimated_gallons": round(total_gallons, 1),
+            "savings_pct": (round(100 * (1 - total_minutes / unadjusted_minutes), 1)
+                            if unadjusted_minutes else None),
+        }
+        if include_runs:
+            candidates[name]["runs"] = runs
+
+    return {
+        "snapshot_count": len(timed),
+        "scheduled_starts": len(opportunities),
+        "starts_without_weather": sum(1 for _, pos, _ in slots if pos < 0),
+        "unadjusted": {
+            "total_minutes": round(unadjusted_minutes, 1),
+            "estimated_gallons": round(unadjusted_gallons, 1),
+        },
+        "candidates": candidates,
+    }
+
+
+_MAX_HISTORY_HOURS = 8760
+
+
+def _history_hours(value, default: int) -> int:
+    """A request's "hours" window, clamped to 1.._MAX_HISTORY_HOURS.
+
+    Missing/null uses ``default``; anything non-numeric raises HTTPException(400).
+    """
+    if value is None:
+        return default
+    number = None if isinstance(value, bool) else _safe_float(value)
+    if number is None or not math.isfinite(number):
+        raise HTTPException(status_code=400, detail="hours must be a number")
+    return max(1, min(int(number), _MAX_HISTORY_HOURS))
+
+
+@router.post("/weather/what-if", summary="Dry-run weather rules against weather snapshots")
+async def weather_what_if(body: dict = None):
+    """Evaluate the saved (or proposed) rules against weather snapshots.
+
+    Nothing is saved and no schedules are touched.  Body (all optional):
+        rules, rain_control_mode: proposed configuration to try instead of
+            the saved one
+        snapshots: weather dicts (same fields as /weather/current, plus an
+            optional "timestamp"); defaults to the logged weather_snapshot
+            entries from the last ``hours`` hours
+        hours: history window when no snapshots are given (default 24,
+            max 8760)
+
+    Snapshots logged before forecasts were recorded carry none; forecast
+    rules that cannot fire for them are listed in "rules_not_evaluable".
+    A rain_detection hit keeps later snapshots paused for its resume delay.
+    """
+    body = body or {}
+    rules_data = _load_weather_rules()
+    proposed = {
+        "rules": body.get("rules", rules_data.get("rules", {})),
+        "rain_control_mode": body.get("rain_control_mode",
+                                      rules_data.get("rain_control_mode", "rain_holds")),
+    }
+    try:
+        plan = _build_rule_plan(proposed)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid rules: {e}")
+
+    snapshots = body.get("snapshots")
+    if snapshots is None:
+        hours = _history_hours(body.get("hours"), 24)
+        logged = await asyncio.to_thread(get_weather_log, limit=100000, hours=hours)
+        snapshots = [e for e in logged if e.get("event") == "weather_snapshot"]
+    if not isinstance(snapshots, list):
+        raise HTTPException(status_code=400, detail="snapshots must be a list")
+    snapshots = snapshots[-5000:]
+
+    enabled_zones = None
+    if plan.rain_mode == "intelligent_precip":
+        from routes.moisture import get_enabled_zones_snapshot
+        enabled_zones = await get_enabled_zones_snapshot()
+
+    results = []
+    rule_counts: dict[str, int] = {}
+    for snap, result, changes in _replay_plan(plan, snapshots, enabled_zones):
+        for t in result["triggered"]:
+            rule_counts[t["rule"]] = rule_counts.get(t["rule"], 0) + 1
+        results.append({
+            "timestamp": snap.get("timestamp"),
+            "watering_multiplier": round(result["multiplier"], 2),
+            "logged_multiplier": snap.get("watering_multiplier"),
+            "should_pause": result["should_pause"],
+            "pause_reason": result["pause_reason"] or None,
+            "triggered_rules": [t["rule"] for t in result["triggered"]],
+            "rule_changes": changes,
+        })
+
+    count = len(results)
+    unevaluable = _unevaluable_rules(plan, snapshots)
+    return {
+        "rain_control_mode": plan.rain_mode,
+        "rules_evaluated": [step.name for step in plan.steps if step.name not in unevaluable],
+        "rules_not_evaluable": unevaluable,
+        "snapshot_count": count,
+        "summary": {
+            "paused": sum(1 for r in results if r["should_pause"]),
+            "avg_multiplier": (round(sum(r["watering_multiplier"] for r in results) / count, 3)
+                               if count else None),
+            "rule_trigger_counts": rule_counts,
+        },
+        "results": results,
+    }
+
+
+@router.post("/weather/backtest", summary="Backtest rule sets against the weather log")
+async def weather_backtest(body: dict = None):
+    """Replay logged weather through candidate rule sets and compare water use.
+
+    The saved rules are always included as "current".  Body (all optional):
+        candidates: [{name, rules, rain_control_mode}] — missing fields
+            fall back to the saved configuration
+        hours: history window (default 720, max 8760)
+        start_times: ["HH:MM", ...] scheduled starts; default is the
+            controller's current start times
+        days: ["monday", ...] watering days; default is the controller's
+            schedule day switches (every day if none are found)
+        use_moisture: apply logged per-zone moisture multipliers (default true)
+        include_runs: return every simulated start (default false)
+
+    Zone minutes use the captured base durations and water use uses
+    the nozzle GPM, so only zones with nozzle data contribute gallons.
+    Rain detection holds starts for its resume delay; forecast rules the
+    logged snapshots cannot drive are listed in "rules_not_evaluable".
+    """
+    body = body or {}
+    rules_data = _load_weather_rules()
+    saved = {
+        "rules": rules_data.get("rules", {}),
+        "rain_control_mode": rules_data.get("rain_control_mode", "rain_holds"),
+    }
+    plans = {"current": _get_rule_plan(rules_data)}
+    candidates = body.get("candidates") or []
+    if not isinstance(candidates, list):
+        raise HTTPException(status_code=400, detail="candidates must be a list")
+    for i, cand in enumerate(candidates):
+        name = str(cand.get("name") or f"candidate_{i + 1}")
+        if name in plans:
+            raise HTTPException(status_code=400, detail=f"Duplicate candidate name: {name}")
+        try:
+            plans[name] = _build_rule_plan({
+                "rules": cand.get("rules", saved["rules"]),
+                "rain_control_mode": cand.get("rain_control_mode", saved["rain_control_mode"]),
+            })
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Invalid rules for {name}: {e}")
+
+    hours = _history_hours(body.get("hours"), 720)
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(hours=hours)
+
+    from routes.moisture import (
+        get_enabled_zones_snapshot, _get_schedule_entity_states,
+        _minutes_to_hhmm, _parse_time_to_minutes, _read_data,
+    )
+    import run_log
+    import schedule_control
+    import zone_nozzle_data
+
+    # Scheduled start times and watering days
+    config = get_config()
+    try:
+        if body.get("start_times"):
+            start_minutes = [_parse_time_to_minutes(t) for t in body["start_times"]]
+        else:
+            start_eids = [eid for eid in config.allowed_control_entities
+                          if eid.startswith("text.") and "start_time" in eid.lower()]
+            start_minutes = []
+            for st in await _get_schedule_entity_states(start_eids):
+                val = st.get("state", "")
+                if val and val not in ("unknown", "unavailable"):
+                    start_minutes.append(_parse_time_to_minutes(val))
+    except (ValueError, IndexError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid start time: {e}")
+
+    day_names = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+    weekdays = None
+    if body.get("days"):
+        weekdays = {day_names.index(d.lower()) for d in body["days"] if d.lower() in day_names}
+    else:
+        day_eids = [eid for eid in config.allowed_control_entities
+                    if eid.startswith("switch.") and "schedule" in eid.lower()
+                    and schedule_control._DAY_PATTERN.search(eid)]
+        if day_eids:
+            weekdays = set()
+            for st in await _get_schedule_entity_states(day_eids):
+                m = schedule_control._DAY_PATTERN.search(st.get("entity_id", ""))
+                if m and st.get("state") == "on":
+                    weekdays.add(day_names.index(m.group(1).lower()))
+
+    # Zones at their base (unadjusted) durations, with nozzle GPM
+    enabled_zones = await get_enabled_zones_snapshot()
+    base_durations = _read_data().get("base_durations", {})
+    all_heads = zone_nozzle_data.get_all_zones_heads()
+    zones = []
+    for z in enabled_zones:
+        if z.get("is_special"):
+            continue
+        base = base_durations.get(z.get("duration_entity_id", ""), {}).get("base_value")
+        zones.append({
+            "zone_entity_id": z["zone_entity_id"],
+            "base_minutes": float(base if base is not None else z.get("duration_minutes", 0.0)),
+            "gpm": float((all_heads.get(z["zone_entity_id"]) or {}).get("total_gpm", 0) or 0),
+        })
+
+    use_moisture = body.get("use_moisture", True)
+    uses_precip = any(p.rain_mode == "intelligent_precip" for p in plans.values())
+
+    def run_backtest():
+        # Log/history reads and the replay are blocking — keep them off the event loop
+        snapshots = [e for e in get_weather_log(limit=1_000_000, hours=hours)
+                     if e.get("event") == "weather_snapshot"]
+        moisture_history = None
+        if use_moisture:
+            moisture_history = _moisture_history(
+                run_log.get_run_history(hours=hours + 24, limit=1_000_000))
+        return backtest_weather_rules(
+            plans, snapshots,
+            _schedule_opportunities(start, end, start_minutes, weekdays),
+            zones, moisture_history,
+            enabled_zones=enabled_zones if uses_precip else None,
+            include_runs=bool(body.get("include_runs")),
+        )
+
+    started = time.monotonic()
+    result = await asyncio.to_thread(run_backtest)
+    elapsed = time.monotonic() - started
+    print(f"[WEATHER] Backtest: {len(plans)} rule set(s) over {result['snapshot_count']} "
+          f"snapshots / {result['scheduled_starts']} starts in {elapsed:.2f}s")
+    return {
+        "period_start": start.isoformat(),
+        "period_end": end.isoformat(),
+        "start_times": [_minutes_to_hhmm(m) for m in sorted(start_minutes)],
+        "days": [day_names[d] for d in sorted(weekdays)] if weekdays is not None else day_names,
+        "zones": zones,
+        "elapsed_seconds": round(elapsed, 3),
+        **result,
+    }
+
+
 @router.put("/weather/precip-factors", summary="Receive externally-pushed precipitation factors")
 async def receive_precip_factors(request: Request):
     """Accept precip zone factors pushed from management server (OWM).
@@ -2125,6 +3516,7 @@ async def clear_weather_log():
     try:
         if os.path.exists(WEATHER_LOG_FILE):
             os.remove(WEATHER_LOG_FILE)
+        clear_weather_index()
         return {"success": True, "message": "Weather log cleared"}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -14,9 +14,12 @@ Each entry includes weather conditions at the time of the event.
 import json
 import os
 import re
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import broker_metrics
+
 RUN_LOG_FILE = "/data/run_history.jsonl"
 
 _ZONE_NUM_RE = re.compile(r'zone[_]?(\d+)', re.IGNORECASE)
@@ -68,19 +71,55 @@ def _consume_pre_announced_source(entity_id: str) -> Optional[str]:
 # state_changed event should be ignored.
 _remote_mirror_guard: set = set()  # entity_ids currently being mirrored
 
-# Cached entity maps (rebuilt when config changes)
-_remote_maps_cache: dict = {}  # {"r2c": {}, "c2r": {}, "remote_all": set(), "controller_status": set()}
-_remote_maps_logged: bool = False
-
-# Per-device entity maps for multi-remote support (max 5 remotes)
-_remote_maps_by_device: dict = {}  # device_id -> maps dict
-_remote_maps_logged_by_device: dict = {}  # device_id -> bool
-
 # Per-device sync/reconnect state
 _remote_reconnect_pending_by_device: dict = {}  # device_id -> bool
 _reconnect_sync_running_by_device: dict = {}  # device_id -> bool
-_sync_needed_by_device: dict = {}  # device_id -> entity_id or "" (searched, not found) or None (not searched)
-_manual_stop_by_device: dict = {}  # device_id -> entity_id or "" or None
+
+# Time-to-unblock tracking — how long each remote had remote→controller
+# mirroring blocked by a startup/reconnect sync (reported in broker status)
+_remote_blocked_since_by_device: dict = {}  # device_id -> (time.monotonic() when blocked, reason)
+_remote_unblock_stats_by_device: dict = {}  # device_id -> {"seconds", "unblocked_at", "reason"}
+
+# Per-device sync pipeline rate limit: pause after every N writes to one remote
+_SYNC_WRITE_BATCH = 10
+_SYNC_BATCH_PAUSE_S = 0.1
+
+# Last-known state of every broker entity (remote + mirrored controller),
+# fed by the WebSocket event stream and by sync reads.  Reconnect syncs diff
+# against this table instead of re-reading everything from HA.  Cleared when
+# the WebSocket drops, since events may have been missed while disconnected.
+_broker_state_cache: dict[str, str] = {}  # entity_id -> state
+
+
+def clear_broker_state_cache():
+    """Forget all last-known broker entity states (next sync reads from HA)."""
+    _broker_state_cache.clear()
+
+
+def _block_remote_device(device_id: str, reason: str = ""):
+    """Block remote→controller mirroring for one device until its sync completes."""
+    import time
+    _remote_reconnect_pending_by_device[device_id] = True
+    if device_id not in _remote_blocked_since_by_device:
+        _remote_blocked_since_by_device[device_id] = (time.monotonic(), reason)
+
+
+def _unblock_remote_device(device_id: str):
+    """Re-enable mirroring for one device and record how long it was blocked."""
+    import time
+    _remote_reconnect_pending_by_device[device_id] = False
+    blocked = _remote_blocked_since_by_device.pop(device_id, None)
+    if blocked is None:
+        return
+    since, reason = blocked
+    elapsed = round(time.monotonic() - since, 2)
+    _remote_unblock_stats_by_device[device_id] = {
+        "seconds": elapsed,
+        "unblocked_at": datetime.now(timezone.utc).isoformat(),
+        "reason": reason,
+    }
+    _remote_log(f"Broker: remote {device_id[:12]} unblocked after {elapsed:.1f}s"
+                f"{f' ({reason})' if reason else ''}")
 
 # Cached set of zone numbers that are pump/relay/master valve.
 # Populated by update_special_zone_nums() (called from sync_remote_settings).
@@ -98,6 +137,7 @@ def update_special_zone_nums(zone_nums: set[int]):
     if zone_nums != _special_zone_nums:
         _remote_log(f"Broker: special zone numbers updated: {_special_zone_nums} -> {zone_nums}")
         _special_zone_nums = zone_nums
+        invalidate_remote_maps()  # topology filters on these zones
 
 
 def get_special_zone_nums() -> set[int]:
@@ -117,9 +157,6 @@ def _filter_special_zone_entities(entity_ids: set[str]) -> set[str]:
             if not (_extract_zone_number(eid) and _extract_zone_number(eid) in _special_zone_nums)}
 
 
-# Reverse lookup: entity_id -> device_id (for fast routing in WebSocket handler)
-_entity_to_device_cache: dict = {}  # entity_id -> device_id
-
 # Suffix aliases — different firmware names that refer to the same function.
 # Both sides are normalized to the canonical (value) name.
 _SUFFIX_ALIASES = {
@@ -242,6 +279,8 @@ def log_zone_event(
     zone_name: str = "",
     duration_seconds: Optional[float] = None,
     scheduled_minutes: Optional[float] = None,
+    timestamp: Optional[datetime] = None,
+    backfilled: bool = False,
 ):
     """Log a zone on/off event with current weather context.
 
@@ -255,8 +294,13 @@ def log_zone_event(
         scheduled_minutes: The zone's scheduled run duration in minutes.
                           Used as fallback for water savings when base_durations
                           is not available (apply_factors_to_schedule disabled).
+        timestamp: When the event actually happened (UTC).  Defaults to now;
+                   set when backfilling events missed while disconnected.
+        backfilled: The event was recovered after the fact.  It is marked
+                    "backfilled" and gets no weather/moisture context, since
+                    the current conditions are not the ones it ran under.
     """
-    now = datetime.now(timezone.utc)
+    now = timestamp or datetime.now(timezone.utc)
     entry = {
         "timestamp": now.isoformat(),
         "entity_id": entity_id,
@@ -266,84 +310,81 @@ def log_zone_event(
         "duration_seconds": duration_seconds,
     }
 
-    # Capture weather context at this moment
-    try:
-        from routes.weather import _get_current_weather_snapshot
-        wx = _get_current_weather_snapshot()
-        if wx and wx.get("condition"):
-            entry["weather"] = {
-                "condition": wx.get("condition", ""),
-                "temperature": wx.get("temperature"),
-                "humidity": wx.get("humidity"),
-                "wind_speed": wx.get("wind_speed"),
-                "watering_multiplier": wx.get("watering_multiplier", 1.0),
-                "active_adjustments": [
-                    a.get("rule", "") for a in wx.get("active_adjustments", [])
-                ],
-            }
-    except Exception:
-        pass
+    if backfilled:
+        entry["backfilled"] = True
+    else:
+        # Capture weather context at this moment
+        try:
+            from routes.weather import _get_current_weather_snapshot
+            wx = _get_current_weather_snapshot()
+            if wx and wx.get("condition"):
+                entry["weather"] = {
+                    "condition": wx.get("condition", ""),
+                    "temperature": wx.get("temperature"),
+                    "humidity": wx.get("humidity"),
+                    "wind_speed": wx.get("wind_speed"),
+                    "watering_multiplier": wx.get("watering_multiplier", 1.0),
+                    "active_adjustments": [
+                        a.get("rule", "") for a in wx.get("active_adjustments", [])
+                    ],
+                }
+        except Exception:
+            pass
 
-    # Capture moisture context at this moment
-    try:
-        from routes.moisture import (
-            _load_data as _load_moisture_data,
-            calculate_zone_moisture_multiplier,
-            get_cached_sensor_states,
-        )
-        moisture_data = _load_moisture_data()
-        if moisture_data.get("enabled") and moisture_data.get("probes") and entity_id != "system":
-            # Check if this zone has any mapped probes (sync-safe check)
-            has_probes = any(
-                entity_id in probe.get("zone_mappings", [])
-                for probe in moisture_data.get("probes", {}).values()
+        # Capture moisture context at this moment
+        try:
+            from routes.moisture import (
+                _read_data as _read_moisture_data,
+                _get_zone_index,
+                _duration_entity_for_zone,
+                get_memoized_zone_multipliers,
             )
-            if has_probes:
-                entry["moisture"] = {
-                    "enabled": True,
-                    "has_probes": True,
-                    "last_evaluation": moisture_data.get("last_evaluation"),
-                    "duration_adjustment_active": moisture_data.get("duration_adjustment_active", False),
-                }
-                # Compute moisture multiplier live from cached sensor data
-                # (adjusted_durations may be empty/stale — this is always fresh)
-                sensor_states = get_cached_sensor_states(moisture_data.get("probes", {}))
-                zone_result = calculate_zone_moisture_multiplier(
-                    entity_id, moisture_data, sensor_states,
-                )
-                moisture_mult = zone_result.get("multiplier")
-                if moisture_mult is not None:
-                    entry["moisture"]["moisture_multiplier"] = round(moisture_mult, 3)
-                    entry["moisture"]["profile"] = zone_result.get("profile", "")
-                    entry["moisture"]["reason"] = zone_result.get("reason", "")
-                    entry["moisture"]["skip"] = zone_result.get("skip", False)
-                    # Capture sensor readings (T/M/B) from probe details
-                    for detail in zone_result.get("probe_details", []):
-                        readings = detail.get("depth_readings", {})
-                        if readings:
-                            sr = {}
-                            if "shallow" in readings:
-                                sr["T"] = round(readings["shallow"].get("value", 0), 1)
-                            if "mid" in readings:
-                                sr["M"] = round(readings["mid"].get("value", 0), 1)
-                            if "deep" in readings:
-                                sr["B"] = round(readings["deep"].get("value", 0), 1)
-                            if sr:
-                                entry["moisture"]["sensor_readings"] = sr
-                            break  # Use first probe's readings
-                # Also include adjusted duration info if available
-                adjusted = moisture_data.get("adjusted_durations", {})
-                for dur_eid, adj in adjusted.items():
-                    zone_suffix = entity_id.split(".", 1)[1] if "." in entity_id else entity_id
-                    if zone_suffix in dur_eid:
+            moisture_data = _read_moisture_data()
+            if moisture_data.get("enabled") and moisture_data.get("probes") and entity_id != "system":
+                # Check if this zone has any mapped probes (sync-safe check)
+                has_probes = entity_id in _get_zone_index().zone_to_probes
+                if has_probes:
+                    entry["moisture"] = {
+                        "enabled": True,
+                        "has_probes": True,
+                        "last_evaluation": moisture_data.get("last_evaluation"),
+                        "duration_adjustment_active": moisture_data.get("duration_adjustment_active", False),
+                    }
+                    # Compute moisture multiplier live from cached sensor data
+                    # (adjusted_durations may be empty/stale — this is always fresh)
+                    zone_result = get_memoized_zone_multipliers([entity_id])[entity_id]
+                    moisture_mult = zone_result.get("multiplier")
+                    if moisture_mult is not None:
+                        entry["moisture"]["moisture_multiplier"] = round(moisture_mult, 3)
+                        entry["moisture"]["profile"] = zone_result.get("profile", "")
+                        entry["moisture"]["reason"] = zone_result.get("reason", "")
+                        entry["moisture"]["skip"] = zone_result.get("skip", False)
+                        # Capture sensor readings (T/M/B) from probe details
+                        for detail in zone_result.get("probe_details", []):
+                            readings = detail.get("depth_readings", {})
+                            if readings:
+                                sr = {}
+                                if "shallow" in readings:
+                                    sr["T"] = round(readings["shallow"].get("value", 0), 1)
+                                if "mid" in readings:
+                                    sr["M"] = round(readings["mid"].get("value", 0), 1)
+                                if "deep" in readings:
+                                    sr["B"] = round(readings["deep"].get("value", 0), 1)
+                                if sr:
+                                    entry["moisture"]["sensor_readings"] = sr
+                                break  # Use first probe's readings
+                    # Also include adjusted duration info if available
+                    adjusted = moisture_data.get("adjusted_durations", {})
+                    dur_eid = _duration_entity_for_zone(entity_id, adjusted)
+                    if dur_eid:
+                        adj = adjusted[dur_eid]
                         entry["moisture"]["combined_multiplier"] = adj.get("combined_multiplier")
                         entry["moisture"]["original_duration"] = adj.get("original")
                         entry["moisture"]["adjusted_duration"] = adj.get("adjusted")
-                        break
-    except Exception as e:
-        print(f"[RUN_LOG] Moisture context capture error: {e}")
-        import traceback
-        traceback.print_exc()
+        except Exception as e:
+            print(f"[RUN_LOG] Moisture context capture error: {e}")
+            import traceback
+            traceback.print_exc()
 
     # Track start times for duration calculation
     if state in ("on", "open"):
@@ -382,20 +423,21 @@ def log_zone_event(
             and (is_skip or (actual_dur and actual_dur > 0))
             and source in SAVINGS_SOURCES):
         try:
-            from routes.moisture import _load_data as _load_moisture_data
+            from routes.moisture import (
+                _read_data as _read_moisture_data,
+                _duration_entity_for_zone,
+            )
             import zone_nozzle_data
             import pump_data
 
-            moisture_data = _load_moisture_data()
+            moisture_data = _read_moisture_data()
             base_durations = moisture_data.get("base_durations", {})
-            zone_suffix = entity_id.split(".", 1)[1] if "." in entity_id else entity_id
 
             # Find the base (original schedule) duration for this zone
             base_minutes = None
-            for dur_eid, bd in base_durations.items():
-                if zone_suffix in dur_eid:
-                    base_minutes = bd.get("base_value")
-                    break
+            dur_eid = _duration_entity_for_zone(entity_id, base_durations)
+            if dur_eid:
+                base_minutes = base_durations[dur_eid].get("base_value")
 
             # Fallback: if base_durations is empty (apply_factors_to_schedule
             # not enabled), use the scheduled_minutes passed by the caller.
@@ -748,49 +790,57 @@ def _classify_device_entities(entity_ids: list[str]) -> dict[tuple[str, str], st
     return inventory
 
 
-def invalidate_remote_maps():
-    """Clear cached entity maps so they are rebuilt on next access.
+@dataclass(frozen=True)
+class BrokerTopology:
+    """Immutable broker index, built once per config generation.
 
-    Call this when the remote device config changes (e.g. add/remove remote).
+    Holds every controller ↔ remote mapping plus the reverse indexes the
+    event path needs, so each lookup there is a single dict hit.  Never
+    mutated after construction — a config change builds a new instance and
+    swaps the module-level reference (see _get_broker_topology()).
     """
-    global _remote_maps_cache, _remote_maps_logged
-    global _remote_maps_by_device, _remote_maps_logged_by_device
-    global _sync_needed_by_device, _manual_stop_by_device, _entity_to_device_cache
-    _remote_maps_cache = {}
-    _remote_maps_logged = False
-    _remote_maps_by_device = {}
-    _remote_maps_logged_by_device = {}
-    _sync_needed_by_device = {}
-    _manual_stop_by_device = {}
-    _entity_to_device_cache = {}
+    config_ref: object  # the Config instance this topology was built from
+    merged: dict  # union maps across all remotes (debug UI / legacy paths)
+    by_device: dict  # device_id -> {"r2c", "c2r", "status_map", "remote_all", "controller_watched"}
+    entity_to_device: dict  # remote entity_id -> device_id
+    remote_to_controller: dict  # remote entity_id -> controller entity_id (per-device r2c)
+    controller_to_remotes: dict  # controller entity_id -> {device_id: remote entity_id} (bidirectional)
+    sync_needed_by_device: dict  # device_id -> switch.*_sync_needed
+    manual_stop_by_device: dict  # device_id -> switch.*_manual_stop
+    entity_suffix: dict  # entity_id -> normalized function suffix (all mapped entities)
+    sync_needed_entity: str | None = None  # first found (backward compat)
+    manual_stop_entity: str | None = None  # first found (backward compat)
 
 
-def _build_remote_entity_maps_for_device(device_id: str) -> dict:
-    """Build entity maps for a single remote device.
+_EMPTY_DEVICE_MAPS = {"r2c": {}, "c2r": {}, "status_map": {}, "remote_all": frozenset(),
+                      "controller_watched": frozenset()}
 
-    Returns {"r2c": {}, "c2r": {}, "status_map": {}, "remote_all": set(), ...}
-    Uses the same classification logic as _build_remote_entity_maps but scoped to one device.
+_broker_topology: BrokerTopology | None = None
+
+
+def invalidate_remote_maps():
+    """Drop the broker topology so it is rebuilt on next access.
+
+    Call this when the remote device config changes (e.g. add/remove remote).
     """
-    global _remote_maps_by_device, _remote_maps_logged_by_device
+    global _broker_topology
+    _broker_topology = None
 
-    if device_id in _remote_maps_by_device and _remote_maps_by_device[device_id]:
-        return _remote_maps_by_device[device_id]
 
+def _get_broker_topology() -> BrokerTopology:
+    """Return the current broker topology, rebuilding it for a new config."""
+    global _broker_topology
     from config import get_config
     config = get_config()
-    device_entities = config.allowed_remote_entities_by_device.get(device_id, [])
-    if not device_entities:
-        empty = {"r2c": {}, "c2r": {}, "status_map": {}, "remote_all": set(), "controller_watched": set()}
-        _remote_maps_by_device[device_id] = empty
-        return empty
-
-    # Build using the same logic as the merged builder but scoped to this device's entities
-    all_controller = (set(config.allowed_zone_entities or [])
-                      | set(config.allowed_control_entities or [])
-                      | set(config.allowed_sensor_entities or []))
-    # Exclude entities belonging to pump/relay/master valve zones
-    all_controller = _filter_special_zone_entities(all_controller)
-    controller_inv = _classify_device_entities(list(all_controller))
+    topology = _broker_topology
+    if topology is None or topology.config_ref is not config:
+        topology = _build_broker_topology(config)
+        _broker_topology = topology  # single reference swap
+    return topology
+
+
+def _match_device_maps(controller_inv: dict, device_entities: list[str]) -> dict:
+    """Match one remote's classified entities against the controller inventory."""
     remote_inv = _classify_device_entities(device_entities)
 
     r2c = {}
@@ -812,95 +862,22 @@ def _build_remote_entity_maps_for_device(device_id: str) -> dict:
             c2r[ctrl_eid] = remote_eid
             controller_watched.add(ctrl_eid)
 
-    result = {
+    return {
         "r2c": r2c,
         "c2r": c2r,
         "status_map": status_map,
-        "remote_all": set(device_entities),
-        "controller_watched": controller_watched,
+        "remote_all": frozenset(device_entities),
+        "controller_watched": frozenset(controller_watched),
     }
-    _remote_maps_by_device[device_id] = result
-
-    if not _remote_maps_logged_by_device.get(device_id, False):
-        _remote_log(f"Broker: built maps for device {device_id[:12]}: "
-                    f"{len(r2c)} bidirectional, {len(status_map)} status, "
-                    f"{len(device_entities)} remote entities")
-        _remote_maps_logged_by_device[device_id] = True
 
-    return result
 
+def _match_merged_maps(controller_inv: dict, remote_inv: dict) -> tuple[dict, dict, dict]:
+    """Match the controller inventory against the union of all remotes.
 
-def _get_entity_device_id(entity_id: str) -> str | None:
-    """Look up which remote device an entity belongs to."""
-    global _entity_to_device_cache
-    if entity_id in _entity_to_device_cache:
-        return _entity_to_device_cache[entity_id] or None
-
-    from config import get_config
-    config = get_config()
-    for did, entities in config.allowed_remote_entities_by_device.items():
-        if entity_id in entities:
-            _entity_to_device_cache[entity_id] = did
-            return did
-    _entity_to_device_cache[entity_id] = ""
-    return None
-
-
-def _build_remote_entity_maps() -> dict:
-    """Build bidirectional entity mapping between controller and remote.
-
-    Uses a two-phase broker model:
-      Phase 1: Classify each device's entities independently by function.
-      Phase 2: Match the two inventories by (domain_class, function_key).
-
-    The add-on acts as the middleman — it understands what each entity does
-    on each device and brokers state changes between them.
-
-    Returns dict with:
-      r2c: remote_entity -> controller_entity (for user actions on remote)
-      c2r: controller_entity -> remote_entity (for mirroring state to remote)
-      remote_all: set of ALL remote entity IDs to watch
-      controller_watched: set of controller entity IDs that have a remote counterpart
-      status_map: controller_sensor -> remote_text (one-way: controller->remote)
-      controller_inv: classified controller inventory (for debug UI)
-      remote_inv: classified remote inventory (for debug UI)
+    Phase 2 of the broker model: match the two inventories by
+    (domain_class, function_key), allowing compatible cross-domain pairs.
+    Returns (r2c, c2r, status_map).
     """
-    global _remote_maps_cache, _remote_maps_logged
-    # Return cached maps if already built (rebuild via invalidate_remote_maps())
-    if _remote_maps_cache:
-        return _remote_maps_cache
-
-    from config import get_config
-    config = get_config()
-
-    if not config.allowed_remote_entities:
-        _remote_maps_cache = {"r2c": {}, "c2r": {}, "remote_all": set(),
-                              "controller_watched": set(), "status_map": {},
-                              "controller_inv": {}, "remote_inv": {}}
-        return _remote_maps_cache
-
-    # ── Phase 1: Classify each device's entities independently ──
-    all_controller_raw = (set(config.allowed_zone_entities or [])
-                          | set(config.allowed_control_entities or [])
-                          | set(config.allowed_sensor_entities or []))
-    # Exclude entities belonging to pump/relay/master valve zones
-    all_controller = _filter_special_zone_entities(all_controller_raw)
-    if not _remote_maps_logged and len(all_controller) < len(all_controller_raw):
-        _remote_log(f"Broker: filtered {len(all_controller_raw) - len(all_controller)} "
-                    f"entities from special zones {_special_zone_nums}")
-    controller_inv = _classify_device_entities(list(all_controller))
-    remote_inv = _classify_device_entities(list(config.allowed_remote_entities))
-
-    # Log inventories on first build
-    if not _remote_maps_logged:
-        _remote_log(f"Controller inventory ({len(controller_inv)} entities):")
-        for (domain, func), eid in sorted(controller_inv.items(), key=lambda x: x[0][1]):
-            _remote_log(f"  {domain:<12} | {func:<30} -> {eid}")
-        _remote_log(f"Remote inventory ({len(remote_inv)} entities):")
-        for (domain, func), eid in sorted(remote_inv.items(), key=lambda x: x[0][1]):
-            _remote_log(f"  {domain:<12} | {func:<30} -> {eid}")
-
-    # ── Phase 2: Match by function key ──
     # Build a remote lookup: also index by wildcard domain for cross-domain matching
     remote_by_func: dict[tuple[str, str], str] = {}
     for (domain, func), eid in remote_inv.items():
@@ -945,49 +922,175 @@ def _build_remote_entity_maps() -> dict:
             r2c[remote_eid] = ctrl_eid
             c2r[ctrl_eid] = remote_eid
 
-    remote_all = set(config.allowed_remote_entities)
+    return r2c, c2r, status_map
+
 
-    _remote_maps_cache = {
+def _build_broker_topology(config) -> BrokerTopology:
+    """Build the complete broker topology for one config generation.
+
+    Uses a two-phase broker model:
+      Phase 1: Classify each device's entities independently by function.
+      Phase 2: Match the inventories by (domain_class, function_key).
+
+    The add-on acts as the middleman — it understands what each entity does
+    on each device and brokers state changes between them.  The controller
+    inventory is classified once and shared by the merged and per-device
+    matches.
+    """
+    if not config.allowed_remote_entities:
+        return BrokerTopology(
+            config_ref=config,
+            merged={"r2c": {}, "c2r": {}, "remote_all": frozenset(),
+                    "controller_watched": frozenset(), "status_map": {},
+                    "controller_inv": {}, "remote_inv": {}},
+            by_device={}, entity_to_device={}, remote_to_controller={},
+            controller_to_remotes={}, sync_needed_by_device={}, manual_stop_by_device={},
+            entity_suffix={},
+        )
+
+    # ── Phase 1: Classify each device's entities independently ──
+    all_controller_raw = (set(config.allowed_zone_entities or [])
+                          | set(config.allowed_control_entities or [])
+                          | set(config.allowed_sensor_entities or []))
+    # Exclude entities belonging to pump/relay/master valve zones
+    all_controller = _filter_special_zone_entities(all_controller_raw)
+    if len(all_controller) < len(all_controller_raw):
+        _remote_log(f"Broker: filtered {len(all_controller_raw) - len(all_controller)} "
+                    f"entities from special zones {_special_zone_nums}")
+    controller_inv = _classify_device_entities(list(all_controller))
+    remote_inv = _classify_device_entities(list(config.allowed_remote_entities))
+
+    _remote_log(f"Controller inventory ({len(controller_inv)} entities):")
+    for (domain, func), eid in sorted(controller_inv.items(), key=lambda x: x[0][1]):
+        _remote_log(f"  {domain:<12} | {func:<30} -> {eid}")
+    _remote_log(f"Remote inventory ({len(remote_inv)} entities):")
+    for (domain, func), eid in sorted(remote_inv.items(), key=lambda x: x[0][1]):
+        _remote_log(f"  {domain:<12} | {func:<30} -> {eid}")
+
+    # ── Phase 2: Match by function key ──
+    r2c, c2r, status_map = _match_merged_maps(controller_inv, remote_inv)
+    remote_all = frozenset(config.allowed_remote_entities)
+    merged = {
         "r2c": r2c,
         "c2r": c2r,
         "remote_all": remote_all,
-        "controller_watched": set(c2r.keys()) | set(status_map.keys()),
+        "controller_watched": frozenset(c2r) | frozenset(status_map),
         "status_map": status_map,
         "controller_inv": controller_inv,
         "remote_inv": remote_inv,
     }
 
-    # Log broker matching summary on first build only
-    if not _remote_maps_logged:
-        _remote_maps_logged = True
-        _remote_log(f"Broker matched {len(r2c)} bidirectional + {len(status_map)} status (one-way) pairs:")
-        for ctrl_eid, remote_eid in sorted(c2r.items(), key=lambda x: _extract_entity_suffix(x[0])):
-            func = _extract_entity_suffix(ctrl_eid)
-            _remote_log(f"  ↔ {func}: {ctrl_eid} ↔ {remote_eid}")
-        for ctrl_eid, remote_eid in sorted(status_map.items(), key=lambda x: _extract_entity_suffix(x[0])):
-            func = _extract_entity_suffix(ctrl_eid)
-            _remote_log(f"  → {func}: {ctrl_eid} → {remote_eid} (one-way)")
-        # Check schedule start_time mapping
-        st_mapped = {k: v for k, v in c2r.items() if "start_time" in k.lower()}
-        if st_mapped:
-            _remote_log(f"  ✓ Start time mappings: {len(st_mapped)} found")
-        else:
-            _remote_log("  ✗ WARNING: No start_time entities mapped!")
-        # Log unmatched entities
-        mapped_ctrl = set(c2r.keys()) | set(status_map.keys())
-        mapped_remote = set(r2c.keys()) | set(status_map.values())
-        unmapped_ctrl = all_controller - mapped_ctrl
-        unmapped_remote = remote_all - mapped_remote
-        if unmapped_ctrl:
-            _remote_log(f"  Unmatched controller ({len(unmapped_ctrl)}):")
-            for eid in sorted(unmapped_ctrl):
-                _remote_log(f"    - {_extract_entity_suffix(eid)}: {eid}")
-        if unmapped_remote:
-            _remote_log(f"  Unmatched remote ({len(unmapped_remote)}):")
-            for eid in sorted(unmapped_remote):
-                _remote_log(f"    - {_extract_entity_suffix(eid)}: {eid}")
-
-    return _remote_maps_cache
+    # ── Per-device maps and reverse indexes ──
+    by_device: dict[str, dict] = {}
+    entity_to_device: dict[str, str] = {}
+    remote_to_controller: dict[str, str] = {}
+    controller_to_remotes: dict[str, dict[str, str]] = {}
+    sync_needed_by_device: dict[str, str] = {}
+    manual_stop_by_device: dict[str, str] = {}
+    for device_id, device_entities in config.allowed_remote_entities_by_device.items():
+        if not device_entities:
+            by_device[device_id] = _EMPTY_DEVICE_MAPS
+            continue
+        dmaps = _match_device_maps(controller_inv, device_entities)
+        by_device[device_id] = dmaps
+        for eid in device_entities:
+            entity_to_device.setdefault(eid, device_id)
+            if eid.startswith("switch.") and eid.endswith("_sync_needed"):
+                sync_needed_by_device.setdefault(device_id, eid)
+            elif eid.startswith("switch.") and eid.endswith("_manual_stop"):
+                manual_stop_by_device.setdefault(device_id, eid)
+        remote_to_controller.update(dmaps["r2c"])
+        for ctrl_eid, remote_eid in dmaps["c2r"].items():
+            controller_to_remotes.setdefault(ctrl_eid, {})[device_id] = remote_eid
+        _remote_log(f"Broker: built maps for device {device_id[:12]}: "
+                    f"{len(dmaps['r2c'])} bidirectional, {len(dmaps['status_map'])} status, "
+                    f"{len(device_entities)} remote entities"
+                    f"{', sync_needed=' + sync_needed_by_device[device_id] if device_id in sync_needed_by_device else ''}")
+
+    entity_suffix = {eid: _extract_entity_suffix(eid)
+                     for eid in all_controller | set(config.allowed_remote_entities)}
+
+    sync_needed_entity = next((eid for eid in config.allowed_remote_entities
+                               if eid.startswith("switch.") and eid.endswith("_sync_needed")), None)
+    manual_stop_entity = next((eid for eid in config.allowed_remote_entities
+                               if eid.startswith("switch.") and eid.endswith("_manual_stop")), None)
+
+    # Log broker matching summary once per topology
+    _remote_log(f"Broker matched {len(r2c)} bidirectional + {len(status_map)} status (one-way) pairs:")
+    for ctrl_eid, remote_eid in sorted(c2r.items(), key=lambda x: _extract_entity_suffix(x[0])):
+        func = _extract_entity_suffix(ctrl_eid)
+        _remote_log(f"  ↔ {func}: {ctrl_eid} ↔ {remote_eid}")
+    for ctrl_eid, remote_eid in sorted(status_map.items(), key=lambda x: _extract_entity_suffix(x[0])):
+        func = _extract_entity_suffix(ctrl_eid)
+        _remote_log(f"  → {func}: {ctrl_eid} → {remote_eid} (one-way)")
+    # Check schedule start_time mapping
+    st_mapped = {k: v for k, v in c2r.items() if "start_time" in k.lower()}
+    if st_mapped:
+        _remote_log(f"  ✓ Start time mappings: {len(st_mapped)} found")
+    else:
+        _remote_log("  ✗ WARNING: No start_time entities mapped!")
+    # Log unmatched entities
+    mapped_ctrl = set(c2r.keys()) | set(status_map.keys())
+    mapped_remote = set(r2c.keys()) | set(status_map.values())
+    unmapped_ctrl = all_controller - mapped_ctrl
+    unmapped_remote = remote_all - mapped_remote
+    if unmapped_ctrl:
+        _remote_log(f"  Unmatched controller ({len(unmapped_ctrl)}):")
+        for eid in sorted(unmapped_ctrl):
+            _remote_log(f"    - {_extract_entity_suffix(eid)}: {eid}")
+    if unmapped_remote:
+        _remote_log(f"  Unmatched remote ({len(unmapped_remote)}):")
+        for eid in sorted(unmapped_remote):
+            _remote_log(f"    - {_extract_entity_suffix(eid)}: {eid}")
+
+    return BrokerTopology(
+        config_ref=config,
+        merged=merged,
+        by_device=by_device,
+        entity_to_device=entity_to_device,
+        remote_to_controller=remote_to_controller,
+        controller_to_remotes=controller_to_remotes,
+        sync_needed_by_device=sync_needed_by_device,
+        manual_stop_by_device=manual_stop_by_device,
+        entity_suffix=entity_suffix,
+        sync_needed_entity=sync_needed_entity,
+        manual_stop_entity=manual_stop_entity,
+    )
+
+
+def _build_remote_entity_maps_for_device(device_id: str) -> dict:
+    """Return the entity maps for a single remote device.
+
+    Returns {"r2c": {}, "c2r": {}, "status_map": {}, "remote_all": set(), ...}
+    from the current broker topology.
+    """
+    return _get_broker_topology().by_device.get(device_id, _EMPTY_DEVICE_MAPS)
+
+
+def _get_entity_device_id(entity_id: str) -> str | None:
+    """Look up which remote device an entity belongs to."""
+    return _get_broker_topology().entity_to_device.get(entity_id)
+
+
+def _entity_suffix(entity_id: str) -> str:
+    """Return an entity's function suffix from the topology (parsed if unmapped)."""
+    suffix = _get_broker_topology().entity_suffix.get(entity_id)
+    return suffix if suffix is not None else _extract_entity_suffix(entity_id)
+
+
+def _build_remote_entity_maps() -> dict:
+    """Return the bidirectional entity mapping between controller and all remotes.
+
+    Returns dict with:
+      r2c: remote_entity -> controller_entity (for user actions on remote)
+      c2r: controller_entity -> remote_entity (for mirroring state to remote)
+      remote_all: set of ALL remote entity IDs to watch
+      controller_watched: set of controller entity IDs that have a remote counterpart
+      status_map: controller_sensor -> remote_text (one-way: controller->remote)
+      controller_inv: classified controller inventory (for debug UI)
+      remote_inv: classified remote inventory (for debug UI)
+    """
+    return _get_broker_topology().merged
 
 
 def _get_remote_entities() -> set:
@@ -1003,23 +1106,80 @@ def _get_remote_entities() -> set:
 
 
 def _get_controller_entities_for_remote() -> set:
-    """Get controller entity IDs that should be mirrored to the remote."""
+    """Get controller entity IDs that should be mirrored to the remote.
+
+    Includes every per-device mapping so the event stream keeps the
+    last-known state table (_broker_state_cache) current for all of them.
+    """
     try:
+        from config import get_config
         maps = _build_remote_entity_maps()
-        return maps.get("controller_watched", set())
+        watched = set(maps.get("controller_watched", set()))
+        for device_id in get_config().remote_device_ids:
+            watched |= _build_remote_entity_maps_for_device(device_id)["controller_watched"]
+        return watched
     except Exception:
         return set()
 
 
-async def _mirror_entity_state(source_eid: str, target_eid: str, new_state: str):
+# Relay write queue: one in-flight write per target entity.  A newer value for
+# a target that is still being written replaces any queued value (coalesced),
+# so bursts of changes collapse to the latest state.
+_mirror_inflight: set = set()  # target entity_ids with a write in progress
+_mirror_pending: dict = {}  # target entity_id -> (source_eid, new_state, direction, device_id, event_at)
+
+
+async def _mirror_entity_state(source_eid: str, target_eid: str, new_state: str,
+                               direction: str = broker_metrics.SYNC,
+                               device_id: str | None = None,
+                               event_at: float | None = None):
     """Mirror a state change from one entity to another.
 
     Handles all entity domains: switch, number, text, select, button, valve.
+
+    Args:
+        direction: Relay direction for broker_metrics (see broker_metrics constants).
+        device_id: Remote device the relay belongs to (source or target remote).
+        event_at: time.monotonic() when the triggering event was received, for
+            event-to-write latency.
     """
     # NEVER relay unavailable/unknown — these are not real values
     if new_state in ("unavailable", "unknown"):
         return
 
+    # Button presses are actions, never coalesced
+    coalesce = not target_eid.startswith("button.")
+    if coalesce and target_eid in _mirror_inflight:
+        replaced = _mirror_pending.get(target_eid)
+        if replaced:
+            broker_metrics.record_coalesced(replaced[2], replaced[3])
+            broker_metrics.queue_exit(replaced[2], replaced[3])
+        _mirror_pending[target_eid] = (source_eid, new_state, direction, device_id, event_at)
+        broker_metrics.queue_enter(direction, device_id)
+        return
+
+    if coalesce:
+        _mirror_inflight.add(target_eid)
+    broker_metrics.queue_enter(direction, device_id)
+    try:
+        while True:
+            try:
+                ok = await _write_mirrored_state(source_eid, target_eid, new_state)
+                if ok is not None:
+                    broker_metrics.record_write(direction, device_id, ok, event_at)
+            finally:
+                broker_metrics.queue_exit(direction, device_id)
+            queued = _mirror_pending.pop(target_eid, None)
+            if queued is None:
+                break
+            source_eid, new_state, direction, device_id, event_at = queued
+    finally:
+        if coalesce:
+            _mirror_inflight.discard(target_eid)
+
+
+async def _write_mirrored_state(source_eid: str, target_eid: str, new_state: str) -> bool | None:
+    """Perform one relay write.  Returns success, or None if nothing was written."""
     import ha_client
     global _remote_mirror_guard
 
@@ -1030,35 +1190,36 @@ async def _mirror_entity_state(source_eid: str, target_eid: str, new_state: str)
         if target_domain in ("switch", "light"):
             is_on = new_state in ("on", "open")
             svc = "turn_on" if is_on else "turn_off"
-            await ha_client.call_service(target_domain, svc, {"entity_id": target_eid})
+            ok = await ha_client.call_service(target_domain, svc, {"entity_id": target_eid})
         elif target_domain == "valve":
             is_on = new_state in ("on", "open")
             svc = "open_valve" if is_on else "close_valve"
-            await ha_client.call_service("valve", svc, {"entity_id": target_eid})
+            ok = await ha_client.call_service("valve", svc, {"entity_id": target_eid})
         elif target_domain == "number":
             try:
                 val = float(new_state)
-                await ha_client.call_service("number", "set_value",
-                                             {"entity_id": target_eid, "value": val})
             except (ValueError, TypeError):
-                return  # Can't mirror non-numeric state to number entity
-        elif target_domain in ("text", "text_sensor"):
-            # text entities accept set_value; text_sensor is read-only but
-            # remote uses text (not text_sensor) so this works
-            if target_domain == "text":
-                write_val = _convert_time_for_relay(str(new_state), source_eid)
-                await ha_client.call_service("text", "set_value",
-                                             {"entity_id": target_eid, "value": write_val})
-            # text_sensor can't be written to — skip
+                return None  # Can't mirror non-numeric state to number entity
+            ok = await ha_client.call_service("number", "set_value",
+                                              {"entity_id": target_eid, "value": val})
+        elif target_domain == "text":
+            # text entities accept set_value; the remote uses text (not
+            # text_sensor) for its status fields so this works
+            write_val = _convert_time_for_relay(str(new_state), source_eid)
+            ok = await ha_client.call_service("text", "set_value",
+                                              {"entity_id": target_eid, "value": write_val})
         elif target_domain == "select":
-            await ha_client.call_service("select", "select_option",
-                                         {"entity_id": target_eid, "option": str(new_state)})
+            ok = await ha_client.call_service("select", "select_option",
+                                              {"entity_id": target_eid, "option": str(new_state)})
         elif target_domain == "button":
-            await ha_client.call_service("button", "press", {"entity_id": target_eid})
+            ok = await ha_client.call_service("button", "press", {"entity_id": target_eid})
         else:
-            return  # Unknown domain
+            return None  # Unknown domain (text_sensor is read-only)
 
-        suffix = _extract_entity_suffix(source_eid)
+        suffix = _entity_suffix(source_eid)
+        if not ok:
+            _remote_log(f"Relay FAILED {source_eid} → {target_eid}: service call rejected")
+            return False
         # Show time conversion in log if it happened
         converted_note = ""
         if target_domain == "text" and "start_time" in suffix:
@@ -1066,8 +1227,10 @@ async def _mirror_entity_state(source_eid: str, target_eid: str, new_state: str)
             if write_val != str(new_state):
                 converted_note = f" (converted {new_state} → {write_val})"
         _remote_log(f"Relayed {suffix}: {new_state}{converted_note} ({source_eid} → {target_eid})")
+        return True
     except Exception as e:
         _remote_log(f"Relay FAILED {source_eid} → {target_eid}: {e}")
+        return False
     finally:
         import asyncio
         async def _clear():
@@ -1076,7 +1239,8 @@ async def _mirror_entity_state(source_eid: str, target_eid: str, new_state: str)
         asyncio.create_task(_clear())
 
 
-async def _handle_remote_entity_change(entity_id: str, new_state: str, old_state: str):
+async def _handle_remote_entity_change(entity_id: str, new_state: str, old_state: str,
+                                      event_at: float | None = None):
     """A remote entity changed — mirror to the controller AND all other remotes.
 
     One-way entities (zone_count, use_12_hour_format, pump_start_master_valve) are
@@ -1084,20 +1248,29 @@ async def _handle_remote_entity_change(entity_id: str, new_state: str, old_state
 
     Suppressed while the source device's reconnect is pending to prevent remote
     defaults from overwriting real controller values.
+
+    event_at is the time.monotonic() the WebSocket event arrived (for metrics).
     """
     global _remote_reconnect_pending
+    topology = _get_broker_topology()
     # Determine which remote device this entity belongs to
-    source_device_id = _get_entity_device_id(entity_id)
+    source_device_id = topology.entity_to_device.get(entity_id)
 
-    # LIVE CHECK: If this device's sync_needed switch is ON, block and trigger sync
+    # LIVE CHECK: If this device's sync_needed switch is ON, block and trigger sync.
+    # Uses the event-fed state table; falls back to an HA read if not yet seen.
     if source_device_id:
-        sync_eid = _find_sync_needed_entity_for_device(source_device_id)
+        sync_eid = topology.sync_needed_by_device.get(source_device_id)
         if sync_eid and not _remote_reconnect_pending_by_device.get(source_device_id, True):
             try:
-                import ha_client
-                st = await ha_client.get_entity_state(sync_eid)
-                if st and st.get("state") == "on":
-                    _remote_reconnect_pending_by_device[source_device_id] = True
+                sync_state = _broker_state_cache.get(sync_eid)
+                if sync_state is None:
+                    import ha_client
+                    st = await ha_client.get_entity_state(sync_eid)
+                    sync_state = st.get("state") if st else None
+                if sync_state == "on":
+                    broker_metrics.record_suppressed(broker_metrics.REMOTE_TO_CONTROLLER,
+                                                     source_device_id, "syncing")
+                    _block_remote_device(source_device_id, "sync_needed")
                     _remote_reconnect_pending = True
                     _remote_log(f"Suppressed remote→controller: {_extract_entity_suffix(entity_id)} "
                                 f"= {new_state} — sync_needed is ON (live check, device {source_device_id[:12]})")
@@ -1109,68 +1282,75 @@ async def _handle_remote_entity_change(entity_id: str, new_state: str, old_state
 
     # Block remote→controller during this device's startup/reconnect sync
     if source_device_id and _remote_reconnect_pending_by_device.get(source_device_id, True):
+        broker_metrics.record_suppressed(broker_metrics.REMOTE_TO_CONTROLLER,
+                                         source_device_id, "syncing")
         _remote_log(f"Suppressed remote→controller: {_extract_entity_suffix(entity_id)} "
                     f"= {new_state} (device {(source_device_id or '?')[:12]} syncing)")
         return
     # Fallback: global flag for backward compat
     if _remote_reconnect_pending:
+        broker_metrics.record_suppressed(broker_metrics.REMOTE_TO_CONTROLLER,
+                                         source_device_id, "syncing")
         _remote_log(f"Suppressed remote→controller: {_extract_entity_suffix(entity_id)} "
                     f"= {new_state} (global sync in progress)")
         return
 
     # Skip one-way entities (add-on → remote only)
-    suffix = _extract_entity_suffix(entity_id)
+    suffix = _entity_suffix(entity_id)
     if suffix in _ONE_WAY_SUFFIXES:
         return
     # Duration entities: update the add-on's base_durations instead of mirroring
     if _DURATION_SUFFIX_RE.match(suffix):
-        await _handle_remote_duration_change(entity_id, new_state, suffix)
+        await _handle_remote_duration_change(entity_id, new_state, suffix,
+                                             source_device_id, event_at)
         # Also push the duration change to other remotes
-        await _mirror_to_other_remotes(entity_id, source_device_id, new_state)
+        await _mirror_to_other_remotes(entity_id, source_device_id, new_state, event_at)
         return
 
     # Find controller entity via per-device map
     if source_device_id:
-        maps = _build_remote_entity_maps_for_device(source_device_id)
+        controller_eid = topology.remote_to_controller.get(entity_id)
     else:
-        maps = _build_remote_entity_maps()
-    controller_eid = maps["r2c"].get(entity_id)
+        controller_eid = topology.merged["r2c"].get(entity_id)
     if not controller_eid:
         return
     # Mirror to controller
-    await _mirror_entity_state(entity_id, controller_eid, new_state)
+    await _mirror_entity_state(entity_id, controller_eid, new_state,
+                               broker_metrics.REMOTE_TO_CONTROLLER, source_device_id, event_at)
     # Mirror to all OTHER remotes (keep all remotes in sync)
-    await _mirror_to_other_remotes(entity_id, source_device_id, new_state)
+    await _mirror_to_other_remotes(entity_id, source_device_id, new_state, event_at)
 
 
-async def _mirror_to_other_remotes(source_entity_id: str, source_device_id: str | None, new_state: str):
+async def _mirror_to_other_remotes(source_entity_id: str, source_device_id: str | None,
+                                   new_state: str, event_at: float | None = None):
     """Push a state change from one remote to all other connected remotes."""
-    from config import get_config
-    config = get_config()
-    if len(config.remote_device_ids) < 2:
+    topology = _get_broker_topology()
+    if len(topology.by_device) < 2:
         return  # Only one remote, nothing to cross-sync
-    suffix = _extract_entity_suffix(source_entity_id)
-    for device_id in config.remote_device_ids:
+    # Source remote entity → controller entity → every other remote's entity
+    if source_device_id:
+        controller_eid = topology.remote_to_controller.get(source_entity_id)
+    else:
+        controller_eid = topology.merged["r2c"].get(source_entity_id)
+    if not controller_eid:
+        return
+    import asyncio
+    writes = []
+    for device_id, other_remote_eid in topology.controller_to_remotes.get(controller_eid, {}).items():
         if device_id == source_device_id:
             continue  # Don't echo back to source
         if _remote_reconnect_pending_by_device.get(device_id, True):
+            broker_metrics.record_suppressed(broker_metrics.REMOTE_TO_REMOTE, device_id, "syncing")
             continue  # This remote is still syncing
-        maps = _build_remote_entity_maps_for_device(device_id)
-        # Find the matching remote entity by looking up controller_eid → other remote's entity
-        # First find controller entity from source entity
-        if source_device_id:
-            src_maps = _build_remote_entity_maps_for_device(source_device_id)
-            controller_eid = src_maps["r2c"].get(source_entity_id)
-        else:
-            controller_eid = _build_remote_entity_maps()["r2c"].get(source_entity_id)
-        if not controller_eid:
-            return
-        other_remote_eid = maps["c2r"].get(controller_eid)
-        if other_remote_eid:
-            await _mirror_entity_state(source_entity_id, other_remote_eid, new_state)
+        writes.append(_mirror_entity_state(source_entity_id, other_remote_eid, new_state,
+                                           broker_metrics.REMOTE_TO_REMOTE, device_id, event_at))
+    if writes:
+        await asyncio.gather(*writes)
 
 
-async def _handle_remote_duration_change(remote_eid: str, new_state: str, suffix: str):
+async def _handle_remote_duration_change(remote_eid: str, new_state: str, suffix: str,
+                                         device_id: str | None = None,
+                                         event_at: float | None = None):
     """Handle a duration change from the remote by updating the add-on's base_durations.
 
     Instead of mirroring directly to the controller (which would bypass the factor
@@ -1190,8 +1370,9 @@ async def _handle_remote_duration_change(remote_eid: str, new_state: str, suffix
         return
 
     # Find the controller entity this maps to
-    maps = _build_remote_entity_maps()
-    controller_eid = maps["r2c"].get(remote_eid)
+    topology = _get_broker_topology()
+    controller_eid = (topology.remote_to_controller.get(remote_eid)
+                      or topology.merged["r2c"].get(remote_eid))
     if not controller_eid:
         _remote_log(f"Broker: no controller mapping for remote duration {suffix}")
         return
@@ -1228,10 +1409,11 @@ async def _handle_remote_duration_change(remote_eid: str, new_state: str, suffix
         # duration (manual run).  The periodic factor re-application will
         # overwrite with the factored value before the next scheduled run.
         import ha_client
-        await ha_client.call_service(
+        ok = await ha_client.call_service(
             "number", "set_value",
             {"entity_id": controller_eid, "value": new_val},
         )
+        broker_metrics.record_write(broker_metrics.REMOTE_TO_CONTROLLER, device_id, ok, event_at)
         _remote_log(f"Broker: wrote base {new_val} to {controller_eid}")
 
     except Exception as e:
@@ -1240,19 +1422,24 @@ async def _handle_remote_duration_change(remote_eid: str, new_state: str, suffix
         traceback.print_exc()
 
 
-async def sync_base_durations_to_remote():
-    """Push BASE durations (not factored) from the add-on to ALL remote devices.
+async def sync_base_durations_to_remote(device_ids: list[str] | None = None,
+                                        remote_states: dict | None = None):
+    """Push BASE durations (not factored) from the add-on to remote devices.
 
     Called during full sync and after base durations are captured/changed.
     Reads base_durations from moisture.json and writes them to the corresponding
-    remote duration entities on each connected remote.
+    remote duration entities on each connected remote (or only ``device_ids``).
+    Remotes already showing the base value are skipped when their current
+    state is known (``remote_states``: entity_id -> state string).
     """
-    import ha_client
+    import asyncio
     from config import get_config
 
     config = get_config()
     if not config.allowed_remote_entities_by_device:
         return
+    if device_ids is None:
+        device_ids = list(config.remote_device_ids)
 
     try:
         from routes.moisture import _load_data as _load_moisture_data
@@ -1262,8 +1449,7 @@ async def sync_base_durations_to_remote():
             _remote_log("Broker: no base_durations to sync to remotes")
             return
 
-        total_synced = 0
-        for device_id in config.remote_device_ids:
+        async def _sync_device(device_id: str) -> int:
             maps = _build_remote_entity_maps_for_device(device_id)
             synced = 0
             for controller_eid, dur_info in base_durations.items():
@@ -1273,12 +1459,21 @@ async def sync_base_durations_to_remote():
                 remote_eid = maps["c2r"].get(controller_eid)
                 if not remote_eid:
                     continue
-                await _mirror_entity_state(controller_eid, remote_eid, str(base_val))
+                if remote_states is not None and _remote_value_matches(
+                        remote_eid, str(base_val), remote_states.get(remote_eid)):
+                    continue
+                await _mirror_entity_state(controller_eid, remote_eid, str(base_val),
+                                           broker_metrics.SYNC, device_id)
                 synced += 1
-            total_synced += synced
+                if synced % _SYNC_WRITE_BATCH == 0:
+                    await asyncio.sleep(_SYNC_BATCH_PAUSE_S)
+            return synced
+
+        results = await asyncio.gather(*(_sync_device(d) for d in device_ids))
+        total_synced = sum(results)
 
         if total_synced > 0:
-            _remote_log(f"Broker: synced base durations to {len(config.remote_device_ids)} remote(s) "
+            _remote_log(f"Broker: synced base durations to {len(device_ids)} remote(s) "
                         f"({total_synced} total writes)")
     except Exception as e:
         _remote_log(f"Broker: error syncing base durations to remotes: {e}")
@@ -1289,89 +1484,29 @@ async def sync_base_durations_to_remote():
 _remote_reconnect_pending = True
 
 _reconnect_sync_running = False  # prevents duplicate concurrent syncs
-_sync_needed_entity: str | None = None  # auto-detected switch.xxx_sync_needed
 
 
 def _find_sync_needed_entity_for_device(device_id: str) -> str | None:
-    """Auto-detect the sync_needed switch for a specific remote device."""
-    global _sync_needed_by_device
-    cached = _sync_needed_by_device.get(device_id)
-    if cached is not None:
-        return cached if cached else None
-    try:
-        from config import get_config
-        config = get_config()
-        entities = config.allowed_remote_entities_by_device.get(device_id, [])
-        for eid in entities:
-            if eid.startswith("switch.") and eid.endswith("_sync_needed"):
-                _sync_needed_by_device[device_id] = eid
-                _remote_log(f"Broker: found sync_needed entity for {device_id[:12]}: {eid}")
-                return eid
-    except Exception:
-        pass
-    _sync_needed_by_device[device_id] = ""
-    return None
+    """Return the sync_needed switch for a specific remote device."""
+    return _get_broker_topology().sync_needed_by_device.get(device_id)
 
 
 def _find_sync_needed_entity() -> str | None:
-    """Auto-detect any sync_needed switch (backward compat — returns first found)."""
-    global _sync_needed_entity
-    if _sync_needed_entity is not None:
-        return _sync_needed_entity if _sync_needed_entity else None
-    try:
-        from config import get_config
-        config = get_config()
-        for eid in (config.allowed_remote_entities or []):
-            if eid.startswith("switch.") and eid.endswith("_sync_needed"):
-                _sync_needed_entity = eid
-                return eid
-    except Exception:
-        pass
-    _sync_needed_entity = ""
-    return None
+    """Return any sync_needed switch (backward compat — first found)."""
+    return _get_broker_topology().sync_needed_entity
 
 
 # --- Manual Stop flag (tells remote a zone was manually stopped) ---
-_manual_stop_entity: str | None = None  # None=not searched, ""=not found
 
 
 def _find_manual_stop_entity_for_device(device_id: str) -> str | None:
-    """Auto-detect the manual_stop switch for a specific remote device."""
-    global _manual_stop_by_device
-    cached = _manual_stop_by_device.get(device_id)
-    if cached is not None:
-        return cached if cached else None
-    try:
-        from config import get_config
-        config = get_config()
-        entities = config.allowed_remote_entities_by_device.get(device_id, [])
-        for eid in entities:
-            if eid.startswith("switch.") and eid.endswith("_manual_stop"):
-                _manual_stop_by_device[device_id] = eid
-                _remote_log(f"Broker: found manual_stop entity for {device_id[:12]}: {eid}")
-                return eid
-    except Exception:
-        pass
-    _manual_stop_by_device[device_id] = ""
-    return None
+    """Return the manual_stop switch for a specific remote device."""
+    return _get_broker_topology().manual_stop_by_device.get(device_id)
 
 
 def _find_manual_stop_entity() -> str | None:
-    """Auto-detect any manual_stop switch (backward compat — returns first found)."""
-    global _manual_stop_entity
-    if _manual_stop_entity is not None:
-        return _manual_stop_entity if _manual_stop_entity else None
-    try:
-        from config import get_config
-        config = get_config()
-        for eid in (config.allowed_remote_entities or []):
-            if eid.startswith("switch.") and eid.endswith("_manual_stop"):
-                _manual_stop_entity = eid
-                return eid
-    except Exception:
-        pass
-    _manual_stop_entity = ""
-    return None
+    """Return any manual_stop switch (backward compat — first found)."""
+    return _get_broker_topology().manual_stop_entity
 
 
 async def signal_manual_stop():
@@ -1391,7 +1526,11 @@ async def signal_manual_stop():
 
 
 async def _handle_remote_reconnect(entity_id: str, remote_entities: set, device_id: str | None = None):
-    """Remote device signaled sync needed — push ALL controller state to it.
+    """Remote device signaled sync needed — push drifted controller state to it.
+
+    Only entities whose last-known remote state (from the event stream)
+    differs from the controller are written, so flaky or deep-sleeping
+    remotes that reconnect often cost a handful of writes, not a full resync.
 
     Triggered when:
     1. The sync_needed switch is detected ON (device just booted — ALWAYS_ON)
@@ -1407,33 +1546,34 @@ async def _handle_remote_reconnect(entity_id: str, remote_entities: set, device_
         if _reconnect_sync_running_by_device.get(device_id, False):
             return
         _reconnect_sync_running_by_device[device_id] = True
-    else:
-        # Fallback: global guard (legacy)
-        global _reconnect_sync_running
-        if _reconnect_sync_running:
-            return
-        _reconnect_sync_running = True
+        _block_remote_device(device_id, "reconnect")
+        _remote_log(f"Broker: remote sync triggered (device {device_id[:12]}) — suppressing, "
+                    f"pushing controller state in 3s")
+        import asyncio
+        await asyncio.sleep(3)
+        await run_remote_sync_cycle(device_id, use_cache=True)
+        return
+
+    # Fallback: global guard (legacy)
+    global _reconnect_sync_running
+    if _reconnect_sync_running:
+        return
+    _reconnect_sync_running = True
 
     import asyncio
     import ha_client
-    dev_label = f" (device {device_id[:12]})" if device_id else ""
-    _remote_log(f"Broker: remote sync triggered{dev_label} — suppressing, "
-               f"pushing controller state in 3s")
+    _remote_log("Broker: remote sync triggered — suppressing, pushing controller state in 3s")
 
     await asyncio.sleep(3)
     try:
         await sync_all_remote_state()
     except Exception as e:
-        _remote_log(f"Broker: reconnect sync FAILED{dev_label}: {e}")
+        _remote_log(f"Broker: reconnect sync FAILED: {e}")
 
-    _remote_log(f"Broker: holding suppression 5s for remote{dev_label} to settle")
+    _remote_log("Broker: holding suppression 5s for remote to settle")
     await asyncio.sleep(5)
 
-    # Turn OFF sync_needed for this specific device
-    if device_id:
-        sync_eid = _find_sync_needed_entity_for_device(device_id)
-    else:
-        sync_eid = _find_sync_needed_entity()
+    sync_eid = _find_sync_needed_entity()
     if sync_eid:
         try:
             await ha_client.call_service("switch", "turn_off", {"entity_id": sync_eid})
@@ -1444,24 +1584,71 @@ async def _handle_remote_reconnect(entity_id: str, remote_entities: set, device_
     # Re-sync
     try:
         await sync_all_remote_state()
-        _remote_log(f"Broker: second sync complete{dev_label} (post-settle)")
+        _remote_log("Broker: second sync complete (post-settle)")
     except Exception as e:
-        _remote_log(f"Broker: second sync FAILED{dev_label}: {e}")
+        _remote_log(f"Broker: second sync FAILED: {e}")
 
     await asyncio.sleep(3)
 
-    if device_id:
+    _reconnect_sync_running = False
+    _remote_reconnect_pending = False
+    _remote_log("Broker: remote→controller mirroring re-enabled")
+
+
+async def run_remote_sync_cycle(device_id: str, settle_seconds: float = 5,
+                                use_cache: bool = False):
+    """Run one remote's full sync pipeline and unblock it when done.
+
+    Pushes controller state, holds suppression while the device settles,
+    turns OFF its sync_needed switch, re-syncs to overwrite any boot defaults
+    that arrived during the hold, then re-enables remote→controller mirroring
+    for this device only.  Independent of every other remote, so callers can
+    run one cycle per device concurrently (startup, reconnect).
+
+    With use_cache, both syncs diff against the last-known state table
+    instead of re-reading every mapped entity from HA.
+    """
+    global _remote_reconnect_pending
+    import asyncio
+    import ha_client
+
+    dev_label = f" (device {device_id[:12]})"
+    _reconnect_sync_running_by_device[device_id] = True
+    _block_remote_device(device_id, "sync")
+    try:
+        try:
+            await sync_all_remote_state(device_ids=[device_id], use_cache=use_cache)
+        except Exception as e:
+            _remote_log(f"Broker: sync FAILED{dev_label}: {e}")
+
+        _remote_log(f"Broker: holding suppression {settle_seconds:g}s for remote{dev_label} to settle")
+        await asyncio.sleep(settle_seconds)
+
+        # Turn OFF sync_needed for this specific device
+        sync_eid = _find_sync_needed_entity_for_device(device_id)
+        if sync_eid:
+            try:
+                await ha_client.call_service("switch", "turn_off", {"entity_id": sync_eid})
+                _remote_log(f"Broker: turned OFF {sync_eid}")
+            except Exception as e:
+                _remote_log(f"Broker: failed to turn off sync_needed: {e}")
+
+        # Re-sync (only values the boot defaults changed are re-written)
+        try:
+            await sync_all_remote_state(device_ids=[device_id], use_cache=use_cache)
+            _remote_log(f"Broker: second sync complete{dev_label} (post-settle)")
+        except Exception as e:
+            _remote_log(f"Broker: second sync FAILED{dev_label}: {e}")
+
+        await asyncio.sleep(3)
+    finally:
         _reconnect_sync_running_by_device[device_id] = False
-        _remote_reconnect_pending_by_device[device_id] = False
+        _unblock_remote_device(device_id)
         # Clear global flag only if ALL devices are done
         from config import get_config
         config = get_config()
-        all_done = all(not _remote_reconnect_pending_by_device.get(d, True) for d in config.remote_device_ids)
-        if all_done:
+        if all(not _remote_reconnect_pending_by_device.get(d, True) for d in config.remote_device_ids):
             _remote_reconnect_pending = False
-    else:
-        _reconnect_sync_running = False
-        _remote_reconnect_pending = False
 
     _remote_log(f"Broker: remote→controller mirroring re-enabled{dev_label}")
 
@@ -1488,94 +1675,181 @@ async def _refresh_special_zones_on_mode_change():
         print(f"[RUN_LOG] Special zone refresh on mode change failed: {e}")
 
 
-async def _handle_controller_to_remote(entity_id: str, new_state: str):
+async def _handle_controller_to_remote(entity_id: str, new_state: str,
+                                      event_at: float | None = None):
     """A controller entity changed — mirror to ALL connected remote devices."""
     # Never push unavailable/unknown to remote
     if new_state in ("unavailable", "unknown"):
         return
     # Skip duration entities — the add-on manages these through base_durations.
-    suffix = _extract_entity_suffix(entity_id)
+    suffix = _entity_suffix(entity_id)
     if _DURATION_SUFFIX_RE.match(suffix):
         return
 
-    from config import get_config
-    config = get_config()
-
-    # Push to each connected remote device
-    for device_id in config.remote_device_ids:
+    import asyncio
+    topology = _get_broker_topology()
+
+    # Push to each connected remote device concurrently — writes are queued
+    # in event order per target, and a slow remote does not delay the others
+    writes = []
+    for device_id, maps in topology.by_device.items():
+        # Check bidirectional map first, then status (one-way) map
+        remote_eid = maps["c2r"].get(entity_id) or maps["status_map"].get(entity_id)
+        if not remote_eid:
+            continue
         if _remote_reconnect_pending_by_device.get(device_id, True):
+            broker_metrics.record_suppressed(broker_metrics.CONTROLLER_TO_REMOTE, device_id, "syncing")
             continue  # This remote is syncing, skip
-        maps = _build_remote_entity_maps_for_device(device_id)
-        # Check bidirectional map first
-        remote_eid = maps["c2r"].get(entity_id)
-        if remote_eid:
-            await _mirror_entity_state(entity_id, remote_eid, new_state)
+        writes.append(_mirror_entity_state(entity_id, remote_eid, new_state,
+                                           broker_metrics.CONTROLLER_TO_REMOTE, device_id, event_at))
+    if writes:
+        await asyncio.gather(*writes)
+
+
+def _remote_value_matches(target_eid: str, desired: str, current: str | None) -> bool:
+    """Return True if a remote entity already shows the value we would write.
+
+    Mirrors the write semantics of _mirror_entity_state(): switch/valve states
+    compare as on/off, numbers compare numerically, text compares after the
+    start-time format conversion.  Buttons never match (a press is an action,
+    not a state).
+    """
+    if current is None or current in ("unavailable", "unknown"):
+        return False
+    domain = target_eid.split(".")[0] if "." in target_eid else ""
+    if domain in ("switch", "light", "valve"):
+        return (desired in ("on", "open")) == (current in ("on", "open"))
+    if domain == "number":
+        try:
+            return abs(float(desired) - float(current)) < 1e-6
+        except (ValueError, TypeError):
+            return False
+    if domain == "button":
+        return False
+    return str(desired).strip() == str(current).strip()
+
+
+async def _sync_remote_device(device_id: str, controller_states: dict,
+                              remote_states: dict) -> int:
+    """Push controller state to ONE remote — its own rate-limited pipeline.
+
+    Only values that differ from the remote's current state are written.
+    Returns the number of values pushed.
+    """
+    import asyncio
+    import time
+
+    maps = _build_remote_entity_maps_for_device(device_id)
+    total_c2r = {**maps["c2r"], **maps["status_map"]}
+    if not total_c2r:
+        return 0
+
+    started = time.monotonic()
+    synced = 0
+    unchanged = 0
+    skipped_durations = 0
+    for ctrl_eid, remote_eid in total_c2r.items():
+        state_val = controller_states.get(ctrl_eid, "")
+        if not state_val or state_val in ("unavailable", "unknown"):
+            continue
+        suffix = _extract_entity_suffix(ctrl_eid)
+        if _DURATION_SUFFIX_RE.match(suffix):
+            skipped_durations += 1
             continue
-        # Check status (one-way) map
-        remote_eid = maps["status_map"].get(entity_id)
-        if remote_eid:
-            await _mirror_entity_state(entity_id, remote_eid, new_state)
+        if remote_eid.startswith("text_sensor."):
+            continue  # read-only on the remote — nothing to write
+        desired = state_val
+        if remote_eid.startswith("text."):
+            desired = _convert_time_for_relay(str(state_val), ctrl_eid)
+        if _remote_value_matches(remote_eid, desired, remote_states.get(remote_eid)):
+            unchanged += 1
+            continue
+        try:
+            await _mirror_entity_state(ctrl_eid, remote_eid, state_val,
+                                       broker_metrics.SYNC, device_id)
+            synced += 1
+            if synced % _SYNC_WRITE_BATCH == 0:
+                await asyncio.sleep(_SYNC_BATCH_PAUSE_S)
+        except Exception as e:
+            _remote_log(f"Broker: sync FAILED for {ctrl_eid} → {device_id[:12]}: {e}")
 
+    _remote_log(f"Broker: sync to {device_id[:12]} — {synced}/{len(total_c2r)} pushed, "
+                f"{unchanged} already in sync ({skipped_durations} durations skipped) "
+                f"in {time.monotonic() - started:.1f}s")
+    return synced
 
-async def sync_all_remote_state():
-    """Push ALL current controller state to ALL connected remote devices.
+
+async def sync_all_remote_state(device_ids: list[str] | None = None, use_cache: bool = False):
+    """Push current controller state to connected remote devices.
 
     Called on startup and when remote device is first connected.
-    Reads current state of every mapped controller entity and pushes to each remote.
+    Controller and remote states are read once for all devices, then each
+    remote is synced concurrently through its own rate-limited pipeline —
+    a slow remote no longer delays the others.  Only values that differ from
+    the remote's current state are pushed.
+
+    Args:
+        device_ids: Remotes to sync (default: all connected remotes).
+        use_cache: Diff against the last-known states from the event stream
+            (_broker_state_cache) and only read entities missing from it.
+            Used for reconnects, where typically only a handful drifted.
     """
+    import asyncio
     import ha_client
     from config import get_config
 
     config = get_config()
     if not config.allowed_remote_entities_by_device:
         return
+    if device_ids is None:
+        device_ids = list(config.remote_device_ids)
 
-    import asyncio
-    total_synced = 0
-
-    for device_id in config.remote_device_ids:
+    controller_eids = set()
+    remote_eids = set()
+    for device_id in device_ids:
         maps = _build_remote_entity_maps_for_device(device_id)
-        total_c2r = {**maps["c2r"], **maps["status_map"]}
-        if not total_c2r:
-            continue
-
-        controller_eids = list(total_c2r.keys())
-        sched_count = sum(1 for k in total_c2r if "start_time" in k.lower() or "schedule" in k.lower())
-        _remote_log(f"Broker: syncing {len(total_c2r)} entities ({sched_count} schedule-related) "
-                    f"to remote {device_id[:12]}")
-        states = await ha_client.get_entities_by_ids(controller_eids)
+        for ctrl_eid, remote_eid in {**maps["c2r"], **maps["status_map"]}.items():
+            controller_eids.add(ctrl_eid)
+            remote_eids.add(remote_eid)
+    if not controller_eids:
+        return
 
-        synced = 0
-        skipped_durations = 0
+    sched_count = sum(1 for k in controller_eids if "start_time" in k.lower() or "schedule" in k.lower())
+    _remote_log(f"Broker: syncing {len(controller_eids)} entities ({sched_count} schedule-related) "
+                f"to {len(device_ids)} remote(s)")
+    needed = controller_eids | remote_eids
+    all_states = {eid: _broker_state_cache[eid] for eid in needed
+                  if use_cache and eid in _broker_state_cache}
+    missing = needed - set(all_states)
+    if missing:
+        states = await ha_client.get_entities_by_ids(list(missing))
         for entity_state in states:
-            ctrl_eid = entity_state.get("entity_id", "")
-            state_val = entity_state.get("state", "")
-            if not ctrl_eid or not state_val or state_val in ("unavailable", "unknown"):
-                continue
-            remote_eid = total_c2r.get(ctrl_eid)
-            if not remote_eid:
-                continue
-            suffix = _extract_entity_suffix(ctrl_eid)
-            if _DURATION_SUFFIX_RE.match(suffix):
-                skipped_durations += 1
-                continue
-            try:
-                await _mirror_entity_state(ctrl_eid, remote_eid, state_val)
-                synced += 1
-                if synced % 10 == 0:
-                    await asyncio.sleep(0.1)
-            except Exception as e:
-                _remote_log(f"Broker: sync FAILED for {ctrl_eid} → {device_id[:12]}: {e}")
-
-        _remote_log(f"Broker: sync to {device_id[:12]} — {synced}/{len(total_c2r)} pushed "
-                    f"({skipped_durations} durations skipped)")
-        total_synced += synced
+            eid = entity_state.get("entity_id", "")
+            if eid:
+                all_states[eid] = entity_state.get("state", "")
+                _broker_state_cache[eid] = all_states[eid]
+    if use_cache:
+        _remote_log(f"Broker: diff sync — {len(needed) - len(missing)} states from cache, "
+                    f"{len(missing)} read from HA")
+    controller_states = {eid: all_states[eid] for eid in controller_eids if eid in all_states}
+    remote_states = {eid: all_states[eid] for eid in remote_eids if eid in all_states}
+
+    results = await asyncio.gather(
+        *(_sync_remote_device(d, controller_states, remote_states) for d in device_ids),
+        return_exceptions=True,
+    )
+    total_synced = 0
+    for device_id, result in zip(device_ids, results):
+        if isinstance(result, Exception):
+            _remote_log(f"Broker: sync pipeline FAILED for {device_id[:12]}: {result}")
+        else:
+            total_synced += result
 
     _remote_log(f"Broker: full sync complete — {total_synced} total values pushed to "
-                f"{len(config.remote_device_ids)} remote(s)")
+                f"{len(device_ids)} remote(s)")
 
     # Sync base durations separately (uses base values, not factored controller values)
-    await sync_base_durations_to_remote()
+    await sync_base_durations_to_remote(device_ids, remote_states)
 
 
 async def get_broker_status() -> dict:
@@ -1623,6 +1897,9 @@ async def get_broker_status() -> dict:
             pass
 
     # Per-device status
+    import time
+    from config import get_config
+    config = get_config()
     per_device = {}
     for did in config.remote_device_ids:
         dev_sync_eid = _find_sync_needed_entity_for_device(did)
@@ -1639,6 +1916,11 @@ async def get_broker_status() -> dict:
             "sync_needed_state": dev_sync_state,
             "reconnect_pending": _remote_reconnect_pending_by_device.get(did, False),
             "sync_running": _reconnect_sync_running_by_device.get(did, False),
+            "blocked_for_seconds": (
+                round(time.monotonic() - _remote_blocked_since_by_device[did][0], 1)
+                if did in _remote_blocked_since_by_device else None
+            ),
+            "last_unblock": _remote_unblock_stats_by_device.get(did),
         }
 
     return {
@@ -1652,6 +1934,8 @@ async def get_broker_status() -> dict:
         "reconnect_pending": _remote_reconnect_pending,
         "sync_running": _reconnect_sync_running,
         "per_device": per_device,
+        "state_cache_entities": len(_broker_state_cache),
+        "metrics": broker_metrics.get_metrics(),
     }
 
 
@@ -1659,7 +1943,8 @@ def _get_probe_sensor_entities() -> set:
     """Get the set of moisture probe sensor entity IDs to watch.
 
     Watches moisture sensors for skip↔factor transitions (only if apply_factors is on),
-    AND sleep_duration sensors for wake detection (always, if probes are enabled).
+    AND sleep_duration sensors and status LEDs for wake detection (always, if
+    probes are enabled).
     """
     try:
         from routes.moisture import _load_data as _load_moisture_data
@@ -1679,6 +1964,10 @@ def _get_probe_sensor_entities() -> set:
             sleep_eid = probe.get("extra_sensors", {}).get("sleep_duration")
             if sleep_eid:
                 entities.add(sleep_eid)
+            # Status LED — ON = awake, OFF = sleeping (event-driven awake detection)
+            led_eid = (probe.get("extra_sensors") or {}).get("status_led")
+            if led_eid:
+                entities.add(led_eid)
         return entities
     except Exception:
         return set()
@@ -1704,9 +1993,19 @@ async def _handle_probe_sensor_change(entity_id: str, new_state: str, old_state:
     Checks if the reading change would cause a skip↔factor transition for
     any mapped zone. If so, triggers an immediate factor re-evaluation.
     Also handles probe wake detection for pending sleep duration writes.
+    Status LED changes are routed to the moisture module's awake tracking.
     """
     import asyncio
 
+    # Status LED: drives awake/sleep transitions directly
+    if entity_id.startswith("light.") and "status_led" in entity_id:
+        try:
+            from routes.moisture import on_status_led_change
+            await on_status_led_change(entity_id, new_state)
+        except Exception as e:
+            print(f"[RUN_LOG] Probe status LED hook error: {e}")
+        return
+
     # Wake detection: unavailable → real value means probe woke up
     # Run as background task so it doesn't block transition detection
     if old_state in ("unavailable", "unknown") and new_state not in ("unavailable", "unknown"):
@@ -1778,6 +2077,7 @@ async def _watch_via_websocket(allowed_entities: set):
     automatically re-apply schedule adjustments.
     """
     global _remote_reconnect_pending
+    import time
     import websockets
     from config import get_config
 
@@ -1832,6 +2132,16 @@ async def _watch_via_websocket(allowed_entities: set):
               f"({len(allowed_entities)} zone + {len(probe_entities)} probe + "
               f"{len(schedule_entities)} schedule + {len(remote_entities)} remote entities)")
 
+        # Event-fed timeline inputs are trustworthy from here on
+        try:
+            from routes.moisture import reset_event_caches, on_schedule_entity_event
+            reset_event_caches(schedule_entities | probe_entities)
+        except Exception:
+            on_schedule_entity_event = None
+
+        # Stop polling fallback and backfill anything missed while disconnected
+        await _on_websocket_connected(allowed_entities)
+
         # Step 3.5: On WS connect, check if sync_needed is ON per remote device
         if remote_entities:
             import ha_client as _hac
@@ -1843,14 +2153,14 @@ async def _watch_via_websocket(allowed_entities: set):
                     st = await _hac.get_entity_state(sync_eid)
                     if st and st.get("state") == "on":
                         _remote_reconnect_pending = True
-                        _remote_reconnect_pending_by_device[device_id] = True
+                        _block_remote_device(device_id, "sync_needed")
                         _remote_log(f"Broker: WS connected — sync_needed ON for {device_id[:12]}, triggering sync")
                         asyncio.create_task(
                             _handle_remote_reconnect("ws_connect", remote_entities, device_id=device_id)
                         )
                     elif _remote_reconnect_pending_by_device.get(device_id, False):
                         _remote_log(f"Broker: WS connected — sync_needed OFF for {device_id[:12]}, clearing block")
-                        _remote_reconnect_pending_by_device[device_id] = False
+                        _unblock_remote_device(device_id)
                 except Exception as e:
                     _remote_log(f"Broker: WS connect sync check failed for {device_id[:12]}: {e}")
             # Update global flag based on per-device state
@@ -1864,6 +2174,7 @@ async def _watch_via_websocket(allowed_entities: set):
 
         # Step 4: Listen for events
         async for raw_msg in ws:
+            received_at = time.monotonic()
             try:
                 msg = json.loads(raw_msg)
                 if msg.get("type") != "event":
@@ -1874,15 +2185,28 @@ async def _watch_via_websocket(allowed_entities: set):
                 if entity_id not in all_watched:
                     continue
 
-                # Skip mirrored events (prevents remote ↔ controller infinite loop)
-                if entity_id in _remote_mirror_guard:
-                    continue
-
                 new_state_obj = event_data.get("new_state", {})
                 old_state_obj = event_data.get("old_state", {})
                 new_state = new_state_obj.get("state", "unknown") if new_state_obj else "unknown"
                 old_state = old_state_obj.get("state", "unknown") if old_state_obj else "unknown"
 
+                # Track last-known broker state — including our own mirrored
+                # writes, so reconnect syncs can diff without re-reading HA
+                if entity_id in remote_entities or entity_id in controller_for_remote:
+                    _broker_state_cache[entity_id] = new_state
+                # Same for schedule entities feeding the irrigation timeline
+                if entity_id in schedule_entities and on_schedule_entity_event:
+                    on_schedule_entity_event(entity_id, new_state)
+
+                # Skip mirrored events (prevents remote ↔ controller infinite loop)
+                if entity_id in _remote_mirror_guard:
+                    if entity_id in remote_entities:
+                        broker_metrics.record_suppressed(broker_metrics.CONTROLLER_TO_REMOTE,
+                                                         _get_entity_device_id(entity_id))
+                    else:
+                        broker_metrics.record_suppressed(broker_metrics.REMOTE_TO_CONTROLLER, None)
+                    continue
+
                 if new_state == old_state:
                     continue
 
@@ -1904,7 +2228,7 @@ async def _watch_via_websocket(allowed_entities: set):
                     if _dev_sync_eid and entity_id == _dev_sync_eid and new_state == "on":
                         _remote_reconnect_pending = True
                         if _source_device:
-                            _remote_reconnect_pending_by_device[_source_device] = True
+                            _block_remote_device(_source_device, "sync_needed")
                         _remote_log(f"Broker: sync_needed ON for {(_source_device or 'unknown')[:12]} — blocking mirroring")
                         import asyncio
                         asyncio.create_task(
@@ -1915,7 +2239,7 @@ async def _watch_via_websocket(allowed_entities: set):
                     # --- Sync trigger 2 (backup): entity went unavailable → available ---
                     if old_state == "unavailable" and new_state != "unavailable":
                         if _source_device and not _remote_reconnect_pending_by_device.get(_source_device, False):
-                            _remote_reconnect_pending_by_device[_source_device] = True
+                            _block_remote_device(_source_device, "unavailable")
                             _remote_reconnect_pending = True
                             _remote_log(f"Broker: remote {_source_device[:12]} back from unavailable — blocking mirroring")
                             import asyncio
@@ -1942,7 +2266,7 @@ async def _watch_via_websocket(allowed_entities: set):
                     # Remote entity changed → mirror to controller (+ other remotes)
                     import asyncio
                     asyncio.create_task(
-                        _handle_remote_entity_change(entity_id, new_state, old_state)
+                        _handle_remote_entity_change(entity_id, new_state, old_state, received_at)
                     )
                 elif entity_id in allowed_entities:
                     # Zone entity on controller
@@ -1953,14 +2277,14 @@ async def _watch_via_websocket(allowed_entities: set):
                     if remote_entities:
                         import asyncio
                         asyncio.create_task(
-                            _handle_controller_to_remote(entity_id, new_state)
+                            _handle_controller_to_remote(entity_id, new_state, received_at)
                         )
                 else:
                     # Non-zone controller entity — check remote mirroring
                     if entity_id in controller_for_remote:
                         import asyncio
                         asyncio.create_task(
-                            _handle_controller_to_remote(entity_id, new_state)
+                            _handle_controller_to_remote(entity_id, new_state, received_at)
                         )
                     # Detect zone mode changes → refresh special zone cache
                     if (entity_id.startswith("select.") and
@@ -1983,7 +2307,11 @@ async def _watch_via_websocket(allowed_entities: set):
 
 
 async def _watch_via_polling(allowed_entities: set):
-    """Fallback: poll zone states every 5 seconds if WebSocket is unavailable."""
+    """Fallback: poll zone states every 5 seconds while the WebSocket is down.
+
+    Runs as a background task started by watch_zone_states() and is cancelled
+    once the WebSocket reconnects.
+    """
     import asyncio
     import ha_client
     from config import get_config
@@ -2031,11 +2359,135 @@ async def _watch_via_polling(allowed_entities: set):
         await asyncio.sleep(5)
 
 
+# --- WebSocket resume / gap backfill ---
+# While the WebSocket is down the watcher polls (5 s) and keeps retrying the
+# WebSocket in the background with exponential backoff.  On reconnect, zone
+# transitions from the disconnected interval are backfilled from HA history.
+_WS_RETRY_INITIAL_S = 1
+_WS_RETRY_MAX_S = 60
+_BACKFILL_MATCH_S = 15  # an already-logged event within this window is the same event
+_ws_disconnected_at: datetime | None = None  # when the current outage began
+_ws_connected: bool = False  # current attempt reached the subscribed state
+_ws_live: bool = False  # events are flowing right now
+_polling_task: "asyncio.Task | None" = None
+
+
+def _parse_ha_time(value: str) -> datetime | None:
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError):
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+async def _backfill_zone_history(allowed_entities: set, since: datetime) -> int:
+    """Log zone on/off transitions that happened while the WebSocket was down.
+
+    Reads HA history for the watched zone entities from `since` to now and
+    logs every on/off transition with its real timestamp, skipping any that
+    the polling fallback already logged (same entity + state within
+    _BACKFILL_MATCH_S).  Moisture/pause hooks are not re-run for past events,
+    and the entries carry no weather/moisture context.
+    Returns the number of events backfilled.
+    """
+    import ha_client
+
+    if not allowed_entities:
+        return 0
+    now = datetime.now(timezone.utc)
+    history = await ha_client.get_history(
+        ",".join(sorted(allowed_entities)),
+        start_time=since.isoformat(),
+        end_time=now.isoformat(),
+    )
+
+    transitions = []  # (timestamp, entity_id, state, zone_name)
+    final_states = {}
+    for series in history or []:
+        if not series:
+            continue
+        entity_id = series[0].get("entity_id", "")
+        if entity_id not in allowed_entities:
+            continue
+        zone_name = series[0].get("attributes", {}).get("friendly_name", entity_id)
+        prev = series[0].get("state")
+        for item in series[1:]:
+            state = item.get("state")
+            ts = _parse_ha_time(item.get("last_changed", ""))
+            if state == prev or ts is None or ts < since:
+                prev = state
+                continue
+            if state in ("on", "open", "off", "closed"):
+                transitions.append((ts, entity_id, state, zone_name))
+            prev = state
+        final_states[entity_id] = prev
+
+    if not transitions:
+        return 0
+
+    # Events already logged (by polling) during the outage, per entity
+    gap_hours = int((now - since).total_seconds() // 3600) + 1
+    logged: dict[str, list[tuple[datetime, str]]] = {}
+    for entry in get_run_history(hours=gap_hours, limit=100000):
+        ts = _parse_ha_time(entry.get("timestamp", ""))
+        if ts and ts >= since - timedelta(seconds=_BACKFILL_MATCH_S):
+            logged.setdefault(entry.get("entity_id", ""), []).append((ts, entry.get("state", "")))
+
+    backfilled = 0
+    for ts, entity_id, state, zone_name in sorted(transitions):
+        if any(s == state and abs((lts - ts).total_seconds()) <= _BACKFILL_MATCH_S
+               for lts, s in logged.get(entity_id, [])):
+            continue
+        # Same rule as _handle_state_change: never log an OFF without its ON
+        if state in ("off", "closed") and entity_id not in _zone_start_times:
+            continue
+        log_zone_event(entity_id=entity_id, state=state, source="schedule",
+                       zone_name=zone_name, timestamp=ts, backfilled=True)
+        backfilled += 1
+
+    for entity_id, state in final_states.items():
+        _zone_states[entity_id] = state
+    if backfilled:
+        print(f"[RUN_LOG] Backfilled {backfilled} zone event(s) missed while the "
+              f"WebSocket was disconnected (since {since.isoformat()})")
+    return backfilled
+
+
+async def _on_websocket_connected(allowed_entities: set):
+    """WebSocket subscribed: stop polling and backfill the disconnected interval."""
+    global _ws_disconnected_at, _ws_connected, _ws_live, _polling_task
+    _ws_connected = True
+    _ws_live = True
+    if _polling_task and not _polling_task.done():
+        _polling_task.cancel()
+        print("[RUN_LOG] WebSocket restored — polling fallback stopped")
+    _polling_task = None
+    since = _ws_disconnected_at
+    _ws_disconnected_at = None
+    if since is not None:
+        try:
+            await _backfill_zone_history(allowed_entities, since)
+        except Exception as e:
+            print(f"[RUN_LOG] Zone history backfill failed: {e}")
+
+
+def is_websocket_live() -> bool:
+    """True while the WebSocket event subscription is connected.
+
+    Lets event-driven consumers (e.g. probe awake detection) fall back to
+    polling when events may be missing.
+    """
+    return _ws_live
+
+
 async def watch_zone_states():
     """Background task: monitor zone state changes in real time.
 
     Uses HA WebSocket subscription for instant event delivery (sub-second).
-    Falls back to 5-second polling if the WebSocket connection fails.
+    If the WebSocket drops, 5-second polling takes over while the WebSocket
+    is retried with exponential backoff (1 s → 60 s); the watcher switches
+    back as soon as it reconnects and backfills the missed interval from HA
+    history so no on/off transitions are lost.
 
     This catches ALL zone state changes regardless of source:
       - API/dashboard starts and stops
@@ -2047,47 +2499,59 @@ async def watch_zone_states():
     Also enforces system pause: if the system is paused and a zone turns on,
     it is immediately turned off.
     """
-    global _remote_reconnect_pending
+    global _remote_reconnect_pending, _ws_disconnected_at, _ws_connected, _ws_live, _polling_task
     import asyncio
     from config import get_config
 
+    retry_delay = _WS_RETRY_INITIAL_S
     while True:
-        try:
-            config = get_config()
-            if not config.allowed_zone_entities:
-                await asyncio.sleep(30)
-                continue
+        config = get_config()
+        if not config.allowed_zone_entities:
+            await asyncio.sleep(30)
+            continue
 
-            allowed = set(config.allowed_zone_entities)
+        allowed = set(config.allowed_zone_entities)
 
-            # Filter out hidden zones beyond detected_zone_count
-            max_zones = config.detected_zone_count if hasattr(config, "detected_zone_count") else 0
-            if max_zones > 0:
-                allowed = {
-                    eid for eid in allowed
-                    if _extract_zone_number(eid) <= max_zones
-                }
+        # Filter out hidden zones beyond detected_zone_count
+        max_zones = config.detected_zone_count if hasattr(config, "detected_zone_count") else 0
+        if max_zones > 0:
+            allowed = {
+                eid for eid in allowed
+                if _extract_zone_number(eid) <= max_zones
+            }
 
-            # Try WebSocket first (real-time, sub-second)
-            try:
-                await _watch_via_websocket(allowed)
-            except Exception as ws_err:
-                print(f"[RUN_LOG] WebSocket failed ({ws_err}), falling back to polling")
-                # Block remote→controller on WS drop — will be cleared after sync check
-                if config.allowed_remote_entities:
-                    _remote_reconnect_pending = True
-                    for did in config.remote_device_ids:
-                        _remote_reconnect_pending_by_device[did] = True
-                    _remote_log("Broker: WebSocket dropped — blocking all remotes")
-                await _watch_via_polling(allowed)
+        _ws_connected = False
+        try:
+            await _watch_via_websocket(allowed)
+            print("[RUN_LOG] WebSocket closed by server")
+        except Exception as ws_err:
+            print(f"[RUN_LOG] WebSocket failed ({ws_err})")
+        _ws_live = False
+        try:
+            from routes.moisture import reset_event_caches
+            reset_event_caches(None)
+        except Exception:
+            pass
 
-        except Exception as e:
-            print(f"[RUN_LOG] Zone watcher error: {e}")
+        # A session that actually connected resets the backoff
+        if _ws_connected:
+            retry_delay = _WS_RETRY_INITIAL_S
+        if _ws_disconnected_at is None:
+            _ws_disconnected_at = datetime.now(timezone.utc)
 
-        # Block remote→controller before reconnect attempt
+        # Block remote→controller on WS drop — will be cleared after sync check
         if config.allowed_remote_entities:
             _remote_reconnect_pending = True
             for did in config.remote_device_ids:
-                _remote_reconnect_pending_by_device[did] = True
-        # If we get here, the connection dropped — reconnect after a brief delay
-        await asyncio.sleep(5)
+                _block_remote_device(did, "websocket")
+            clear_broker_state_cache()
+            if _ws_connected:
+                _remote_log("Broker: WebSocket dropped — blocking all remotes")
+
+        # Poll in the background until the WebSocket is back
+        if _polling_task is None or _polling_task.done():
+            _polling_task = asyncio.create_task(_watch_via_polling(allowed))
+
+        print(f"[RUN_LOG] Retrying WebSocket in {retry_delay}s (polling meanwhile)")
+        await asyncio.sleep(retry_delay)
+        retry_delay = min(retry_delay * 2, _WS_RETRY_MAX_S)
@@ -0,0 +1,6 @@
+"""Make the add-on's app/ modules importable the way main.py imports them."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
@@ -0,0 +1,265 @@
+"""Differential test: batch zone moisture multipliers vs. the per-zone path.
+
+calculate_zone_moisture_multipliers() analyzes each mapped probe once and
+shares the result across zones.  It must return exactly what the original
+per-zone implementation (gradient analysis per zone/probe pair) returned.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import routes.moisture as moisture
+
+
+def _legacy_zone_multiplier(zone_entity_id: str, data: dict, sensor_states: dict) -> dict:
+    """The per-zone calculate_zone_moisture_multiplier() from before batching."""
+    if not data.get("enabled"):
+        return {
+            "multiplier": 1.0,
+            "avg_moisture": None,
+            "skip": False,
+            "probe_count": 0,
+            "probe_details": [],
+            "reason": "Moisture probes not enabled",
+        }
+
+    stale_threshold = data.get("stale_reading_threshold_minutes", 120)
+    default_thresholds = data.get("default_thresholds", moisture.DEFAULT_DATA["default_thresholds"])
+
+    mapped_probes = []
+    for probe_id, probe in data.get("probes", {}).items():
+        if zone_entity_id in probe.get("zone_mappings", []):
+            mapped_probes.append((probe_id, probe))
+
+    if not mapped_probes:
+        return {
+            "multiplier": 1.0,
+            "avg_moisture": None,
+            "skip": False,
+            "probe_count": 0,
+            "probe_details": [],
+            "reason": "No probes mapped to this zone",
+        }
+
+    precip_probability = moisture._get_precipitation_probability()
+    weather_condition = moisture._get_weather_condition()
+
+    probe_details = []
+    probe_multipliers = []
+    any_skip = False
+    all_reasons = []
+
+    for probe_id, probe in mapped_probes:
+        sensors = probe.get("sensors", {})
+        thresholds = probe.get("thresholds") or default_thresholds
+
+        depth_readings = {}
+        for depth in ("shallow", "mid", "deep"):
+            sensor_eid = sensors.get(depth)
+            if not sensor_eid:
+                continue
+            sensor_data = sensor_states.get(sensor_eid, {})
+            value = sensor_data.get("state")
+            stale = moisture._is_stale(sensor_data.get("last_updated", ""), stale_threshold)
+            if value is not None and not stale:
+                depth_readings[depth] = {"value": value, "stale": False, "entity_id": sensor_eid}
+            else:
+                depth_readings[depth] = {
+                    "value": value,
+                    "stale": stale,
+                    "entity_id": sensor_eid,
+                    "reason": "stale" if stale else "unavailable",
+                }
+
+        result = moisture._analyze_probe_gradient(
+            depth_readings, thresholds, precip_probability, weather_condition,
+        )
+
+        if result["skip"]:
+            any_skip = True
+        if result["multiplier"] is not None:
+            probe_multipliers.append(result["multiplier"])
+
+        display_moisture = None
+        for depth in ("mid", "shallow", "deep"):
+            reading = depth_readings.get(depth, {})
+            if reading.get("value") is not None and not reading.get("stale"):
+                display_moisture = reading["value"]
+                break
+
+        probe_details.append({
+            "probe_id": probe_id,
+            "display_name": probe.get("display_name", probe_id),
+            "effective_moisture": round(display_moisture, 1) if display_moisture is not None else None,
+            "depth_readings": depth_readings,
+            "all_stale": all(
+                depth_readings.get(d, {}).get("stale", True)
+                for d in ("shallow", "mid", "deep")
+                if d in depth_readings
+            ),
+            "profile": result.get("profile", "unknown"),
+            "rain_detected": result.get("rain_detected", False),
+        })
+        all_reasons.append(f"{probe.get('display_name', probe_id)}: {result['reason']}")
+
+    if not probe_multipliers:
+        return {
+            "multiplier": 1.0,
+            "avg_moisture": None,
+            "skip": False,
+            "probe_count": len(mapped_probes),
+            "probe_details": probe_details,
+            "reason": "All probe readings are stale or unavailable",
+        }
+
+    multi_probe_mode = data.get("multi_probe_mode", "conservative")
+    if multi_probe_mode == "optimistic":
+        non_stale_details = [pd for pd in probe_details if not pd.get("all_stale")]
+        all_skip = non_stale_details and all(
+            pd.get("profile") == "saturated" for pd in non_stale_details
+        )
+        if any_skip and all_skip:
+            final_multiplier, skip = 0.0, True
+        else:
+            final_multiplier, skip = max(probe_multipliers), False
+    elif multi_probe_mode == "average":
+        skip_count = sum(
+            1 for pd in probe_details
+            if pd.get("profile") == "saturated" and not pd.get("all_stale")
+        )
+        valid_count = sum(1 for pd in probe_details if not pd.get("all_stale"))
+        if valid_count > 0 and skip_count > valid_count / 2:
+            final_multiplier, skip = 0.0, True
+        else:
+            final_multiplier, skip = sum(probe_multipliers) / len(probe_multipliers), False
+    else:
+        if any_skip:
+            final_multiplier, skip = 0.0, True
+        else:
+            final_multiplier, skip = min(probe_multipliers), False
+
+    mid_values = [pd["effective_moisture"] for pd in probe_details
+                  if pd["effective_moisture"] is not None]
+    avg_moisture = sum(mid_values) / len(mid_values) if mid_values else None
+
+    return {
+        "multiplier": round(max(final_multiplier, 0.0), 3),
+        "avg_moisture": round(avg_moisture, 1) if avg_moisture is not None else None,
+        "skip": skip,
+        "probe_count": len(mapped_probes),
+        "probe_details": probe_details,
+        "reason": "; ".join(all_reasons),
+        "multi_probe_mode": multi_probe_mode,
+    }
+
+
+ZONES = [f"switch.irrigator_zone_{n}" for n in range(1, 7)]
+CONDITIONS = ["sunny", "cloudy", "rainy", "pouring", "lightning-rainy", ""]
+
+
+def _random_thresholds(rng: random.Random) -> dict | None:
+    kind = rng.random()
+    if kind < 0.3:
+        return None  # probe falls back to the default thresholds
+    if kind < 0.45:
+        # Legacy keys only
+        dry = rng.uniform(10, 40)
+        return {"skip_threshold": rng.uniform(60, 95), "scale_wet": rng.uniform(dry, 80),
+                "scale_dry": dry}
+    dry = rng.uniform(10, 40)
+    optimal = rng.uniform(dry - 5, 60)  # occasionally inverted ranges
+    wet = rng.uniform(optimal - 5, 80)
+    return {
+        "root_zone_skip": rng.uniform(wet - 5, 95),
+        "root_zone_wet": wet,
+        "root_zone_optimal": optimal,
+        "root_zone_dry": dry,
+        "max_increase_percent": rng.choice([0, 25, 50, 100]),
+        "max_decrease_percent": rng.choice([0, 25, 50, 100]),
+        "rain_boost_threshold": rng.uniform(5, 30),
+    }
+
+
+def _random_setup(rng: random.Random, now: datetime):
+    stale_minutes = rng.choice([30, 60, 120, 240])
+    sensor_states = {}
+    probes = {}
+    for p in range(rng.randint(0, 6)):
+        sensors = {}
+        for depth in ("shallow", "mid", "deep"):
+            if rng.random() < 0.2:
+                continue  # depth not wired
+            eid = f"sensor.probe_{p}_{depth}_moisture"
+            sensors[depth] = eid
+            if rng.random() < 0.1:
+                continue  # no cached state at all
+            age = rng.choice([
+                rng.uniform(0, stale_minutes - 2),          # fresh
+                rng.uniform(stale_minutes + 2, stale_minutes * 3),  # stale
+            ])
+            last_updated = rng.choice([
+                (now - timedelta(minutes=age)).isoformat(),
+                (now - timedelta(minutes=age)).isoformat().replace("+00:00", "Z"),
+                "" if rng.random() < 0.05 else (now - timedelta(minutes=age)).isoformat(),
+                "not-a-date" if rng.random() < 0.05 else (now - timedelta(minutes=age)).isoformat(),
+            ])
+            sensor_states[eid] = {
+                "state": None if rng.random() < 0.1 else round(rng.uniform(0, 100), 1),
+                "last_updated": last_updated,
+            }
+        zone_mappings = rng.sample(ZONES, rng.randint(0, 3))
+        if zone_mappings and rng.random() < 0.2:
+            zone_mappings.append(rng.choice(zone_mappings))  # duplicate mapping
+        probe = {
+            "sensors": sensors,
+            "zone_mappings": zone_mappings,
+            "thresholds": _random_thresholds(rng),
+        }
+        if rng.random() < 0.7:
+            probe["display_name"] = f"Probe {p}"
+        probes[f"probe_{p}"] = probe
+
+    data = {
+        "enabled": rng.random() < 0.9,
+        "probes": probes,
+        "stale_reading_threshold_minutes": stale_minutes,
+        "multi_probe_mode": rng.choice(["conservative", "optimistic", "average", "unknown"]),
+    }
+    if rng.random() < 0.5:
+        data["default_thresholds"] = _random_thresholds(rng) or {}
+    return data, sensor_states
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_matches_per_zone(monkeypatch, seed):
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    for _ in range(100):
+        monkeypatch.setattr(moisture, "_get_precipitation_probability",
+                            lambda p=rng.choice([0.0, 20.0, 40.0, 55.0, 100.0]): p)
+        monkeypatch.setattr(moisture, "_get_weather_condition",
+                            lambda c=rng.choice(CONDITIONS): c)
+        data, sensor_states = _random_setup(rng, now)
+        zones = rng.sample(ZONES, rng.randint(1, len(ZONES)))
+
+        # The batch path reads zone -> probe mappings from the zone index
+        index = moisture._build_zone_index(
+            data, 0, SimpleNamespace(allowed_zone_entities=[], allowed_control_entities=[]),
+        )
+        monkeypatch.setattr(moisture, "_get_zone_index", lambda index=index: index)
+
+        batch = moisture.calculate_zone_moisture_multipliers(zones, data, sensor_states)
+
+        assert list(batch) == zones
+        for zid in zones:
+            expected = _legacy_zone_multiplier(zid, data, sensor_states)
+            got = batch[zid]
+            assert got["multiplier"] == expected["multiplier"]
+            assert got["skip"] == expected["skip"]
+            assert ([pd["profile"] for pd in got["probe_details"]]
+                    == [pd["profile"] for pd in expected["probe_details"]])
+            assert got == expected
+            assert moisture.calculate_zone_moisture_multiplier(zid, data, sensor_states) == expected